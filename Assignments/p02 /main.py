@@ -2,23 +2,24 @@
 import json
 import sys
 import random
-from schedulers.fcfs import FCFSScheduler
-from schedulers.round_robin import RRScheduler
-from schedulers.sjf import SJFScheduler
-from schedulers.srtf import SRTFScheduler
-from schedulers.priority import PriorityScheduler
-from schedulers.adaptive import AdaptiveScheduler
 from pkg import Process
+from pkg.checkpoint import save_checkpoint, load_checkpoint, run_with_checkpoints
+from pkg.registry import SCHEDULERS, per_cpu_options
+from pkg.trace import trace, end_trace
 
-# Import pygame visualizer
-try:
-    from pygame_visualizer import run_pygame_visualization
-    PYGAME_AVAILABLE = True
-except ImportError as e:
-    PYGAME_AVAILABLE = False
-    print(f"Error: pygame visualizer not available. Error: {e}")
-    print("Make sure pygame_visualizer.py exists and pygame is installed.")
-    run_pygame_visualization = None
+# Scheduler modules, pygame and the metrics server are imported only when a
+# run needs them, so headless runs start fast and work without pygame.
+
+
+def load_visualizer(entry="run_pygame_visualization"):
+    """Import the pygame visualizer; returns its entry function, or None if unavailable"""
+    try:
+        import pygame_visualizer
+    except ImportError as e:
+        print(f"Error: pygame visualizer not available. Error: {e}")
+        print("Make sure pygame_visualizer.py exists and pygame is installed.")
+        return None
+    return getattr(pygame_visualizer, entry)
 
 def load_processes_from_json(filename, limit=None, heavy=None, arrival_strategy="staggered"):
     with open(filename) as f:
@@ -111,6 +112,20 @@ if __name__ == "__main__":
     arrival_strategy = args.get("arrival", "staggered")  # Get arrival time strategy
     seed = args.get("seed")  # Optional random seed for reproducibility
     fps = int(args.get("fps", "2"))  # Frames per second for pygame
+    devices = args.get("devices")  # Optional device spec json for typed I/O pools
+    checkpoint = args.get("checkpoint")  # Save the simulation state here (headless: every N steps, visual: at the end or on quit)
+    checkpoint_every = int(args.get("every", 10000))  # checkpoint: steps between saves in a headless run
+    resume = args.get("resume")  # Continue from a checkpoint instead of starting a new run
+    metrics_port = args.get("metrics_port")  # Serve live Prometheus metrics on this port
+    phase_timing = args.get("phase_timing")  # metrics_port: also time step phases, one step in N
+    trace_file = args.get("trace")  # Write the schedule as a Chrome/Perfetto trace
+    log_file = args.get("log")  # Verbose event log through a buffered writer ("-" for stdout)
+    log_level = args.get("log_level", "info")  # debug also logs every dispatch
+    visual = args.get("visual", "1") != "0"  # visual=0 runs headless (no pygame needed)
+    simproc = args.get("simproc", "0") != "0"  # Simulate in a separate process, streaming frames to pygame
+    rate = float(args.get("rate", fps))  # simproc: simulated ticks per second (0 = as fast as possible)
+    per_cpu = args.get("per_cpu", "0") != "0"  # One run queue per CPU with work stealing (fcfs, rr)
+    balance = int(args["balance"]) if "balance" in args else None  # per_cpu: ticks between rebalances
     
     # Set random seed if provided
     if seed:
@@ -121,6 +136,10 @@ if __name__ == "__main__":
         print(f"Error: Invalid heavy parameter '{heavy}'. Must be one of: cpu, io, mixed")
         sys.exit(1)
     
+    if simproc and (metrics_port or trace_file or log_file):
+        print("Error: simproc=1 cannot be combined with metrics_port, trace or log")
+        sys.exit(1)
+    
     # Validate arrival strategy
     valid_strategies = ["staggered", "random", "burst", "original"]
     if arrival_strategy not in valid_strategies:
@@ -137,32 +156,38 @@ if __name__ == "__main__":
     # Default scheduler (can be overridden by command line argument)
     scheduler_class_name = args.get("scheduler", "RRScheduler")
     
-    # Map scheduler name to class (case-insensitive)
-    scheduler_map = {
-        "fcfs": FCFSScheduler,
-        "fcfsscheduler": FCFSScheduler,
-        "rr": RRScheduler,
-        "rrscheduler": RRScheduler,
-        "roundrobin": RRScheduler,
-        "sjf": SJFScheduler,
-        "sjfscheduler": SJFScheduler,
-        "srtf": SRTFScheduler,
-        "srtfscheduler": SRTFScheduler,
-        "priority": PriorityScheduler,
-        "priorityscheduler": PriorityScheduler,
-        "adaptive": AdaptiveScheduler,
-        "adaptivescheduler": AdaptiveScheduler
-    }
-    
-    # Convert to lowercase for case-insensitive matching
-    SchedulerClass = scheduler_map.get(scheduler_class_name.lower(), RRScheduler)
+    # Map scheduler name to class (case-insensitive, e.g. rr / RRScheduler / roundrobin);
+    # only the selected scheduler's module is imported
+    scheduler_name = SCHEDULERS.canonical(scheduler_class_name) or "rr"
+    SchedulerClass = SCHEDULERS[scheduler_name]
+    
+    options = {}
+    if per_cpu:
+        try:
+            options = per_cpu_options(scheduler_name, balance)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
     
     print(f"Running simulation with {SchedulerClass.__name__}")
     if heavy:
         print(f"Process filter: {heavy}-heavy processes only")
+    if per_cpu:
+        print(f"Per-CPU run queues (rebalanced every {options.get('balance_interval', 10)} ticks)")
     print(f"Arrival strategy: {arrival_strategy}")
     print(f"Processes loaded: {len(processes)}")
-    print(f"CPUs: {cpus}, I/O devices: {ios}")
+    
+    device_spec = None
+    if devices:
+        # Typed pools replace the plain I/O devices; their sizes come from the spec
+        if "ios" in args:
+            print(f"Warning: ios={ios} is ignored when devices= is given")
+        with open(devices) as f:
+            device_spec = json.load(f)
+        pools = ", ".join(f"{d['name']} x{d.get('count', 1)}" for d in device_spec)
+        print(f"CPUs: {cpus}, I/O device pools: {pools}")
+    else:
+        print(f"CPUs: {cpus}, I/O devices: {ios}")
     
     # Check if any processes were loaded
     if len(processes) == 0:
@@ -179,9 +204,14 @@ if __name__ == "__main__":
     for i, p in enumerate(processes[:10]):
         print(f"  PID {p.pid}: arrival_time={p.arrival_time}, bursts={len(p.bursts)}")
     
-    scheduler = SchedulerClass(num_cpus=cpus, num_ios=ios, verbose=False)
-    for p in processes:
-        scheduler.add_process(p)
+    if resume:
+        # Restores the queues, devices, process progress and the random state
+        scheduler = load_checkpoint(resume)
+        print(f"Resumed {type(scheduler).__name__} from {resume}")
+    else:
+        scheduler = SchedulerClass(num_cpus=cpus, num_ios=ios, verbose=False, device_spec=device_spec, **options)
+        for p in processes:
+            scheduler.add_process(p)
     
     # Check if scheduler has a clock attribute (indicates it handles arrivals properly)
     if hasattr(scheduler, 'clock'):
@@ -204,26 +234,80 @@ if __name__ == "__main__":
     #print(f"Has jobs: {scheduler.has_jobs()}")
     #print(f"First few processes arrival times: {[p.arrival_time for p in list(scheduler.ready_queue)[:3]]}")
     
-    # Run simulation with Pygame visualization
+    metrics = None
+    if metrics_port:
+        from pkg.telemetry import MetricsServer, instrument
+        if phase_timing:
+            instrument(scheduler, every=int(phase_timing))
+        metrics = MetricsServer(scheduler, port=int(metrics_port)).start()
+        print(f"Serving metrics on http://{metrics.host}:{metrics.port}/metrics")
+    
+    if trace_file:
+        trace(scheduler, trace_file)
+    
+    if log_file:
+        scheduler.log_output(None if log_file == "-" else log_file, level=log_level)
+    
+    # Run simulation (with Pygame visualization unless visual=0)
     print(f"\nStarting simulation...")
     print(f"Total processes to simulate: {len(processes)}")
     
-    if not PYGAME_AVAILABLE:
+    entry = "run_ring_visualization" if simproc else "run_pygame_visualization"
+    run_pygame_visualization = load_visualizer(entry) if visual else None
+    if visual and run_pygame_visualization is None:
         print("ERROR: Pygame visualizer not available!")
         print("Please ensure:")
         print("  1. pygame is installed: pip install pygame")
         print("  2. pygame_visualizer.py exists in the same directory")
+        print("Or run without visualization: visual=0")
         sys.exit(1)
     
-    print(f"Running PYGAME visual simulation at {fps} FPS...")
-    print("Controls: SPACE=Pause, S=Step, UP/DOWN=Speed, Q=Quit")
+    if visual and simproc:
+        from pkg.framering import SimulatorProcess
+        print(f"Running simulation in a separate process at {rate or 'full'} ticks/s, drawing at {fps} FPS...")
+        print("Controls: SPACE=Freeze display, UP/DOWN=Drawing speed, Q=Quit")
+        
+        simulator = SimulatorProcess(scheduler, rate=rate or None).start()
+        try:
+            run_pygame_visualization(simulator.ring, type(scheduler).__name__, fps=fps)
+        except Exception as e:
+            print(f"\nError during pygame simulation: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            # Quitting early stops the simulator too; either way take its final state
+            simulator.stop()
+            scheduler = simulator.result()
+    elif visual:
+        print(f"Running PYGAME visual simulation at {fps} FPS...")
+        print("Controls: SPACE=Pause, S=Step, UP/DOWN=Speed, Q=Quit")
+        
+        try:
+            run_pygame_visualization(scheduler, fps=fps)
+        except Exception as e:
+            print(f"\nError during pygame simulation: {e}")
+            import traceback
+            traceback.print_exc()
+    else:
+        print("Running headless simulation...")
+        if checkpoint:
+            # Saved as the run goes, so a killed run can resume= from the last save
+            print(f"Checkpointing to {checkpoint} every {checkpoint_every} steps")
+            run_with_checkpoints(scheduler, checkpoint, every=checkpoint_every)
+        else:
+            scheduler.run()
     
-    try:
-        run_pygame_visualization(scheduler, fps=fps)
-    except Exception as e:
-        print(f"\nError during pygame simulation: {e}")
-        import traceback
-        traceback.print_exc()
+    if metrics is not None:
+        metrics.stop()
+    if log_file:
+        scheduler.close_log()
+    if trace_file:
+        end_trace(scheduler)
+        print(f"Trace written to {trace_file} (open in ui.perfetto.dev or chrome://tracing)")
+    
+    if checkpoint and visual:
+        save_checkpoint(scheduler, checkpoint)
+        print(f"Checkpoint saved to {checkpoint}")
     
     # Print final statistics
     print("\n" + "="*60)
@@ -233,6 +317,8 @@ if __name__ == "__main__":
     
     # Export timeline data
     scheduler.export_json(f"./timelines/timeline{file_num}.json")
+    scheduler.utilization.export_json(f"./timelines/utilization{file_num}.json")
     
     print(f"\nTimeline data exported to:")
-    print(f"  JSON: ./timelines/timeline{file_num}.json")
\ No newline at end of file
+    print(f"  JSON: ./timelines/timeline{file_num}.json")
+    print(f"  Utilization: ./timelines/utilization{file_num}.json")
\ No newline at end of file
@@ -3,5 +3,6 @@ from .cpu import CPU
 from .iodevice import IODevice
 from .scheduler import Scheduler
 from .process import Process
+from .timing_wheel import TimingWheel, Timer
 
-__all__ = ["Clock", "CPU", "IODevice", "Scheduler", "Process"]
\ No newline at end of file
+__all__ = ["Clock", "CPU", "IODevice", "Scheduler", "Process", "TimingWheel", "Timer"]
@@ -0,0 +1,111 @@
+# archive.py
+from array import array
+from collections import namedtuple
+
+# How many finished pids a snapshot lists (the visualizer only draws the first few)
+SNAPSHOT_FINISHED = 50
+
+_FIELDS = ("priority", "arrival_time", "end_time", "wait_time", "turnaround_time",
+           "response_time", "runtime", "io_time")
+
+
+class FinishedRecord(namedtuple("FinishedRecord", ("pid",) + _FIELDS + ("extras",))):
+    """
+    Compact view of a finished process with the attributes the stats and
+    export code read from a Process (scheduler specific ones live in extras)
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        if self.extras and name in self.extras:
+            return self.extras[name]
+        raise AttributeError(f"FinishedRecord has no attribute '{name}'")
+
+    @property
+    def first_dispatch_time(self):
+        return self.arrival_time + self.response_time
+
+    # The schedulers name the first-dispatch timestamp differently
+    first_run_time = first_dispatch_time
+
+
+class FinishedArchive:
+    """
+    Finished processes collapsed into typed arrays
+
+    Replaces the `finished` list of Process objects: append() copies the
+    summary numbers of a process into one array('q') per field and releases
+    its burst list, so a long run holds 9 values per completed process
+    instead of the whole Process. Iterating yields FinishedRecord tuples that
+    read like the original processes (pid, priority, arrival_time, ...).
+
+    Args:
+        extra: (attribute, array typecode) pairs of scheduler specific
+               attributes to keep as well, e.g. (("vruntime", "d"),)
+    Attributes:
+        pids: list of pids, in completion order
+        priority, arrival_time, end_time, wait_time, turnaround_time,
+        response_time, runtime, io_time: array('q') per field
+        extra_columns: attribute -> array for the extra attributes
+    Methods:
+        append(process): archive a finished process
+        head(n): pids of the first n finished processes (for snapshots)
+        totals(): sum of every numeric field
+    """
+
+    def __init__(self, extra=()):
+        self.pids = []
+        for field in _FIELDS:
+            setattr(self, field, array("q"))
+        self.extra_columns = {name: array(typecode) for name, typecode in extra}
+
+    def append(self, process):
+        """Archive a finished process and drop its burst list"""
+        first_cpu = getattr(process, "first_dispatch_time", None)
+        if first_cpu is None:
+            first_cpu = getattr(process, "first_run_time", process.arrival_time)
+        self.pids.append(process.pid)
+        self.priority.append(process.priority)
+        self.arrival_time.append(process.arrival_time)
+        self.end_time.append(process.end_time)
+        self.wait_time.append(process.wait_time)
+        self.turnaround_time.append(process.end_time - process.arrival_time)
+        self.response_time.append(first_cpu - process.arrival_time)
+        self.runtime.append(process.runtime)
+        self.io_time.append(process.io_time)
+        for name, column in self.extra_columns.items():
+            column.append(getattr(process, name))
+        process.bursts = []
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __bool__(self):
+        return bool(self.pids)
+
+    def _extras(self, index):
+        if not self.extra_columns:
+            return None
+        return {name: column[index] for name, column in self.extra_columns.items()}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        values = (getattr(self, field)[index] for field in _FIELDS)
+        return FinishedRecord(self.pids[index], *values, self._extras(index))
+
+    def __iter__(self):
+        columns = [getattr(self, field) for field in _FIELDS]
+        for index, (pid, *values) in enumerate(zip(self.pids, *columns)):
+            yield FinishedRecord(pid, *values, self._extras(index))
+
+    def head(self, n=SNAPSHOT_FINISHED):
+        """Pids of the first n finished processes"""
+        return self.pids[:n]
+
+    def totals(self):
+        """Sum of every numeric field"""
+        return {field: sum(getattr(self, field)) for field in _FIELDS}
+
+    def __repr__(self):
+        return f"FinishedArchive({len(self)} processes)"
@@ -24,4 +24,12 @@ class Clock:
 
     def now(self):
         """Get the current time"""
-        return self.time
\ No newline at end of file
+        return self.time
+
+    def __getstate__(self):
+        return dict(self._shared_state)
+
+    def __setstate__(self, state):
+        """Unpickled clocks rejoin the shared state (used by checkpoints)"""
+        self.__dict__ = self._shared_state
+        self._shared_state.update(state)
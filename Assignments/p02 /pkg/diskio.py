@@ -0,0 +1,162 @@
+# diskio.py
+from bisect import bisect_left, insort
+from collections import deque
+import math
+import zlib
+
+DISK_POLICIES = ("fifo", "sstf", "scan", "c-look", "deadline")
+
+
+class DiskCostModel:
+    """
+    Seek and rotation cost of a disk request, in clock ticks
+    Attributes:
+        num_tracks: number of tracks on the disk
+        seek_base: fixed cost of any head movement (settle time)
+        seek_per_track: extra cost per track travelled
+        rotation: average rotational latency paid by every request
+    Methods:
+        cost(distance): ticks added to a request that moves the head distance tracks
+        track_for(process): track of the process's current burst
+    """
+
+    def __init__(self, num_tracks=1000, seek_base=1, seek_per_track=0.005, rotation=1):
+        self.num_tracks = num_tracks
+        self.seek_base = seek_base
+        self.seek_per_track = seek_per_track
+        self.rotation = rotation
+
+    def cost(self, distance):
+        """Positioning cost for moving the head distance tracks"""
+        seek = self.seek_base + self.seek_per_track * distance if distance else 0
+        return math.ceil(seek + self.rotation)
+
+    def track_for(self, process):
+        """
+        Track a burst reads or writes. Bursts may carry an explicit "track";
+        otherwise one is derived from pid and burst index so runs are repeatable.
+        """
+        burst = process.current_burst()
+        if burst and "io" in burst and "track" in burst["io"]:
+            return burst["io"]["track"] % self.num_tracks
+        key = f"{process.pid}:{process.current_burst_index}".encode()
+        return zlib.crc32(key) % self.num_tracks
+
+
+class DiskQueue:
+    """
+    Request queue of one disk, ordered by an I/O scheduling policy
+
+    Requests are kept in a list sorted by (track, seq) so the elevator policies
+    find the next request with a binary search; FIFO and deadline also keep an
+    arrival-order deque.
+
+    Policies:
+        fifo: arrival order
+        sstf: shortest seek from the current head position
+        scan: sweep up to the last track, then down to track 0 (elevator)
+        c-look: sweep up to the last request, then jump back to the lowest one
+        deadline: c-look, but a request older than `deadline` ticks is served first
+    Attributes:
+        head: current head position
+        direction: +1 sweeping up, -1 sweeping down (scan)
+    Methods:
+        push(process, track, now): add a request
+        pop(now): remove the next request, returns (process, track, travel distance)
+    """
+
+    def __init__(self, policy="fifo", model=None, deadline=50):
+        if policy not in DISK_POLICIES:
+            raise ValueError(f"Unknown disk policy '{policy}'. Must be one of: {', '.join(DISK_POLICIES)}")
+        self.policy = policy
+        self.model = model if model is not None else DiskCostModel()
+        self.deadline = deadline
+        self.head = 0
+        self.direction = 1
+        self._sorted = []       # (track, seq)
+        self._entries = {}      # seq -> (process, track, enqueue time)
+        # seq in arrival order (may hold already served seqs); only the policies that need it
+        self._fifo = deque() if policy in ("fifo", "deadline") else None
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __iter__(self):
+        # Pending requests in arrival order (dicts keep insertion order)
+        for process, _, _ in self._entries.values():
+            yield process
+
+    def push(self, process, track, now=0):
+        """Add a request for track"""
+        seq = self._seq
+        self._seq += 1
+        self._entries[seq] = (process, track, now)
+        insort(self._sorted, (track, seq))
+        if self._fifo is not None:
+            self._fifo.append(seq)
+
+    def _oldest(self):
+        """Oldest request still pending (drops served seqs from the front)"""
+        while self._fifo and self._fifo[0] not in self._entries:
+            self._fifo.popleft()
+        return self._fifo[0]
+
+    def _index_at_or_above(self, track):
+        return bisect_left(self._sorted, (track, -1))
+
+    def _pick(self, now):
+        """Index into _sorted of the next request, and the distance the head travels"""
+        n = len(self._sorted)
+        if self.policy == "fifo" or self.policy == "deadline":
+            seq = self._oldest()
+            _, track, enqueued = self._entries[seq]
+            if self.policy == "fifo" or now - enqueued >= self.deadline:
+                index = bisect_left(self._sorted, (track, seq))
+                return index, abs(track - self.head)
+
+        i = self._index_at_or_above(self.head)
+
+        if self.policy == "sstf":
+            below = i - 1
+            if i == n or (below >= 0 and self.head - self._sorted[below][0] <= self._sorted[i][0] - self.head):
+                i = below
+            return i, abs(self._sorted[i][0] - self.head)
+
+        if self.policy == "scan":
+            if self.direction > 0:
+                if i < n:
+                    return i, self._sorted[i][0] - self.head
+                # Nothing above: travel to the last track, then sweep down
+                edge = self.model.num_tracks - 1
+                self.direction = -1
+                j = n - 1
+                return j, (edge - self.head) + (edge - self._sorted[j][0])
+            j = bisect_left(self._sorted, (self.head + 1, -1)) - 1
+            if j >= 0:
+                return j, self.head - self._sorted[j][0]
+            # Nothing below: travel to track 0, then sweep up
+            self.direction = 1
+            return 0, self.head + self._sorted[0][0]
+
+        # c-look (and deadline when nothing has expired)
+        if i == n:
+            i = 0  # wrap to the lowest pending track
+        return i, abs(self._sorted[i][0] - self.head)
+
+    def pop(self, now=0):
+        """
+        Remove the next request according to the policy
+        Returns: (process, track, distance the head travelled)
+        """
+        index, distance = self._pick(now)
+        track, seq = self._sorted.pop(index)
+        process, _, _ = self._entries.pop(seq)
+        self.head = track
+        return process, track, distance
+
+    def __repr__(self):
+        return f"DiskQueue({self.policy}, head={self.head}, pending={len(self)})"
@@ -0,0 +1,90 @@
+# events.py
+from collections import namedtuple
+
+# Event kinds. Every event is a process state transition; the kind says why.
+STATE = "state"          # arrived, moved between ready / wait queues
+DISPATCH = "dispatch"    # put on a CPU or I/O device
+PREEMPT = "preempt"      # taken off a CPU before its burst ended
+FINISH = "finish"        # completed its last burst
+KINDS = (STATE, DISPATCH, PREEMPT, FINISH)
+
+
+class Event(namedtuple("Event", ("kind", "time", "pid", "state", "device"))):
+    """
+    One process state transition
+    Attributes:
+        kind: STATE, DISPATCH, PREEMPT or FINISH
+        time: clock tick of the transition
+        pid: process id
+        state: the process state after the transition
+        device: "CPU<n>" / "IO<n>" for dispatches and preemptions, else None
+    """
+    __slots__ = ()
+
+
+class EventBus:
+    """
+    Collects the events of one step and hands them to subscribers as a batch
+
+    Schedulers only create a bus once something subscribes (see
+    Scheduler.subscribe); until then every emit site is a single
+    `self.bus is not None` check. Each subscriber receives a list of the
+    events it asked for, once per step, in the order they happened.
+
+    Attributes:
+        pending: events emitted since the last flush
+        delivered: number of events flushed so far
+    Methods:
+        subscribe(callback, kinds): callback(list of Event) after every step
+        unsubscribe(callback): stop delivering to callback
+        emit(kind, time, process, device): queue an event
+        flush(): deliver the queued events
+    """
+
+    def __init__(self):
+        self.pending = []
+        self.delivered = 0
+        self._subscribers = []   # (callback, set of kinds or None for all)
+
+    def __bool__(self):
+        return bool(self._subscribers)
+
+    def subscribe(self, callback, kinds=None):
+        if kinds is not None:
+            unknown = set(kinds) - set(KINDS)
+            if unknown:
+                raise ValueError(f"Unknown event kind(s) {sorted(unknown)}. Must be among: {', '.join(KINDS)}")
+            kinds = frozenset(kinds)
+        self._subscribers.append((callback, kinds))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, kinds) for cb, kinds in self._subscribers if cb is not callback]
+
+    def emit(self, kind, time, process, device=None):
+        """Queue a transition of process (its state is read now, so emit after changing it)"""
+        self.pending.append(Event(kind, time, process.pid, process.state, device))
+
+    def flush(self):
+        """Deliver the pending events to every subscriber"""
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        self.delivered += len(batch)
+        for callback, kinds in self._subscribers:
+            if kinds is None:
+                callback(batch)
+            else:
+                selected = [e for e in batch if e.kind in kinds]
+                if selected:
+                    callback(selected)
+
+
+class StateCallback:
+    """Adapts an old style callback(pid, new_state) to a batch subscriber"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def __call__(self, batch):
+        for event in batch:
+            self.callback(event.pid, event.state)
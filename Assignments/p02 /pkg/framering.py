@@ -0,0 +1,313 @@
+# framering.py
+from array import array
+from itertools import islice
+import multiprocessing
+from multiprocessing import shared_memory
+import time
+
+from .archive import SNAPSHOT_FINISHED
+from .snapshot import _clock, _devices, _ready_count, _ready_head, _remaining
+
+_MAGIC = 0x4652_4D52  # "FRMR"
+_HEADER = 10          # magic, slots, cpus, ios, top_n, pid bytes, published, done, stop, reserved
+_PUBLISHED, _DONE, _STOP = 6, 7, 8
+_EMPTY = -1           # no process (idle device, unused queue entry) / no remaining time
+
+
+def _all_processes(scheduler):
+    """Every process the scheduler knows about, in no particular order"""
+    s = scheduler
+    cpus, ios = _devices(s)
+    found = list(getattr(s, "not_arrived", ()))
+    found += _ready_head(s, _ready_count(s))
+    found += s.wait_queue
+    found += [p for p in list(cpus) + list(ios) if p is not None]
+    return found
+
+
+def _finished_pids(scheduler):
+    finished = scheduler.finished
+    return finished.pids if hasattr(finished, "pids") else [p.pid for p in finished]
+
+
+class FrameRing:
+    """
+    Fixed-layout scheduler frames in a shared-memory ring buffer
+
+    The simulator process publish()es one frame per step into the next slot,
+    overwriting the oldest; it never waits for a reader. A reader (the
+    visualizer) only ever looks at the newest slot, so frames it is too slow
+    to draw are simply skipped. Nothing is pickled and no lock is taken:
+    every slot starts with a sequence number the writer makes odd while it
+    writes and even again when done, and a reader that sees an odd or
+    changed number retries (a seqlock).
+
+    Pids are not stored as text: create() writes the pid table once and
+    frames hold indexes into it (-1 for an idle device or unused entry).
+
+    Slot layout (int64): seq, clock, counts (not_arrived, ready, wait,
+    finished), cpu[cpus], cpu_remaining[cpus], io[ios], io_remaining[ios],
+    then top_n pids of each of ready, wait, not_arrived and finished.
+
+    Attributes:
+        name: shared memory segment name
+        pids: the pid table
+        published: number of frames written so far
+        done: True once the simulator finished (or stopped)
+    Methods:
+        create(num_cpus, num_ios, pids): new ring for a run
+        attach(name): open a ring created elsewhere
+        publish(scheduler): write the scheduler's current state as a frame
+        get(): newest frame as a SnapshotCache style dict, or None before the first
+        finish() / request_stop() / stop_requested: end-of-run handshake
+        close(): detach (the creator also destroys the segment)
+    """
+
+    def __init__(self, shm, owner=False):
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name
+        header = shm.buf[:8 * _HEADER].cast("q")
+        magic, self.slots, self.num_cpus, self.num_ios, self.top_n, pid_bytes = header[:6]
+        header.release()
+        if magic != _MAGIC:
+            raise ValueError(f"Shared memory segment '{shm.name}' does not hold a frame ring")
+        c, i, n = self.num_cpus, self.num_ios, self.top_n
+        self.record = 6 + 2 * c + 2 * i + 4 * n
+        start = 8 * (_HEADER + self.slots * self.record)
+        self._ints = shm.buf[:start].cast("q")
+        names = bytes(shm.buf[start:start + pid_bytes]).decode()
+        self.pids = names.split("\n") if names else []
+        self._index = {pid: k for k, pid in enumerate(self.pids)}
+        self._version = -1
+        self._frame = None
+
+    @classmethod
+    def create(cls, num_cpus, num_ios, pids, slots=64, top_n=SNAPSHOT_FINISHED, name=None):
+        """Allocate a ring for a run over the given pids"""
+        names = "\n".join(str(pid) for pid in pids).encode()
+        record = 6 + 2 * num_cpus + 2 * num_ios + 4 * top_n
+        size = 8 * (_HEADER + slots * record) + len(names)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = array("q", [_MAGIC, slots, num_cpus, num_ios, top_n, len(names), 0, 0, 0, 0])
+        shm.buf[:8 * _HEADER] = header.tobytes()
+        start = 8 * (_HEADER + slots * record)
+        shm.buf[start:start + len(names)] = names
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def __reduce__(self):
+        return (FrameRing.attach, (self.name,))
+
+    # ---- Writer side (simulator process) ----
+
+    def _indexes(self, pids, length):
+        index = self._index
+        out = [index.get(str(pid), _EMPTY) if pid is not None else _EMPTY for pid in pids]
+        return out + [_EMPTY] * (length - len(out))
+
+    def publish(self, scheduler):
+        """Write the scheduler's current state into the next slot (never blocks)"""
+        s, n = scheduler, self.top_n
+        cpus, ios = _devices(s)
+        finished = s.finished
+        frame = array("q", [0, _clock(s),
+                            len(getattr(s, "not_arrived", ())), _ready_count(s),
+                            len(s.wait_queue), len(finished)])
+        frame.extend(self._indexes([p.pid if p is not None else None for p in cpus], self.num_cpus))
+        frame.extend(_EMPTY if r is None else r for r in (_remaining(p, "cpu") for p in cpus))
+        frame.extend(self._indexes([p.pid if p is not None else None for p in ios], self.num_ios))
+        frame.extend(_EMPTY if r is None else r for r in (_remaining(p, "io") for p in ios))
+        frame.extend(self._indexes([p.pid for p in _ready_head(s, n)], n))
+        frame.extend(self._indexes([p.pid for p in islice(s.wait_queue, n)], n))
+        frame.extend(self._indexes([p.pid for p in islice(getattr(s, "not_arrived", ()), n)], n))
+        head = finished.head(n) if hasattr(finished, "head") else [p.pid for p in finished[:n]]
+        frame.extend(self._indexes(head, n))
+
+        ints = self._ints
+        published = ints[_PUBLISHED]
+        base = _HEADER + (published % self.slots) * self.record
+        seq = ints[base]
+        ints[base] = seq + 1                    # odd: slot is being written
+        ints[base + 1:base + self.record] = frame[1:]
+        ints[base] = seq + 2                    # even: slot is consistent again
+        ints[_PUBLISHED] = published + 1
+
+    def finish(self):
+        self._ints[_DONE] = 1
+
+    @property
+    def stop_requested(self):
+        return bool(self._ints[_STOP])
+
+    # ---- Reader side (visualizer) ----
+
+    @property
+    def published(self):
+        return self._ints[_PUBLISHED]
+
+    @property
+    def done(self):
+        return bool(self._ints[_DONE])
+
+    def request_stop(self):
+        """Ask the simulator to stop after its current step"""
+        self._ints[_STOP] = 1
+
+    def _read(self, published):
+        """Consistent copy of frame number published - 1, or None if it was overwritten"""
+        ints, record = self._ints, self.record
+        base = _HEADER + ((published - 1) % self.slots) * record
+        expected = 2 * ((published - 1) // self.slots + 1)
+        while True:
+            seq = ints[base]
+            if seq & 1:
+                continue                        # writer is in this slot right now
+            values = ints[base:base + record].tolist()
+            if ints[base] == seq:
+                return values if seq == expected else None
+
+    def get(self):
+        """Newest frame as a snapshot dict (cached until a newer frame is published)"""
+        while True:
+            published = self.published
+            if published == self._version:
+                return self._frame
+            if published == 0:
+                return None
+            values = self._read(published)
+            if values is not None:
+                break                           # else the writer lapped us: read the newer frame
+        self._version = published
+        self._frame = self._decode(published, values)
+        return self._frame
+
+    def _decode(self, version, values):
+        pids, c, i, n = self.pids, self.num_cpus, self.num_ios, self.top_n
+
+        def names(start, length, keep_empty=False):
+            out = [pids[k] if k != _EMPTY else None for k in values[start:start + length]]
+            return out if keep_empty else [pid for pid in out if pid is not None]
+
+        def remaining(start, length):
+            return [r if r != _EMPTY else None for r in values[start:start + length]]
+
+        counts = dict(zip(("not_arrived", "ready", "wait", "finished"), values[2:6]))
+        pos = 6
+        cpu, cpu_remaining = names(pos, c, True), remaining(pos + c, c)
+        pos += 2 * c
+        io, io_remaining = names(pos, i, True), remaining(pos + i, i)
+        pos += 2 * i
+        ready, wait = names(pos, n), names(pos + n, n)
+        not_arrived, finished = names(pos + 2 * n, n), names(pos + 3 * n, n)
+        return {
+            "version": version,
+            "clock": values[1],
+            "not_arrived": not_arrived,
+            "ready": ready,
+            "wait": wait,
+            "cpu": cpu,
+            "io": io,
+            "cpu_remaining": cpu_remaining,
+            "io_remaining": io_remaining,
+            "finished": finished,
+            "finished_count": counts["finished"],
+            "counts": counts,
+        }
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._ints.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _simulate(ring_name, scheduler, rate, conn):
+    """Simulator process: step and publish until done or asked to stop, then send the scheduler back"""
+    ring = FrameRing.attach(ring_name)
+    try:
+        interval = 1.0 / rate if rate else 0
+        next_tick = time.monotonic()
+        ring.publish(scheduler)
+        while scheduler.has_jobs() and not ring.stop_requested:
+            scheduler.step()
+            ring.publish(scheduler)
+            if interval:
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        ring.finish()
+        conn.send(scheduler)
+    finally:
+        conn.close()
+        ring.close()
+
+
+class SimulatorProcess:
+    """
+    Runs a scheduler in a child process that streams frames into a FrameRing
+
+    The parent (the visualizer) reads ring.get() at its own pace; rendering
+    and simulation no longer share a GIL. result() waits for the child and
+    returns the finished scheduler (pickled once, at the end of the run), so
+    stats, exports and checkpoints work as after an in-process run.
+
+    Args:
+        scheduler: scheduler with its processes added (sent to the child)
+        rate: simulated ticks per second, or None to run flat out
+        slots: frames kept in the ring
+        top_n: pids per queue in a frame
+    Attributes:
+        ring: the FrameRing to read frames from
+    Methods:
+        start(): launch the child
+        stop(): ask the child to stop after its current step
+        result(): wait for the child; the scheduler in its final state
+    """
+
+    def __init__(self, scheduler, rate=None, slots=64, top_n=SNAPSHOT_FINISHED):
+        cpus, ios = _devices(scheduler)
+        pids = [p.pid for p in _all_processes(scheduler)] + _finished_pids(scheduler)
+        self.scheduler = scheduler
+        self.rate = rate
+        self.ring = FrameRing.create(len(cpus), len(ios), pids, slots=slots, top_n=top_n)
+        self._conn = None
+        self._process = None
+
+    def start(self):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_simulate, args=(self.ring.name, self.scheduler, self.rate, sender),
+            name="simulator", daemon=True)
+        self._process.start()
+        sender.close()
+        self._conn = receiver
+        return self
+
+    def stop(self):
+        self.ring.request_stop()
+
+    def result(self):
+        """Wait for the child to finish and return its scheduler (the ring is closed)"""
+        try:
+            scheduler = self._conn.recv()
+        except EOFError:
+            raise RuntimeError(f"Simulator process exited with code {self._process.exitcode}") from None
+        finally:
+            self._conn.close()
+            self._process.join()
+            self.ring.close()
+        return scheduler
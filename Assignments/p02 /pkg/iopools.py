@@ -0,0 +1,248 @@
+# iopools.py
+from collections import deque
+import json
+
+from .diskio import DiskCostModel, DiskQueue
+
+# One pool per family of I/O types found in gen_jobs/job_classes.json.
+# "*" marks the pool that takes any type not listed elsewhere.
+# A pool with a "scheduler" entry gets one elevator queue per device
+# (fifo, sstf, scan, c-look or deadline) and pays seek + rotation costs.
+DEFAULT_DEVICE_SPEC = [
+    {"name": "disk", "count": 1, "types": ["DISK_READ", "DISK_WRITE"]},
+    {"name": "console", "count": 1, "types": ["KEYBOARD_INPUT", "CONSOLE_OUTPUT"]},
+    {"name": "network", "count": 1, "types": ["SOCKET_READ", "SOCKET_WRITE", "NETWORK_RECV"]},
+    {"name": "generic", "count": 1, "types": ["*"]},
+]
+
+
+class IOPools:
+    """
+    Typed I/O device pools routed by the type of a process's I/O burst
+
+    Stands in for the single wait-queue deque: append() routes a process to
+    its pool's wait queue with one dict lookup, iteration walks every pool's
+    wait queue, and len() is the total waiting. The occupants of all devices
+    live in one flat `devices` list so schedulers can keep using it as their
+    io_queue.
+
+    Pools configured with a disk "scheduler" keep a DiskQueue per device
+    instead of a shared FIFO. Serving a disk request sets the process's
+    io_positioning to the seek and rotation cost of the head movement; the
+    device works that off before the transfer, and the burst keeps the
+    duration from the job file.
+
+    Attributes:
+        pools: pool name -> wait deque (plain pools)
+        elevators: pool name -> list of DiskQueue, one per device (disk pools)
+        pool_devices: pool name -> list of device indices in `devices`
+        device_pool: device index -> pool name
+        devices: process on each device or None
+        routes: io type -> pool name
+        default_pool: pool used for unknown types (the "*" pool, else the first)
+        served: pool name -> number of bursts dispatched
+        type_stats: io type -> bursts, wait, service and seek totals
+    Methods:
+        append(process): queue a process on the pool for its current I/O burst
+        pop(pool, index): next waiting process of one pool (or None)
+        dispatch(): fill every free device from its own pool, returns (index, process) pairs
+        depths(): pool name -> wait queue length
+        stats(): per pool device count, depth and bursts served
+        io_type_stats(elapsed): per io type throughput and latency
+    """
+
+    def __init__(self, spec=None, time_fn=None):
+        spec = spec if spec is not None else DEFAULT_DEVICE_SPEC
+        if not spec:
+            raise ValueError("Device spec needs at least one pool")
+        self.time_fn = time_fn  # returns the current clock time, used for latency stats
+        self.pools = {}
+        self.elevators = {}
+        self.pool_devices = {}
+        self.device_pool = []
+        self.routes = {}
+        self.served = {}
+        self.type_stats = {}
+        self.default_pool = spec[0]["name"]
+        for entry in spec:
+            name = entry["name"]
+            if name in self.pool_devices:
+                raise ValueError(f"Duplicate device pool '{name}'")
+            if entry.get("count", 1) < 1:
+                raise ValueError(f"Device pool '{name}' needs at least one device")
+            self.served[name] = 0
+            self.pool_devices[name] = []
+            for _ in range(entry.get("count", 1)):
+                self.pool_devices[name].append(len(self.device_pool))
+                self.device_pool.append(name)
+            if "scheduler" in entry:
+                model = DiskCostModel(**entry.get("cost_model", {}))
+                self.elevators[name] = [
+                    DiskQueue(entry["scheduler"], model, entry.get("deadline", 50))
+                    for _ in self.pool_devices[name]
+                ]
+            else:
+                self.pools[name] = deque()
+            for io_type in entry.get("types", []):
+                if io_type == "*":
+                    self.default_pool = name
+                else:
+                    self.routes[io_type] = name
+        self.devices = [None] * len(self.device_pool)
+        self._count = 0
+
+    @classmethod
+    def from_json(cls, filename, time_fn=None):
+        """Load a device spec (same layout as DEFAULT_DEVICE_SPEC) from a JSON file"""
+        with open(filename) as f:
+            return cls(json.load(f), time_fn=time_fn)
+
+    def _now(self):
+        return self.time_fn() if self.time_fn is not None else 0
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        for queue in self.pools.values():
+            yield from queue
+        for queues in self.elevators.values():
+            for queue in queues:
+                yield from queue
+
+    def pool_for(self, process):
+        """Pool name for the process's current burst"""
+        burst = process.current_burst()
+        if burst and "io" in burst:
+            return self.routes.get(burst["io"]["type"], self.default_pool)
+        return self.default_pool
+
+    def append(self, process):
+        """Queue a process on the wait queue of its burst's pool"""
+        name = self.pool_for(process)
+        now = self._now()
+        process.io_enqueued = now
+        if name in self.elevators:
+            # Spread requests over the pool's disks, shortest queue first
+            queues = self.elevators[name]
+            queue = min(queues, key=len)
+            queue.push(process, queue.model.track_for(process), now)
+        else:
+            self.pools[name].append(process)
+        self._count += 1
+
+    def pop(self, pool, index=None):
+        """
+        Next waiting process of a pool, or None
+        Args:
+            pool: pool name
+            index: device index asking for work (selects the disk queue of a disk pool)
+        """
+        now = self._now()
+        seek = 0
+        if pool in self.elevators:
+            queues = self.elevators[pool]
+            if index is not None:
+                queue = queues[self.pool_devices[pool].index(index)]
+            else:
+                queue = next((q for q in queues if q), None)
+            if not queue:
+                return None
+            process, _, distance = queue.pop(now)
+            seek = queue.model.cost(distance)
+            # Positioning time is paid on the device, before the transfer
+            process.io_positioning = seek
+        else:
+            queue = self.pools[pool]
+            if not queue:
+                return None
+            process = queue.popleft()
+        self._count -= 1
+        self.served[pool] += 1
+        self._record_service(process, now, seek)
+        return process
+
+    def _record_service(self, process, now, seek):
+        """Account the queueing and service time of a burst against its io type"""
+        burst = process.current_burst()
+        if not (burst and "io" in burst):
+            return
+        io_type = burst["io"]["type"]
+        stats = self.type_stats.get(io_type)
+        if stats is None:
+            stats = self.type_stats[io_type] = {"bursts": 0, "wait": 0, "service": 0, "seek": 0}
+        stats["bursts"] += 1
+        stats["wait"] += now - getattr(process, "io_enqueued", now)
+        # Positioning plus the remaining duration is the service time: a device runs one unit per tick
+        stats["service"] += seek + burst["io"]["duration"] - process.time_in_burst
+        stats["seek"] += seek
+
+    def dispatch(self):
+        """
+        Assign waiting processes to free devices of their own pool
+        Returns: list of (device index, process) that were assigned
+        """
+        assigned = []
+        for name, queue in self.pools.items():
+            if not queue:
+                continue
+            for index in self.pool_devices[name]:
+                if not queue:
+                    break
+                if self.devices[index] is None:
+                    process = self.pop(name)
+                    self.devices[index] = process
+                    assigned.append((index, process))
+        for name, queues in self.elevators.items():
+            for index, queue in zip(self.pool_devices[name], queues):
+                if queue and self.devices[index] is None:
+                    process = self.pop(name, index)
+                    self.devices[index] = process
+                    assigned.append((index, process))
+        return assigned
+
+    def depths(self):
+        """Wait queue length of every pool"""
+        depths = {name: len(queue) for name, queue in self.pools.items()}
+        for name, queues in self.elevators.items():
+            depths[name] = sum(len(queue) for queue in queues)
+        return depths
+
+    def stats(self):
+        """Per pool device count, wait depth and bursts served"""
+        depths = self.depths()
+        return {
+            name: {
+                "devices": len(self.pool_devices[name]),
+                "waiting": depths[name],
+                "served": self.served[name],
+                "policy": self.elevators[name][0].policy if name in self.elevators else "fifo",
+            }
+            for name in self.pool_devices
+        }
+
+    def io_type_stats(self, elapsed):
+        """
+        Throughput and latency per io type
+        Args:
+            elapsed: simulated time the bursts were served over
+        Returns: io type -> bursts, throughput (bursts per 100 ticks), mean wait,
+                 mean latency (wait + service) and mean seek cost
+        """
+        result = {}
+        for io_type, stats in sorted(self.type_stats.items()):
+            n = stats["bursts"]
+            result[io_type] = {
+                "bursts": n,
+                "throughput": 100 * n / elapsed if elapsed else 0.0,
+                "mean_wait": stats["wait"] / n,
+                "mean_latency": (stats["wait"] + stats["service"]) / n,
+                "mean_seek": stats["seek"] / n,
+            }
+        return result
+
+    def __repr__(self):
+        return f"IOPools({self.depths()})"
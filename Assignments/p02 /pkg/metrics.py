@@ -0,0 +1,34 @@
+# metrics.py
+import math
+
+# Metrics returned by compute_metrics(), all in ticks
+METRICS = ("mean_response", "mean_wait", "mean_turnaround", "p99_turnaround")
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _first_cpu_time(process):
+    """First dispatch time; the schedulers use different attribute names for it"""
+    if hasattr(process, "first_dispatch_time"):
+        return process.first_dispatch_time
+    return getattr(process, "first_run_time", process.arrival_time)
+
+
+def compute_metrics(finished):
+    """Summary metrics for a list of finished processes"""
+    if not finished:
+        return {}
+    response = [_first_cpu_time(p) - p.arrival_time for p in finished]
+    turnaround = [p.end_time - p.arrival_time for p in finished]
+    wait = [p.wait_time for p in finished]
+    return {
+        "mean_response": sum(response) / len(response),
+        "mean_wait": sum(wait) / len(wait),
+        "mean_turnaround": sum(turnaround) / len(turnaround),
+        "p99_turnaround": _percentile(turnaround, 99),
+    }
@@ -8,6 +8,7 @@ class Process:
         bursts: list of bursts [{"cpu": X}, {"io": {"type": T, "duration": D}}, ...]
         priority: scheduling priority (0 = highest)
         state: current state ("new", "ready", "running", "waiting", "finished")
+        io_positioning: ticks a disk still spends positioning before this I/O burst transfers
     Methods:
         current_burst(): returns the current burst or None if done
         advance_burst(): advances the burst by one time unit, returns True if burst completed
@@ -15,6 +16,9 @@ class Process:
         __str__(): user-friendly string representation
     """
 
+    # Set by a disk pool when it serves the burst (class default keeps old checkpoints loadable)
+    io_positioning = 0
+
     def __init__(self, pid, bursts, priority=0, arrival_time=0, quantum=4):
         """Initialize process with pid, bursts, and priority"""
         self.pid = pid
@@ -58,6 +62,10 @@ class Process:
             return False
         
         burst = self.bursts[self.current_burst_index]
+        if self.io_positioning and "io" in burst:
+            # Seek and rotation come before the transfer; the burst itself is not lengthened
+            self.io_positioning -= 1
+            return False
         self.time_in_burst += 1
         
         # Check if burst is complete
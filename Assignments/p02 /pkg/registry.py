@@ -0,0 +1,90 @@
+# registry.py
+from collections.abc import Mapping
+from importlib import import_module
+
+# Scheduler name -> "module:Class". Modules are imported on first use only.
+SCHEDULER_PATHS = {
+    "fcfs": "schedulers.fcfs:FCFSScheduler",
+    "rr": "schedulers.round_robin:RRScheduler",
+    "sjf": "schedulers.sjf:SJFScheduler",
+    "srtf": "schedulers.srjf:SRTFScheduler",
+    "priority": "schedulers.priority:PriorityScheduler",
+    "adaptive": "schedulers.adaptive:AdaptiveScheduler",
+    "mlfq": "schedulers.mlfq:MLFQScheduler",
+    "cfs": "schedulers.cfs:CFSScheduler",
+}
+
+# Other accepted spellings (matching is case-insensitive and a trailing "scheduler" is ignored)
+ALIASES = {
+    "roundrobin": "rr",
+    "srjf": "srtf",
+}
+
+# Schedulers that can keep one run queue per CPU (per_cpu_queues=True) with work stealing
+PER_CPU_SCHEDULERS = ("fcfs", "rr")
+
+
+def per_cpu_options(name, balance_interval=None):
+    """
+    Constructor options for per-CPU run queues
+    Raises ValueError for a scheduler that only has a shared ready queue.
+    """
+    if name not in PER_CPU_SCHEDULERS:
+        raise ValueError(f"Scheduler '{name}' has no per-CPU run queues. "
+                         f"Must be one of: {', '.join(PER_CPU_SCHEDULERS)}")
+    options = {"per_cpu_queues": True}
+    if balance_interval is not None:
+        options["balance_interval"] = balance_interval
+    return options
+
+
+class SchedulerRegistry(Mapping):
+    """
+    Scheduler classes by name, imported lazily
+
+    Behaves like a read-only dict of name -> class, but a scheduler module is
+    only imported when its class is looked up, so a run (or a pool worker)
+    pays for the one policy it uses. Membership tests and iteration over the
+    names import nothing.
+
+    Methods:
+        canonical(name): registry key for a name or alias ("RRScheduler" -> "rr"), or None
+        load(name): the class for a name or alias (raises ValueError if unknown)
+    """
+
+    def __init__(self, paths=SCHEDULER_PATHS, aliases=ALIASES):
+        self.paths = dict(paths)
+        self.aliases = dict(aliases)
+        self._classes = {}
+
+    def canonical(self, name):
+        key = name.lower()
+        if key not in self.paths and key.endswith("scheduler"):
+            key = key[:-len("scheduler")]
+        key = self.aliases.get(key, key)
+        return key if key in self.paths else None
+
+    def load(self, name):
+        key = self.canonical(name)
+        if key is None:
+            raise ValueError(f"Unknown scheduler '{name}'. Must be one of: {', '.join(self.paths)}")
+        return self[key]
+
+    def __getitem__(self, key):
+        cls = self._classes.get(key)
+        if cls is None:
+            module, _, attr = self.paths[key].partition(":")
+            cls = self._classes[key] = getattr(import_module(module), attr)
+        return cls
+
+    def __contains__(self, key):
+        return key in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+
+SCHEDULERS = SchedulerRegistry()
@@ -0,0 +1,127 @@
+# runqueues.py
+from collections import deque
+
+
+class RunQueues:
+    """
+    Per-CPU FIFO run queues with work stealing and periodic load balancing
+
+    Drop-in replacement for a single ready-queue deque: append() picks a CPU
+    queue, iteration walks every queue, and len() is the total. Dispatch uses
+    pop(cpu) so each CPU only touches its own queue unless it has to steal.
+
+    Attributes:
+        queues: one deque per CPU
+        steals: per-CPU count of processes stolen from other queues
+        migrations: per-CPU count of processes that ran there after last running elsewhere
+        max_depths: deepest each queue has been
+        balance_moves: number of processes moved by balance()
+    Methods:
+        append(process): enqueue on the process's last CPU, or the shortest queue
+        pop(cpu): next process for a CPU, stealing from the longest queue if empty
+        balance(): even out the queue lengths
+        depths(): list of per-CPU queue lengths
+        stats(): dict with depths, steals and migrations
+    """
+
+    def __init__(self, num_cpus):
+        self.queues = [deque() for _ in range(num_cpus)]
+        self.steals = [0] * num_cpus
+        self.migrations = [0] * num_cpus
+        self.max_depths = [0] * num_cpus
+        self.balance_moves = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        for queue in self.queues:
+            yield from queue
+
+    def _shortest(self):
+        """Index of the shortest queue (lowest index wins ties)"""
+        return min(range(len(self.queues)), key=lambda i: len(self.queues[i]))
+
+    def _longest(self):
+        """Index of the longest queue (lowest index wins ties)"""
+        return max(range(len(self.queues)), key=lambda i: len(self.queues[i]))
+
+    def append(self, process):
+        """Enqueue a process; it goes back to the CPU it last ran on for locality"""
+        cpu = getattr(process, "last_cpu", None)
+        if cpu is None:
+            cpu = self._shortest()
+        queue = self.queues[cpu]
+        queue.append(process)
+        self._count += 1
+        if len(queue) > self.max_depths[cpu]:
+            self.max_depths[cpu] = len(queue)
+
+    def popleft(self):
+        """Pop from the longest queue (for code that does not know about CPUs)"""
+        return self.pop(self._longest())
+
+    def pop(self, cpu):
+        """
+        Next process for a CPU
+        Args:
+            cpu: CPU index asking for work
+        Returns: a process, or None if every queue is empty
+        """
+        if not self._count:
+            return None
+        queue = self.queues[cpu]
+        if queue:
+            process = queue.popleft()
+        else:
+            # Idle CPU: steal the oldest entry of the busiest queue
+            victim = self._longest()
+            process = self.queues[victim].popleft()
+            self.steals[cpu] += 1
+        self._count -= 1
+
+        last_cpu = getattr(process, "last_cpu", None)
+        if last_cpu is not None and last_cpu != cpu:
+            self.migrations[cpu] += 1
+        process.last_cpu = cpu
+        return process
+
+    def balance(self):
+        """
+        Move processes from the longest to the shortest queue until no two
+        queues differ by more than one
+        Returns: number of processes moved
+        """
+        moved = 0
+        while True:
+            src = self._longest()
+            dst = self._shortest()
+            if len(self.queues[src]) - len(self.queues[dst]) <= 1:
+                break
+            # Move the most recently queued process, it has the least cache warmth to lose
+            self.queues[dst].append(self.queues[src].pop())
+            self.max_depths[dst] = max(self.max_depths[dst], len(self.queues[dst]))
+            moved += 1
+        self.balance_moves += moved
+        return moved
+
+    def depths(self):
+        """Current length of every per-CPU queue"""
+        return [len(queue) for queue in self.queues]
+
+    def stats(self):
+        """Per-CPU depth, steal and migration counts"""
+        return {
+            "depths": self.depths(),
+            "max_depths": list(self.max_depths),
+            "steals": list(self.steals),
+            "migrations": list(self.migrations),
+            "balance_moves": self.balance_moves,
+        }
+
+    def __repr__(self):
+        return f"RunQueues(depths={self.depths()})"
@@ -1,11 +1,26 @@
 # This is Dr. Griffin's version (I think) of scheduler.py.
 from pkg.clock import Clock
 from pkg.cpu import CPU
+from pkg.events import EventBus, StateCallback, STATE, DISPATCH, FINISH
+from pkg.simlog import SimLog, DEBUG, INFO
 from pkg.iodevice import IODevice
+from pkg.iopools import IOPools
+from pkg.sketch import LatencyStats
+from pkg.snapshot import _ready_count
+from pkg.utilization import UtilizationSeries
 import collections
+from functools import partial
 import csv
 import json
 
+# Recording levels, each including the ones before it:
+#   none     nothing is logged
+#   summary  process completions only
+#   changes  every state change (enqueue, dispatch, burst ends, completions)
+#   full     state changes plus a line with the queues and devices every step
+RECORD_LEVELS = {"none": 0, "summary": 1, "changes": 2, "full": 3}
+_SUMMARY, _CHANGES, _FULL = 1, 2, 3
+
 
 class Scheduler:
     """
@@ -17,19 +32,33 @@ class Scheduler:
         wait_queue: deque of processes waiting for I/O
         cpus: list of CPU instances
         io_devices: list of IODevice instances
+        io_pools: IOPools routing I/O bursts by type, or None for one shared wait queue
         finished: list of completed processes
+        latency: LatencyStats sketches of wait, turnaround and response times
+        utilization: UtilizationSeries of device busy time and queue depths per window
         log: human-readable log of events
         events: structured log of events for export
         verbose: if True, print log entries to console
+        out: SimLog that verbose output goes to, None to print directly
+        record_level: how much goes into log/events (see RECORD_LEVELS); defaults
+            to "full" when verbose, else "changes"
+        record_every: only record on every k-th tick (1 = every tick)
+        bus: EventBus of process transitions, None until something subscribes
     Methods:
         add_process(process): add a new process to the ready queue
+        subscribe(callback, kinds): receive each step's process transitions as a batch
+        log_output(target, level): send verbose output through a buffered background writer
         step(): advance the scheduler by one time unit
         run(): run the scheduler until all processes are finished
+        step_many(n): take up to n steps in one call
+        run_until(until): step until a time, a predicate or completion
         timeline(): return the human-readable log as a string
         export_json(filename): export the structured log to a JSON file
-        export_csv(filename): export the structured log to a CSV file"""
+        export_csv(filename): export the structured log to a CSV file
+        export_utilization(filename): export the utilization windows to a JSON file"""
 
-    def __init__(self, num_cpus=1, num_ios=1, verbose=True):
+    def __init__(self, num_cpus=1, num_ios=1, verbose=True, device_spec=None, util_window=100,
+                 record_level=None, record_every=1):
 
         self.clock = Clock()  # shared clock instance for all components Borg pattern
 
@@ -45,14 +74,118 @@ class Scheduler:
         # uses a list comprehension to create a list of IODevice objects
         self.io_devices = [IODevice(did=i, clock=self.clock) for i in range(num_ios)]
 
+        # With a device spec every pool gets its own wait queue and its devices
+        # are typed by pool name, so bursts only go to devices of their type
+        self.io_pools = IOPools(device_spec, time_fn=self.clock.now) if device_spec is not None else None
+        if self.io_pools is not None:
+            self.wait_queue = self.io_pools
+            self.io_devices = [
+                IODevice(did=i, clock=self.clock, dtype=pool)
+                for i, pool in enumerate(self.io_pools.device_pool)
+            ]
+
         self.finished = []  # list of finished processes
+        self.latency = LatencyStats()  # wait/turnaround/response percentiles, updated as processes finish
+        # busy time per CPU / IO device and queue depths, in util_window tick windows
+        self.utilization = UtilizationSeries(
+            len(self.cpus), len(self.io_devices), window=util_window, start=self.clock.now()
+        )
         self.log = []  # human-readable + snapshots
         self.events = []  # structured log for export
         self.verbose = verbose  # if True, print log entries to console
+        self.set_recording(record_level, record_every)
+
+    def set_recording(self, level=None, every=1):
+        """
+        Choose how much of the run is logged. Work for a level that is off is
+        skipped where the event happens, so a stats-only run ("none") builds
+        no log strings or event dicts at all.
+        Args:
+            level: "none", "summary", "changes" or "full" (None = "full" when verbose, else "changes")
+            every: record only on ticks that are a multiple of every
+        """
+        if level is None:
+            level = "full" if self.verbose else "changes"
+        if level not in RECORD_LEVELS:
+            raise ValueError(f"Unknown record level '{level}'. Must be one of: {', '.join(RECORD_LEVELS)}")
+        if every < 1:
+            raise ValueError("record_every must be at least 1")
+        self.record_level = level
+        self.record_every = every
+        self._level = RECORD_LEVELS[level]
+
+    def _tick_level(self):
+        """Recording level in effect for the current tick (0 on unsampled ticks)"""
+        if self.record_every > 1 and self.clock.now() % self.record_every:
+            return 0
+        return self._level
+
+    def __getstate__(self):
+        """Pickled state (for checkpoints) leaves out the event subscribers, log writer and trace writer"""
+        state = self.__dict__.copy()
+        state.pop("bus", None)
+        state.pop("out", None)
+        state.pop("step", None)  # trace()'s stand-in holds an open file; a resumed run is untraced
+        return state
+
+    # ---- Verbose output ----
+    # Class attribute like bus: the policy subclasses print directly until log_output()
+    out = None
+
+    def log_output(self, target=None, level="info", chunk_lines=1000):
+        """
+        Turn on verbose output through a SimLog: lines are buffered and written
+        in large chunks by a background thread instead of one print per event
+        Args:
+            target: file name, open file, or None for stdout
+            level: "debug" (everything, including dispatches), "info" or "warning"
+        Returns: the SimLog (call close_log() when done)
+        """
+        self.close_log()
+        self.out = SimLog(target, level=level, chunk_lines=chunk_lines)
+        self.verbose = True
+        return self.out
+
+    def close_log(self):
+        """Write out and stop the SimLog started by log_output()"""
+        if self.out is not None:
+            self.out.close()
+            self.out = None
+
+    def _say(self, message, level=INFO):
+        """One line of verbose output"""
+        out = self.out
+        if out is None:
+            print(message)
+        else:
+            out.write(message, level)
+
+    # ---- Event bus ----
+    # Emit sites check `self.bus is not None`, so with no subscribers they cost
+    # one attribute lookup. Shared by the policy subclasses, which skip __init__.
+    bus = None
+
+    def subscribe(self, callback, kinds=None):
+        """
+        Call callback(list of Event) after every step that had transitions
+        Args:
+            callback: receives the step's events (see pkg.events)
+            kinds: event kinds to receive (None = all of STATE, DISPATCH, PREEMPT, FINISH)
+        """
+        if self.bus is None:
+            self.bus = EventBus()
+        self.bus.subscribe(callback, kinds)
+
+    def unsubscribe(self, callback):
+        """Stop delivering events to callback; the bus goes away with its last subscriber"""
+        if self.bus is not None:
+            self.bus.unsubscribe(callback)
+            if not self.bus:
+                self.bus = None
 
     def on_state_change(self, callback):
-        """Register a callback for state changes (e.g., for the View)."""
-        self._callback = callback
+        """Register a callback(pid, new_state) for state changes (e.g., for the View)."""
+        self.subscribe(StateCallback(callback))
 
     def add_process(self, process):
         """
@@ -74,13 +207,16 @@ class Scheduler:
 
         # adds the process to the end of the ready queue
         self.ready_queue.append(process)
+        if self.bus is not None:
+            self.bus.emit(STATE, self.clock.now(), process)
 
         # Log the event
-        self._record(
-            f"{process.pid} added to ready queue",
-            event_type="enqueue",
-            proc=process.pid,
-        )
+        if self._tick_level() >= _CHANGES:
+            self._record(
+                f"{process.pid} added to ready queue",
+                event_type="enqueue",
+                proc=process.pid,
+            )
 
     def processes(self):
         """Return all processes known to the scheduler"""
@@ -109,7 +245,7 @@ class Scheduler:
 
         # Print to console if verbose
         if self.verbose:
-            print(entry)
+            self._say(entry, DEBUG if event_type.startswith("dispatch") else INFO)
 
         # structured record for export as JSON/CSV
         self.events.append(
@@ -146,7 +282,7 @@ class Scheduler:
         # Append the snapshot to the log
         self.log.append(snap)
         if self.verbose:
-            print(snap)
+            self._say(snap, DEBUG)
 
     # snapshot method strictly for the visualizer portion
     def snapshot(self):
@@ -159,15 +295,13 @@ class Scheduler:
         'ios': [dev.current.pid if dev.current else None for dev in self.io_devices]
     }
 
-    def _callback(self, pid, new_state):
-        """Placeholder for state change callback"""
-        pass
-
     def step(self):
         """
         Advance the scheduler by one time unit
         Returns: None
         """
+        level = self._tick_level()  # what gets recorded this tick
+
         for p in self.ready_queue:
             p.wait_time += 1  # Increment wait time for processes in ready queue
         for p in self.wait_queue:
@@ -190,45 +324,50 @@ class Scheduler:
                 if burst and "io" in burst:
                     proc.state = "waiting"
                     self.wait_queue.append(proc)
-                    # if self._callback:
-                    #     self._callback(proc.pid, "waiting")
-                    self._record(
-                        f"{proc.pid} finished CPU → wait queue",
-                        event_type="cpu_to_io",
-                        proc=proc.pid,
-                        device=f"CPU{cpu.cid}",
-                    )
+                    if self.bus is not None:
+                        self.bus.emit(STATE, self.clock.now(), proc)
+                    if level >= _CHANGES:
+                        self._record(
+                            f"{proc.pid} finished CPU → wait queue",
+                            event_type="cpu_to_io",
+                            proc=proc.pid,
+                            device=f"CPU{cpu.cid}",
+                        )
 
                 # If the next burst is CPU, move to ready queue
                 elif burst and "cpu" in burst:
+                    proc.state = "ready"
                     self.ready_queue.append(proc)
-                    # if self._callback:
-                    #     self._callback(proc.pid, "ready")
+                    if self.bus is not None:
+                        self.bus.emit(STATE, self.clock.now(), proc)
 
                     # logs event of moving process to ready queue
-                    self._record(
-                        f"{proc.pid} finished CPU → ready queue",
-                        event_type="cpu_to_ready",
-                        proc=proc.pid,
-                        device=f"CPU{cpu.cid}",
-                    )
+                    if level >= _CHANGES:
+                        self._record(
+                            f"{proc.pid} finished CPU → ready queue",
+                            event_type="cpu_to_ready",
+                            proc=proc.pid,
+                            device=f"CPU{cpu.cid}",
+                        )
                 # No more bursts, process is finished
                 else:
                     proc.state = "finished"
                     proc.end_time = self.clock.now()
                     proc.turnaround_time = proc.end_time - proc.start_time
                     self.finished.append(proc)
+                    self.latency.record(proc)
 
-                    # if self._callback:
-                    #     self._callback(proc.pid, "finished")
+                    if self.bus is not None:
+                        self.bus.emit(FINISH, self.clock.now(), proc)
 
                     # logs event of process finishing all bursts
-                    self._record(
-                        f"{proc.pid} finished all bursts",
-                        event_type="finished",
-                        proc=proc.pid,
-                        device=f"CPU{cpu.cid}",
-                    )
+                    if level >= _SUMMARY:
+                        self._record(
+                            f"{proc.pid} finished all bursts",
+                            event_type="finished",
+                            proc=proc.pid,
+                            device=f"CPU{cpu.cid}",
+                        )
 
         # Tick IO devices
         for dev in self.io_devices:
@@ -242,16 +381,17 @@ class Scheduler:
                 if burst:
                     proc.state = "ready"
                     self.ready_queue.append(proc)
-                    if self._callback:
-                        self._callback(proc.pid, "ready")
+                    if self.bus is not None:
+                        self.bus.emit(STATE, self.clock.now(), proc)
 
                     # logs event of moving process to ready queue
-                    self._record(
-                        f"{proc.pid} finished I/O → ready queue",
-                        event_type="io_to_ready",
-                        proc=proc.pid,
-                        device=f"IO{dev.did}",
-                    )
+                    if level >= _CHANGES:
+                        self._record(
+                            f"{proc.pid} finished I/O → ready queue",
+                            event_type="io_to_ready",
+                            proc=proc.pid,
+                            device=f"IO{dev.did}",
+                        )
                 # else process is finished
                 else:
                     proc.state = "finished"
@@ -259,16 +399,18 @@ class Scheduler:
                     proc.end_time = self.clock.now()
                     proc.turnaround_time = proc.end_time - proc.start_time
                     self.finished.append(proc)
-                    if self._callback:
-                        self._callback(proc.pid, "finished")
+                    self.latency.record(proc)
+                    if self.bus is not None:
+                        self.bus.emit(FINISH, self.clock.now(), proc)
 
                     # logs event of process finishing all bursts
-                    self._record(
-                        f"{proc.pid} finished all bursts",
-                        event_type="finished",
-                        proc=proc.pid,
-                        device=f"IO{dev.did}",
-                    )
+                    if level >= _SUMMARY:
+                        self._record(
+                            f"{proc.pid} finished all bursts",
+                            event_type="finished",
+                            proc=proc.pid,
+                            device=f"IO{dev.did}",
+                        )
 
         # Dispatch to CPUs
         for cpu in self.cpus:
@@ -285,30 +427,51 @@ class Scheduler:
 
                 # Assign process to CPU
                 cpu.assign(proc)
+                if self.bus is not None:
+                    self.bus.emit(DISPATCH, self.clock.now(), proc, f"CPU{cpu.cid}")
 
                 # Log the dispatch event
-                self._record(
-                    f"{proc.pid} dispatched to CPU{cpu.cid}",
-                    event_type="dispatch_cpu",
-                    proc=proc.pid,
-                    device=f"CPU{cpu.cid}",
-                )
+                if level >= _CHANGES:
+                    self._record(
+                        f"{proc.pid} dispatched to CPU{cpu.cid}",
+                        event_type="dispatch_cpu",
+                        proc=proc.pid,
+                        device=f"CPU{cpu.cid}",
+                    )
 
         # Dispatch to IO devices
         # Same logic as above but for IO devices and wait queue
         for dev in self.io_devices:
             if not dev.is_busy() and self.wait_queue:
-                proc = self.wait_queue.popleft()
+                if self.io_pools is not None:
+                    proc = self.io_pools.pop(dev.dtype, dev.did)
+                    if proc is None:
+                        continue
+                else:
+                    proc = self.wait_queue.popleft()
                 dev.assign(proc)
-                self._record(
-                    f"{proc.pid} dispatched to IO{dev.did}",
-                    event_type="dispatch_io",
-                    proc=proc.pid,
-                    device=f"IO{dev.did}",
-                )
+                if self.bus is not None:
+                    self.bus.emit(DISPATCH, self.clock.now(), proc, f"IO{dev.did}")
+                if level >= _CHANGES:
+                    self._record(
+                        f"{proc.pid} dispatched to IO{dev.did}",
+                        event_type="dispatch_io",
+                        proc=proc.pid,
+                        device=f"IO{dev.did}",
+                    )
 
-        if self.verbose:
+        self.utilization.sample(
+            self.clock.now(),
+            [cpu.current for cpu in self.cpus],
+            [dev.current for dev in self.io_devices],
+            len(self.ready_queue),
+            len(self.wait_queue),
+        )
+
+        if level >= _FULL:
             self._snapshot()
+        if self.bus is not None:
+            self.bus.flush()
         self.clock.tick()
     
     def has_jobs(self):
@@ -323,17 +486,142 @@ class Scheduler:
     def run(self):
         """
         Run the scheduler until all processes are finished
-        Returns: None
+        Returns: summary dict (see run_until)
         """
 
         # Continue stepping while there are processes in ready/wait queues
         # or any CPU/IO device is busy
-        while self.has_jobs():
-            self.step()
+        return self.run_until(None)
+
+    # ---- Batched stepping ----
+    def _now(self):
+        """Current time (the policy subclasses keep a plain int clock)"""
+        clock = self.clock
+        return clock.now() if isinstance(clock, Clock) else clock
+
+    def _step_summary(self, steps, start, finished_before):
+        end = self._now()
+        return {
+            "steps": steps,
+            "start": start,
+            "end": end,
+            "ticks": end - start,  # can exceed steps when idle stretches are skipped
+            "finished": len(self.finished) - finished_before,
+            "done": not self.has_jobs(),
+        }
+
+    def step_many(self, n):
+        """
+        Take up to n steps in one call, stopping early when no jobs are left
+        Returns: summary dict (see run_until)
+        """
+        start, finished = self._now(), len(self.finished)
+        step, has_jobs = self.step, self.has_jobs  # bound once, honours a wrapped step()
+        steps = 0
+        while steps < n and has_jobs():
+            step()
+            steps += 1
+        return self._step_summary(steps, start, finished)
+
+    def run_until(self, until, max_steps=None):
+        """
+        Step until a time is reached, a condition holds or no jobs are left
+        Args:
+            until: time to stop at (the clock may pass it when an idle
+                   stretch is skipped), a predicate called with the scheduler
+                   before each step, or None to run to completion
+            max_steps: stop after this many steps (None = no limit)
+        Returns: dict with steps taken, start/end clock, ticks elapsed,
+                 processes finished and done (no jobs left)
+        """
+        start, finished = self._now(), len(self.finished)
+        step, has_jobs = self.step, self.has_jobs
+        limit = float("inf") if max_steps is None else max_steps
+        steps = 0
+        if until is None:
+            while steps < limit and has_jobs():
+                step()
+                steps += 1
+        elif callable(until):
+            while steps < limit and has_jobs() and not until(self):
+                step()
+                steps += 1
+        else:
+            now = self._now
+            while steps < limit and now() < until and has_jobs():
+                step()
+                steps += 1
+        return self._step_summary(steps, start, finished)
+
+    # ---- Typed I/O pools (policy subclasses) ----
+    def _init_io_pools(self, device_spec):
+        """
+        Typed I/O pools: one wait queue per pool, bursts routed by io type.
+        With a spec, wait_queue becomes the pools and io_queue their devices.
+        """
+        # The clock getter is a partial rather than a lambda so checkpoints can pickle it
+        self.io_pools = IOPools(device_spec, time_fn=partial(getattr, self, "clock")) if device_spec is not None else None
+        if self.io_pools is not None:
+            self.wait_queue = self.io_pools
+            self.io_queue = self.io_pools.devices
+            self.num_ios = len(self.io_queue)
+
+    def _dispatch_io_pools(self):
+        """
+        Fill idle I/O devices from their pools
+        Returns: False when there are no pools (dispatch from the shared wait queue instead)
+        """
+        if self.io_pools is None:
+            return False
+        # Each pool only fills its own devices, so disk work never holds up console I/O
+        for io_index, process in self.io_pools.dispatch():
+            process.state = "io_waiting"
+            if self.bus is not None:
+                self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
+            if self.verbose:
+                self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index} "
+                          f"({self.io_pools.device_pool[io_index]})", DEBUG)
+        return True
+
+    def _print_io_pool_stats(self):
+        """Per-pool and per-io-type lines of print_stats (nothing without pools)"""
+        if self.io_pools is None:
+            return
+        for name, pool in self.io_pools.stats().items():
+            print(f"I/O Pool {name} ({pool['policy']}): {pool['devices']} device(s), {pool['served']} bursts served")
+        for io_type, io in self.io_pools.io_type_stats(self.clock).items():
+            print(f"  {io_type:<15} bursts={io['bursts']:<5} throughput={io['throughput']:.2f}/100t "
+                  f"latency={io['mean_latency']:.2f} wait={io['mean_wait']:.2f} seek={io['mean_seek']:.2f}")
+
+    # ---- Idle fast-forward (policy subclasses, which keep an int clock) ----
+    def _sort_arrivals(self):
+        """Put not_arrived in arrival order (policies that accept out-of-order adds override this)"""
+
+    def _idle_skipped(self, next_arrival):
+        """Account for the idle ticks from the clock up to next_arrival (policies with timers override this)"""
+
+    def _skip_idle(self):
+        """
+        Jump the clock straight to the next arrival when nothing is running,
+        ready or waiting. The skipped ticks are idle, so stats are unchanged
+        (utilization counts the gap as idle time).
+        """
+        if (not self.not_arrived or _ready_count(self) or self.wait_queue
+                or any(p is not None for p in self.cpu_queue)
+                or any(p is not None for p in self.io_queue)):
+            return
+        self._sort_arrivals()
+        next_arrival = self.not_arrived[0].arrival_time
+        if next_arrival > self.clock:
+            skipped = next_arrival - self.clock
+            self._idle_skipped(next_arrival)
+            if self.verbose:
+                self._say(f"[Clock {self.clock}] Idle, skipping {skipped} ticks to {next_arrival}")
+            self.clock = next_arrival
 
     def timeline(self):
-        """Return the human-readable log as a single string"""
-        return "\n".join(self.log)
+        """Return the human-readable log as a single string (empty for policy subclasses, which keep no log)"""
+        return "\n".join(getattr(self, "log", ()))
 
     # ---- Exporters ----
     def export_json(self, filename="timeline.json"):
@@ -341,7 +629,7 @@ class Scheduler:
         with open(filename, "w") as f:
             json.dump(self.events, f, indent=2)
         if self.verbose:
-            print(f"✅ Timeline exported to {filename}")
+            self._say(f"✅ Timeline exported to {filename}")
 
     def export_csv(self, filename="timeline.csv"):
         """Export the timeline to a CSV file"""
@@ -360,7 +648,13 @@ class Scheduler:
             writer.writeheader()
             writer.writerows(self.events)
         if self.verbose:
-            print(f"✅ Timeline exported to {filename}")
+            self._say(f"✅ Timeline exported to {filename}")
+
+    def export_utilization(self, filename="utilization.json"):
+        """Export the windowed CPU/IO utilization and queue depths to a JSON file"""
+        self.utilization.export_json(filename)
+        if self.verbose:
+            self._say(f"✅ Utilization exported to {filename}")
 
     def print_stats(self):
         """Print statistics for all finished processes"""
@@ -449,4 +743,6 @@ class Scheduler:
         print(f"\nAverage Wait Time:          {avg_wait_time:.2f}")
         print(f"Average Turnaround Time:    {avg_turnaround_time:.2f}")
         print(f"Average Response Time:      {avg_response_time:.2f}")
+        print()
+        self.latency.print_summary()
         print("="*80 + "\n")
\ No newline at end of file
@@ -0,0 +1,290 @@
+# shared_workload.py
+from array import array
+from multiprocessing import shared_memory, util
+
+from .process import Process
+
+try:
+    import numpy as np
+except ImportError:  # optional: plain memoryviews are used without it
+    np = None
+
+_MAGIC = 0x5357_4B4C  # "SWKL"
+_HEADER = 6           # magic, processes, bursts, pid bytes, io type bytes, reserved
+_CPU = -1             # burst kind of a CPU burst; I/O bursts store their type index
+
+# Segments this process has attached to, by name (workers attach once per pool)
+_attached = {}
+_detach_registered = False
+
+# Per-run progress kept in one int64 array, one record of these fields per process.
+# wait_time stays a plain attribute: schedulers bump it for every ready process
+# on every tick, and going through the array there made runs about 5x slower.
+_PROGRESS = ("current_burst_index", "time_in_burst", "turnaround_time",
+             "runtime", "io_time", "start_time", "end_time")
+_INDEX, _ELAPSED, _RUNTIME, _IO_TIME = (_PROGRESS.index(field) for field in
+                                        ("current_burst_index", "time_in_burst", "runtime", "io_time"))
+
+
+def _detach_all():
+    """Close every attached table (runs when a pool worker exits)"""
+    for table in list(_attached.values()):
+        table.close()
+
+
+class _Progress:
+    """Process attribute stored in the run's progress array instead of the instance"""
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def __get__(self, process, owner=None):
+        if process is None:
+            return self
+        return process._progress[process._slot + self.offset]
+
+    def __set__(self, process, value):
+        process._progress[process._slot + self.offset] = value
+
+
+class _SharedBursts:
+    """Read-only burst list of one process; each burst is built on access from the table"""
+
+    __slots__ = ("table", "start", "stop")
+
+    def __init__(self, table, start, stop):
+        self.table, self.start, self.stop = table, start, stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("burst index out of range")
+        return self.table.burst(self.start + index)
+
+    def __iter__(self):
+        for j in range(self.start, self.stop):
+            yield self.table.burst(j)
+
+
+class SharedProcess(Process):
+    """
+    Process backed by a SharedWorkload row
+
+    The bursts stay in the shared table and the counters a run mutates
+    (current burst index, time in burst, timings) live in a per-run
+    progress array, so a handle holds only the scalar fields schedulers
+    set on it. Behaves like Process everywhere else.
+    """
+
+    def __init__(self, table, index, progress):
+        self.pid = table.pid(index)
+        self.priority = int(table.priority[index])
+        self.arrival_time = int(table.arrival_time[index])
+        self.quantum = 4
+        self.state = "new"
+        self.wait_time = 0
+        self.bursts = _SharedBursts(table, int(table.burst_start[index]), int(table.burst_start[index + 1]))
+        self._progress = progress
+        self._slot = index * len(_PROGRESS)
+
+    def advance_burst(self):
+        """Process.advance_burst() read straight from the columns (no burst dict per tick)"""
+        bursts, progress, slot = self.bursts, self._progress, self._slot
+        index = progress[slot + _INDEX]
+        if index >= len(bursts):
+            return False
+        table, j = bursts.table, bursts.start + index
+        io = table.burst_kind[j] != _CPU
+        if io and self.io_positioning:
+            self.io_positioning -= 1
+            return False
+        elapsed = progress[slot + _ELAPSED] + 1
+        length = int(table.burst_length[j])
+        if elapsed < length:
+            progress[slot + _ELAPSED] = elapsed
+            return False
+        progress[slot + (_IO_TIME if io else _RUNTIME)] += length
+        progress[slot + _INDEX] = index + 1
+        progress[slot + _ELAPSED] = 0
+        return True
+
+    def _burst_total(self, cpu):
+        bursts = self.bursts
+        table = bursts.table
+        return sum(int(table.burst_length[j]) for j in range(bursts.start, bursts.stop)
+                   if (int(table.burst_kind[j]) == _CPU) == cpu)
+
+    @property
+    def init_cpu_bursts(self):
+        return self._burst_total(cpu=True)
+
+    @property
+    def init_io_bursts(self):
+        return self._burst_total(cpu=False)
+
+    @property
+    def TotalBursts(self):
+        return self.init_cpu_bursts + self.init_io_bursts
+
+
+for _offset, _field in enumerate(_PROGRESS):
+    setattr(SharedProcess, _field, _Progress(_offset))
+del _offset, _field
+
+
+class SharedWorkload:
+    """
+    A workload spec compiled into one flat shared-memory table
+
+    Pool workers get the table by name: pickling a SharedWorkload only sends
+    its name, and unpickling attaches to the existing segment, so a sweep
+    ships a few bytes per job instead of the whole list of burst dicts.
+    build_processes() does not copy the bursts either: a run allocates one
+    progress array plus a small SharedProcess handle per process. Workers
+    detach from their tables when they exit.
+
+    Layout (int64 columns, in this order, then two UTF-8 blobs):
+        arrival_time[n], priority[n], burst_start[n + 1],
+        burst_kind[m] (-1 = cpu, else index into the io type names),
+        burst_length[m], pid_start[n + 1], pid bytes, io type names ("\\n" separated)
+
+    Columns are NumPy arrays when NumPy is installed, else memoryviews;
+    both index the shared buffer without copying.
+
+    Attributes:
+        name: shared memory segment name
+        arrival_time, priority, burst_start, burst_kind, burst_length: column views
+        io_types: io type names
+    Methods:
+        create(workload): compile a workload spec (see pkg.workload.load_workload)
+        attach(name): open an existing table
+        burst(j): burst j of the table as a burst dict
+        build_processes(): fresh SharedProcess handles for one run
+        close(): detach (the creator also destroys the segment)
+    """
+
+    def __init__(self, shm, owner=False):
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name
+        header = shm.buf[:8 * _HEADER].cast("q")
+        magic, n, m, pid_bytes, type_bytes = header[:5]
+        header.release()
+        if magic != _MAGIC:
+            raise ValueError(f"Shared memory segment '{shm.name}' does not hold a workload")
+        self._n, self._m = n, m
+        self._views = []  # memoryviews into the segment, released by close()
+        offset = 8 * _HEADER
+        columns = {}
+        for column, length in (("arrival_time", n), ("priority", n), ("burst_start", n + 1),
+                               ("burst_kind", m), ("burst_length", m), ("pid_start", n + 1)):
+            columns[column] = self._column(offset, length)
+            offset += 8 * length
+        self.__dict__.update(columns)
+        self._pids = shm.buf[offset:offset + pid_bytes]
+        self._views.append(self._pids)
+        offset += pid_bytes
+        names = bytes(shm.buf[offset:offset + type_bytes]).decode()
+        self.io_types = names.split("\n") if names else []
+
+    def _column(self, offset, length):
+        if np is not None:
+            return np.ndarray((length,), dtype=np.int64, buffer=self._shm.buf, offset=offset)
+        view = self._shm.buf[offset:offset + 8 * length].cast("q")
+        self._views.append(view)
+        return view
+
+    @classmethod
+    def create(cls, workload, name=None):
+        """Compile a workload spec into a new shared memory segment"""
+        arrival, priority, burst_start = array("q"), array("q"), array("q", [0])
+        kind, length, pid_start = array("q"), array("q"), array("q", [0])
+        pids = bytearray()
+        types = {}
+        for spec in workload:
+            arrival.append(spec["arrival_time"])
+            priority.append(spec["priority"])
+            for b in spec["bursts"]:
+                if "cpu" in b:
+                    kind.append(_CPU)
+                    length.append(b["cpu"])
+                else:
+                    kind.append(types.setdefault(b["io"]["type"], len(types)))
+                    length.append(b["io"]["duration"])
+            burst_start.append(len(kind))
+            pids += str(spec["pid"]).encode()
+            pid_start.append(len(pids))
+        type_names = "\n".join(types).encode()
+        header = array("q", [_MAGIC, len(arrival), len(kind), len(pids), len(type_names), 0])
+        blobs = [header, arrival, priority, burst_start, kind, length, pid_start]
+        size = sum(len(a) * 8 for a in blobs) + len(pids) + len(type_names)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        offset = 0
+        for blob in blobs:
+            data = blob.tobytes()
+            shm.buf[offset:offset + len(data)] = data
+            offset += len(data)
+        shm.buf[offset:offset + len(pids)] = pids
+        offset += len(pids)
+        shm.buf[offset:offset + len(type_names)] = type_names
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Open a table created elsewhere (cached, so a worker attaches once)"""
+        global _detach_registered
+        table = _attached.get(name)
+        if table is None:
+            table = _attached[name] = cls(shared_memory.SharedMemory(name=name))
+            if not _detach_registered:
+                # Runs at pool worker exit, where atexit handlers are skipped
+                util.Finalize(None, _detach_all, exitpriority=10)
+                _detach_registered = True
+        return table
+
+    def __reduce__(self):
+        return (SharedWorkload.attach, (self.name,))
+
+    def __len__(self):
+        return self._n
+
+    def pid(self, index):
+        return bytes(self._pids[self.pid_start[index]:self.pid_start[index + 1]]).decode()
+
+    def burst(self, j):
+        k = int(self.burst_kind[j])
+        if k == _CPU:
+            return {"cpu": int(self.burst_length[j])}
+        return {"io": {"type": self.io_types[k], "duration": int(self.burst_length[j])}}
+
+    def build_processes(self):
+        """Create fresh SharedProcess handles over a zeroed progress array for one run"""
+        progress = array("q", bytes(8 * len(_PROGRESS) * self._n))
+        return [SharedProcess(self, i, progress) for i in range(self._n)]
+
+    def close(self):
+        """Detach from the segment (release any column views first)"""
+        if self._shm is None:
+            return
+        for view in self._views:
+            view.release()
+        self._views = []
+        for column in ("arrival_time", "priority", "burst_start", "burst_kind", "burst_length", "pid_start"):
+            self.__dict__.pop(column, None)
+        _attached.pop(self.name, None)
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
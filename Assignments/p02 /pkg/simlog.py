@@ -0,0 +1,99 @@
+# simlog.py
+import queue
+import sys
+import threading
+import time
+
+# Message levels (higher = more important)
+DEBUG = 10   # dispatches, per-step queue lines
+INFO = 20    # arrivals, preemptions, completions, idle skips, exports
+WARNING = 30
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING}
+
+
+class SimLog:
+    """
+    Buffered verbose output written by a background thread
+
+    write() only appends to an in-memory list; full chunks (or whatever has
+    accumulated after flush_interval seconds) are handed to a writer thread
+    that writes them to the target in one call. The simulation never waits
+    on the terminal or the disk, except in flush() and close().
+
+    Messages below `level` are dropped at write().
+
+    Args:
+        target: file name, open file object, or None for stdout
+        level: "debug", "info" or "warning"
+        chunk_lines: lines per hand-off to the writer
+        flush_interval: seconds after which a partial chunk is handed off anyway
+    Attributes:
+        lines: number of lines accepted so far
+    Methods:
+        write(message, level): buffer one line
+        flush(): write everything buffered and wait for it
+        close(): flush and stop the writer (closes the file if SimLog opened it)
+    """
+
+    def __init__(self, target=None, level="info", chunk_lines=1000, flush_interval=0.5):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level '{level}'. Must be one of: {', '.join(LEVELS)}")
+        if isinstance(target, str):
+            self._stream, self._owned = open(target, "w"), True
+        else:
+            self._stream, self._owned = target if target is not None else sys.stdout, False
+        self.level = LEVELS[level]
+        self.chunk_lines = chunk_lines
+        self.flush_interval = flush_interval
+        self.lines = 0
+        self._buffer = []
+        self._last_handoff = time.monotonic()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="simlog", daemon=True)
+        self._thread.start()
+
+    def write(self, message, level=INFO):
+        if level < self.level:
+            return
+        self._buffer.append(message)
+        self.lines += 1
+        if len(self._buffer) >= self.chunk_lines or time.monotonic() - self._last_handoff >= self.flush_interval:
+            self._handoff()
+
+    def _handoff(self):
+        if self._buffer:
+            chunk, self._buffer = self._buffer, []
+            self._queue.put(chunk)
+        self._last_handoff = time.monotonic()
+
+    def _writer(self):
+        while True:
+            chunk = self._queue.get()
+            try:
+                if chunk is None:
+                    return
+                self._stream.write("\n".join(chunk) + "\n")
+                self._stream.flush()
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Hand off the partial chunk and wait until everything is written"""
+        self._handoff()
+        self._queue.join()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._owned:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
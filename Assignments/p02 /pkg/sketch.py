@@ -0,0 +1,169 @@
+# sketch.py
+
+
+class QuantileSketch:
+    """
+    Mergeable log-linear histogram for latency quantiles (HDR-histogram style)
+
+    Values below 2**precision_bits get an exact bucket each. Larger values
+    share buckets whose width doubles every power of two, so every bucket is
+    within 2**-(precision_bits-1) of its values (under 2% with the default
+    precision) and memory grows with log(max value), not with the sample count.
+    Two sketches with the same precision merge by adding bucket counts.
+
+    Attributes:
+        count, total, min, max: exact running aggregates
+        buckets: bucket index -> count
+    Methods:
+        record(value): add one sample
+        merge(other): fold another sketch into this one
+        quantile(q): approximate value at quantile q (0..1)
+        summary(): dict with count, mean, p50, p90, p95, p99, max
+    """
+
+    def __init__(self, precision_bits=7):
+        self.precision_bits = precision_bits
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        """Bucket index of a non-negative integer value"""
+        bits = self.precision_bits
+        if value < (1 << bits):
+            return value
+        shift = value.bit_length() - bits
+        return (shift << (bits - 1)) + (value >> shift)
+
+    def _bounds(self, index):
+        """Smallest and largest value that map to a bucket"""
+        bits = self.precision_bits
+        if index < (1 << bits):
+            return index, index
+        shift = (index >> (bits - 1)) - 1
+        mantissa = index - (shift << (bits - 1))
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        """Add one sample (negative values are clamped to 0)"""
+        value = max(0, int(round(value)))
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Fold another sketch (e.g. from a sweep worker) into this one"""
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge sketches with different precision")
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def quantile(self, q):
+        """Approximate value at quantile q, or None if the sketch is empty"""
+        if not self.count:
+            return None
+        rank = max(1, min(self.count, int(q * self.count + 0.999999)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, high = self._bounds(index)
+                # Midpoint of the bucket, kept inside the exact observed range
+                return min(self.max, max(self.min, (low + high) // 2))
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def summary(self):
+        """Count, mean and the usual SLO percentiles"""
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+    def to_dict(self):
+        """Plain-dict form for JSON export"""
+        return {
+            "precision_bits": self.precision_bits,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["precision_bits"])
+        sketch.buckets = {int(k): v for k, v in data["buckets"].items()}
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
+
+
+class LatencyStats:
+    """
+    Wait, turnaround and response time sketches, updated as processes finish
+    Attributes:
+        wait, turnaround, response: QuantileSketch instances
+    Methods:
+        record(process): add a finished process
+        merge(other): fold another LatencyStats into this one
+        print_summary(): print a p50/p90/p99/max table
+    """
+
+    METRICS = ("wait", "turnaround", "response")
+
+    def __init__(self, precision_bits=7):
+        self.wait = QuantileSketch(precision_bits)
+        self.turnaround = QuantileSketch(precision_bits)
+        self.response = QuantileSketch(precision_bits)
+
+    def record(self, process):
+        """Add a finished process to every sketch"""
+        # The schedulers name the first-dispatch timestamp differently
+        first_cpu = getattr(process, "first_dispatch_time", None)
+        if first_cpu is None:
+            first_cpu = getattr(process, "first_run_time", process.arrival_time)
+        self.wait.record(process.wait_time)
+        self.turnaround.record(process.end_time - process.arrival_time)
+        self.response.record(first_cpu - process.arrival_time)
+
+    def merge(self, other):
+        for name in self.METRICS:
+            getattr(self, name).merge(getattr(other, name))
+        return self
+
+    def summary(self):
+        return {name: getattr(self, name).summary() for name in self.METRICS}
+
+    def print_summary(self):
+        """Print the latency distribution table"""
+        print(f"{'Latency':<12} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+        for name in self.METRICS:
+            s = getattr(self, name).summary()
+            if not s["count"]:
+                continue
+            print(f"{name.capitalize():<12} {s['p50']:>8} {s['p90']:>8} {s['p99']:>8} {s['max']:>8}")
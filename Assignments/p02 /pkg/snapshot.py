@@ -0,0 +1,154 @@
+# snapshot.py
+from collections import deque
+from itertools import islice
+
+from .archive import SNAPSHOT_FINISHED
+
+# Scheduler attributes copied into snapshots when present
+EXTRA_ATTRS = ("quantum", "current_quantum")
+
+
+def _ready_count(scheduler):
+    if hasattr(scheduler, "ready_count"):
+        return scheduler.ready_count
+    return len(scheduler.ready_queue)
+
+
+def _ready_head(scheduler, limit):
+    """First `limit` ready processes in dispatch order, without copying the whole queue"""
+    if hasattr(scheduler, "ready_head"):
+        return scheduler.ready_head(limit)
+    return list(islice(scheduler.ready_queue, limit))
+
+
+def _devices(scheduler):
+    if hasattr(scheduler, "cpu_queue"):
+        return scheduler.cpu_queue, scheduler.io_queue
+    return [cpu.current for cpu in scheduler.cpus], [dev.current for dev in scheduler.io_devices]
+
+
+def _remaining(process, kind):
+    """Ticks left in the current cpu/io burst of a process on a device, or None"""
+    if process is None:
+        return None
+    burst = process.current_burst()
+    if not burst or kind not in burst:
+        return None
+    if kind == "cpu":
+        return burst["cpu"] - process.time_in_burst
+    return process.io_positioning + burst["io"]["duration"] - process.time_in_burst
+
+
+def _clock(scheduler):
+    clock = scheduler.clock
+    return clock.now() if hasattr(clock, "now") else clock
+
+
+class SnapshotCache:
+    """
+    Versioned snapshots of a scheduler for visualizers
+
+    get() compares a cheap signature of the scheduler (clock, queue lengths,
+    device occupants) with the last one and only builds a new snapshot when
+    it changed; otherwise the cached snapshot is returned, so several calls
+    per frame cost one signature check each. A snapshot lists at most
+    `limit` pids per queue plus the exact count of every queue, so its cost
+    does not grow with the number of processes.
+
+    Every new version appends an entry to a bounded change log: the devices
+    whose occupant changed, the pids finished since the previous version and
+    the new counts.
+
+    Snapshot keys: version, clock, not_arrived, ready, wait (pid heads),
+    cpu, io (pid per device), cpu_remaining, io_remaining (ticks left in the
+    burst on each device), finished (pid head), finished_count,
+    counts (exact length of every queue), plus quantum/current_quantum.
+
+    Attributes:
+        version: number of the latest snapshot (0 before the first get())
+    Methods:
+        get(): current snapshot dict (do not modify it, it is shared)
+        changes_since(version): change log entries after version, or None
+            when the log no longer reaches back that far
+    """
+
+    def __init__(self, scheduler, limit=SNAPSHOT_FINISHED, log_size=1000):
+        self.scheduler = scheduler
+        self.limit = limit
+        self.version = 0
+        self.log = deque(maxlen=log_size)
+        self._signature = None
+        self._snapshot = None
+
+    def _counts(self):
+        s = self.scheduler
+        return {
+            "not_arrived": len(getattr(s, "not_arrived", ())),
+            "ready": _ready_count(s),
+            "wait": len(s.wait_queue),
+            "finished": len(s.finished),
+        }
+
+    def get(self):
+        s = self.scheduler
+        cpus, ios = _devices(s)
+        cpu = tuple(p.pid if p is not None else None for p in cpus)
+        io = tuple(p.pid if p is not None else None for p in ios)
+        counts = self._counts()
+        signature = (_clock(s), cpu, io, tuple(counts.values()))
+        if signature == self._signature:
+            return self._snapshot
+
+        previous = self._snapshot
+        self.version += 1
+        self._signature = signature
+        limit = self.limit
+        finished = s.finished
+        snap = {
+            "version": self.version,
+            "clock": signature[0],
+            "not_arrived": [p.pid for p in islice(getattr(s, "not_arrived", ()), limit)],
+            "ready": [p.pid for p in _ready_head(s, limit)],
+            "wait": [p.pid for p in islice(s.wait_queue, limit)],
+            "cpu": list(cpu),
+            "io": list(io),
+            "cpu_remaining": [_remaining(p, "cpu") for p in cpus],
+            "io_remaining": [_remaining(p, "io") for p in ios],
+            "finished": finished.head(limit) if hasattr(finished, "head") else [p.pid for p in finished[:limit]],
+            "finished_count": counts["finished"],
+            "counts": counts,
+        }
+        for attr in EXTRA_ATTRS:
+            if hasattr(s, attr):
+                snap[attr] = getattr(s, attr)
+        self._snapshot = snap
+        self._log_change(previous, snap)
+        return snap
+
+    def _log_change(self, previous, snap):
+        before = previous["finished_count"] if previous else 0
+        finished = self.scheduler.finished
+        if hasattr(finished, "pids"):
+            new_finished = finished.pids[before:]
+        else:
+            new_finished = [p.pid for p in finished[before:]]
+        entry = {
+            "version": snap["version"],
+            "clock": snap["clock"],
+            "cpu": {i: pid for i, pid in enumerate(snap["cpu"])
+                    if previous is None or previous["cpu"][i] != pid},
+            "io": {i: pid for i, pid in enumerate(snap["io"])
+                   if previous is None or previous["io"][i] != pid},
+            "finished": new_finished,
+            "counts": snap["counts"],
+        }
+        self.log.append(entry)
+
+    def changes_since(self, version):
+        """Change log entries newer than version, oldest first (None if no longer available)"""
+        if version >= self.version:
+            return []
+        if not self.log or self.log[0]["version"] > version + 1:
+            return None
+        start = version + 1 - self.log[0]["version"]
+        return list(islice(self.log, start, None))
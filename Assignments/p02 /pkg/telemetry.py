@@ -0,0 +1,228 @@
+# telemetry.py
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+import time
+
+from .snapshot import _clock, _ready_count
+
+# Step phases timed when present on a scheduler, in the order step() calls them
+PHASES = (
+    "_skip_idle",
+    "_check_arrivals",
+    "_adapt_quantum",
+    "_priority_boost",
+    "_check_preemption",
+    "_process_cpus",
+    "_process_io_devices",
+    "_update_min_vruntime",
+    "_dispatch_to_cpus",
+    "_dispatch_per_cpu",
+    "_dispatch_to_io_devices",
+)
+
+
+class PhaseTimings:
+    """
+    Wall time and call count per step phase, over the sampled steps only
+    Attributes:
+        every: one step in `every` is timed
+        seconds: phase name -> total seconds over the sampled steps
+        calls: phase name -> number of timed calls
+        sampling: True while the current sample is being taken
+    """
+
+    def __init__(self, every=1):
+        self.every = every
+        self.seconds = {}
+        self.calls = {}
+        self.sampling = False
+        self.countdown = 1  # the first step is sampled
+
+
+# Phase every scheduler calls exactly once per step; it counts steps for the sampler
+GATE_PHASE = "_process_cpus"
+
+
+def _timed_phase(timings, key, method, scheduler):
+    """Stand-in for a phase method: times it while a sample is being taken"""
+    if not timings.sampling:
+        return method(scheduler)
+    start = time.perf_counter()
+    try:
+        return method(scheduler)
+    finally:
+        timings.seconds[key] += time.perf_counter() - start
+        timings.calls[key] += 1
+
+
+def _sampling_gate(timings, key, method, scheduler):
+    """
+    Stand-in for the gate phase: counts steps and opens a sample every
+    `every` steps. A sample runs from one gate call to the next, so it sees
+    every phase once (those before the gate on the following step)
+    """
+    timings.countdown -= 1
+    if timings.countdown:
+        timings.sampling = False
+    else:
+        timings.countdown = timings.every
+        timings.sampling = True
+    return _timed_phase(timings, key, method, scheduler)
+
+
+def instrument(scheduler, every=100):
+    """
+    Time the step phases of a scheduler on one step in `every`
+
+    Opt-in and separate from MetricsServer: a scheduler that is not
+    instrumented pays nothing. The stand-ins are partials of plain
+    functions (cheap to call, picklable for checkpoints) and are installed
+    once, so between samples each phase costs one flag check.
+    Returns: the PhaseTimings being filled in
+    """
+    if every < 1:
+        raise ValueError(f"Phase timing sample interval must be at least 1, got {every}")
+    uninstrument(scheduler)
+    timings = PhaseTimings(every)
+    phases = [name for name in PHASES if callable(getattr(type(scheduler), name, None))]
+    gate = GATE_PHASE if GATE_PHASE in phases else phases[0] if phases else None
+    for name in phases:
+        key = name.lstrip("_")
+        timings.seconds[key] = 0.0
+        timings.calls[key] = 0
+        wrapper = _sampling_gate if name == gate else _timed_phase
+        setattr(scheduler, name, partial(wrapper, timings, key, getattr(type(scheduler), name), scheduler))
+    scheduler.phase_timings = timings
+    return timings
+
+
+def uninstrument(scheduler):
+    """Remove the phase timers added by instrument()"""
+    for name in PHASES:
+        stand_in = scheduler.__dict__.get(name)
+        if isinstance(stand_in, partial) and stand_in.func in (_timed_phase, _sampling_gate):
+            del scheduler.__dict__[name]
+    scheduler.__dict__.pop("phase_timings", None)
+
+
+def _depths(scheduler):
+    """Ready, wait and not-arrived queue lengths without copying any queue"""
+    return _ready_count(scheduler), len(scheduler.wait_queue), len(getattr(scheduler, "not_arrived", ()))
+
+
+def _busy(scheduler):
+    """Busy CPUs and I/O devices"""
+    if hasattr(scheduler, "cpu_queue"):
+        cpus, ios = scheduler.cpu_queue, scheduler.io_queue
+        return (sum(p is not None for p in cpus), len(cpus),
+                sum(p is not None for p in ios), len(ios))
+    cpus, ios = scheduler.cpus, scheduler.io_devices
+    return (sum(c.current is not None for c in cpus), len(cpus),
+            sum(d.current is not None for d in ios), len(ios))
+
+
+class MetricsServer:
+    """
+    Live simulation counters in Prometheus text format, served from a
+    background thread (GET /metrics)
+
+    A scrape only reads counters and queue lengths; the simulation loop is
+    never locked or paused, so scraping does not slow it down. Serving
+    metrics adds nothing to the loop either: phase timings are only
+    included when the scheduler was instrument()ed separately.
+
+    Attributes:
+        scheduler: scheduler being watched
+        host, port: address the server listens on (port 0 picks a free port)
+    Methods:
+        start(): start serving on a daemon thread, returns self
+        stop(): shut the server down
+        render(): the metrics page as a string
+    """
+
+    def __init__(self, scheduler, port=9100, host="127.0.0.1"):
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.started = time.monotonic()
+        self.start_clock = _clock(scheduler)
+        self._httpd = None
+        self._thread = None
+
+    def _ticks_per_second(self, clock, elapsed):
+        """
+        Simulated ticks per wall second since the server started. Scrapes do
+        not change any state, so concurrent scrapers see consistent rates;
+        rate(sched_clock_ticks) gives a windowed rate.
+        """
+        return (clock - self.start_clock) / elapsed if elapsed > 0 else 0.0
+
+    def render(self):
+        s = self.scheduler
+        ready, wait, not_arrived = _depths(s)
+        busy_cpus, num_cpus, busy_ios, num_ios = _busy(s)
+        clock = _clock(s)
+        elapsed = time.monotonic() - self.started
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP sched_{name} {help_text}")
+            lines.append(f"# TYPE sched_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"sched_{name}{labels} {value}")
+
+        metric("clock_ticks", "counter", "Simulated clock", [("", clock)])
+        metric("ticks_per_second", "gauge", "Simulated ticks per wall second since the server started",
+               [("", f"{self._ticks_per_second(clock, elapsed):.3f}")])
+        metric("wall_seconds", "counter", "Wall time since the server started",
+               [("", f"{elapsed:.3f}")])
+        metric("queue_depth", "gauge", "Processes per queue",
+               [('{queue="ready"}', ready), ('{queue="wait"}', wait), ('{queue="not_arrived"}', not_arrived)])
+        metric("devices_busy", "gauge", "Busy devices",
+               [('{device="cpu"}', busy_cpus), ('{device="io"}', busy_ios)])
+        metric("devices", "gauge", "Configured devices",
+               [('{device="cpu"}', num_cpus), ('{device="io"}', num_ios)])
+        metric("finished_total", "counter", "Finished processes", [("", len(s.finished))])
+
+        timings = getattr(s, "phase_timings", None)
+        if timings is not None:
+            metric("phase_sample_every", "gauge", "One call in this many of each phase is timed",
+                   [("", timings.every)])
+            metric("phase_seconds_total", "counter", "Wall time spent in the timed calls of each step phase",
+                   [(f'{{phase="{p}"}}', f"{v:.6f}") for p, v in list(timings.seconds.items())])
+            metric("phase_calls_total", "counter", "Timed calls of each step phase",
+                   [(f'{{phase="{p}"}}', v) for p, v in list(timings.calls.items())])
+        return "\n".join(lines) + "\n"
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = server.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep scrapes out of the simulation output
+
+        self._httpd = HTTPServer((self.host, self.port), Handler)
+        self.port = self._httpd.server_address[1]
+        # A short poll interval keeps stop() from holding up the end of a run
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05},
+                                        name="metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
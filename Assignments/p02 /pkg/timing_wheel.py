@@ -0,0 +1,181 @@
+# timing_wheel.py
+
+# Timer kinds used by the schedulers
+ARRIVAL = "arrival"
+IO_COMPLETE = "io_complete"
+QUANTUM_EXPIRY = "quantum_expiry"
+
+
+class Timer:
+    """
+    A single timer held by a TimingWheel
+    Attributes:
+        expiry: absolute clock time the timer fires at
+        kind: what the timer is for (ARRIVAL, IO_COMPLETE, QUANTUM_EXPIRY, ...)
+        payload: whatever the owner needs back when it fires (process, device index, ...)
+        cancelled: True once cancel() has been called
+    """
+
+    __slots__ = ("expiry", "kind", "payload", "cancelled")
+
+    def __init__(self, expiry, kind, payload=None):
+        self.expiry = expiry
+        self.kind = kind
+        self.payload = payload
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"Timer({self.kind}@{self.expiry}: {self.payload!r})"
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel for clock based triggers
+
+    Level 0 has one slot per tick. Each higher level has slots that are
+    `slots` times wider than the level below it, so a wheel with 4 levels of
+    64 slots covers 64**4 ticks. A timer is placed in the coarsest level that
+    still separates it from "now"; when the clock crosses a slot boundary of a
+    higher level, that slot is cascaded down. Timers further out than the
+    wheel covers wait in an overflow list until they come into range.
+
+    Attributes:
+        slots: number of slots per level
+        levels: number of levels
+        now: clock time the wheel has fired up to (inclusive)
+    Methods:
+        schedule(expiry, kind, payload): add a timer, O(1)
+        cancel(timer): cancel a timer, O(1)
+        tick(): advance one time unit, returns the batch of timers firing at the new time
+        advance_to(time): advance to time, returns a list of (time, batch) pairs
+        next_expiry(): earliest pending expiry time, or None
+        __len__(): number of pending timers
+    """
+
+    def __init__(self, slots=64, levels=4, now=0):
+        self.slots = slots
+        self.levels = levels
+        self.now = now
+        # spans[l] is how many ticks one slot of level l covers
+        self.spans = [slots**level for level in range(levels + 1)]
+        self.wheel = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _place(self, timer):
+        """Put a timer in the slot matching its distance from now"""
+        delta = timer.expiry - self.now
+        for level in range(self.levels):
+            if delta < self.spans[level + 1]:
+                index = (timer.expiry // self.spans[level]) % self.slots
+                self.wheel[level][index].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def schedule(self, expiry, kind, payload=None):
+        """
+        Schedule a timer
+        Args:
+            expiry: absolute time to fire at (times already passed fire on the next tick)
+            kind: timer kind
+            payload: value handed back when the timer fires
+        Returns: the Timer (keep it to cancel)
+        """
+        timer = Timer(max(expiry, self.now + 1), kind, payload)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer):
+        """Cancel a timer; it stays in its slot but is skipped when fired"""
+        if not timer.cancelled:
+            timer.cancelled = True
+            self._count -= 1
+
+    def _cascade(self, level):
+        """Re-place the timers of the current slot of a higher level"""
+        index = (self.now // self.spans[level]) % self.slots
+        bucket = self.wheel[level][index]
+        self.wheel[level][index] = []
+        for timer in bucket:
+            if not timer.cancelled:
+                self._place(timer)
+
+    def tick(self):
+        """
+        Advance the wheel by one time unit
+        Returns: list of timers that fire at the new time
+        """
+        self.now += 1
+
+        # Overflow timers come into range once per full turn of the top level
+        if self.overflow and self.now % self.spans[self.levels] == 0:
+            pending = self.overflow
+            self.overflow = []
+            for timer in pending:
+                if not timer.cancelled:
+                    self._place(timer)
+
+        # Cascade from the coarsest boundary crossed down to level 1
+        for level in range(self.levels - 1, 0, -1):
+            if self.now % self.spans[level] == 0:
+                self._cascade(level)
+
+        index = self.now % self.slots
+        bucket = self.wheel[0][index]
+        if not bucket:
+            return []
+        self.wheel[0][index] = []
+        fired = [timer for timer in bucket if not timer.cancelled]
+        for timer in fired:
+            timer.cancelled = True  # a fired timer can no longer be cancelled
+        self._count -= len(fired)
+        return fired
+
+    def advance_to(self, time):
+        """
+        Advance the wheel up to and including time
+        Returns: list of (time, timers) for every time slot that fired something
+        """
+        batches = []
+        while self.now < time:
+            if self._count == 0:
+                # Nothing pending, the wheel can jump without cascading
+                self._reset(time)
+                break
+            fired = self.tick()
+            if fired:
+                batches.append((self.now, fired))
+        return batches
+
+    def _reset(self, time):
+        """Move an empty wheel to a new time"""
+        self.wheel = [[[] for _ in range(self.slots)] for _ in range(self.levels)]
+        self.overflow = []
+        self.now = time
+
+    def next_expiry(self):
+        """
+        Earliest expiry time of any pending timer, or None if the wheel is empty
+        Scans the wheel slots rather than the timers, so it is cheap to call
+        """
+        if self._count == 0:
+            return None
+        candidates = [t.expiry for t in self.overflow if not t.cancelled]
+        for level in range(self.levels):
+            # Slots after the current one are in expiry order within a level,
+            # but a coarser level can still hold an earlier timer than a finer one
+            base = self.now // self.spans[level]
+            for offset in range(1, self.slots + 1):
+                bucket = self.wheel[level][(base + offset) % self.slots]
+                live = [t.expiry for t in bucket if not t.cancelled]
+                if live:
+                    candidates.append(min(live))
+                    break
+        return min(candidates) if candidates else None
+
+    def __repr__(self):
+        return f"TimingWheel(now={self.now}, pending={self._count})"
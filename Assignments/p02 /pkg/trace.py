@@ -0,0 +1,159 @@
+# trace.py
+import json
+
+from .snapshot import _ready_count
+
+# Trace-event "pid"s: one group of tracks for CPUs, one for I/O devices, one for counters
+_CPU_GROUP = 1
+_IO_GROUP = 2
+_QUEUE_GROUP = 3
+
+
+class ChromeTraceWriter:
+    """
+    Streams a schedule as Chrome trace-event JSON (chrome://tracing, Perfetto)
+
+    Every CPU and I/O device is a track and every burst a complete ("X")
+    slice, written as soon as it ends, so memory holds one open slice per
+    device no matter how long the run is. Ready/wait queue depths are
+    written as counter tracks when they change.
+
+    Feed it the device occupants once per tick with capture(); a process
+    that stays on a device across two bursts gets one slice per burst.
+
+    Attributes:
+        tick_us: trace microseconds per simulated tick (1000 shows ticks as ms)
+        slices: number of slices written
+    Methods:
+        capture(time, cpus, ios, ready_len, wait_len): record the occupants of one tick
+        close(time): end the open slices and finish the file
+    """
+
+    def __init__(self, filename, num_cpus, num_ios, tick_us=1000, io_names=None):
+        self.tick_us = tick_us
+        self.slices = 0
+        self._f = open(filename, "w")
+        self._f.write("[\n")
+        self._first = True
+        self._cpu_open = [None] * num_cpus   # (process, burst index, start, category) per CPU
+        self._io_open = [None] * num_ios
+        self._depths = (None, None)
+
+        self._write({"ph": "M", "name": "process_name", "pid": _CPU_GROUP, "args": {"name": "CPUs"}})
+        self._write({"ph": "M", "name": "process_name", "pid": _IO_GROUP, "args": {"name": "I/O devices"}})
+        self._write({"ph": "M", "name": "process_name", "pid": _QUEUE_GROUP, "args": {"name": "Queues"}})
+        for i in range(num_cpus):
+            self._write({"ph": "M", "name": "thread_name", "pid": _CPU_GROUP, "tid": i, "args": {"name": f"CPU {i}"}})
+        for i in range(num_ios):
+            name = f"IO {i}" if io_names is None else f"IO {i} ({io_names[i]})"
+            self._write({"ph": "M", "name": "thread_name", "pid": _IO_GROUP, "tid": i, "args": {"name": name}})
+
+    def _write(self, event):
+        if not self._first:
+            self._f.write(",\n")
+        self._first = False
+        self._f.write(json.dumps(event, separators=(",", ":")))
+
+    def _open_slice(self, group, process, time):
+        burst = process.current_burst()
+        cat = "cpu" if group == _CPU_GROUP else "io"
+        if burst and "io" in burst:
+            cat = burst["io"]["type"]  # finished processes drop their bursts, so read it now
+        return (process, process.current_burst_index, time, cat)
+
+    def _end_slice(self, group, tid, opened, end):
+        process, index, start, cat = opened
+        self._write({
+            "ph": "X", "name": f"P{process.pid}", "cat": cat,
+            "pid": group, "tid": tid,
+            "ts": start * self.tick_us, "dur": (end - start) * self.tick_us,
+            "args": {"pid": process.pid, "burst": index},
+        })
+        self.slices += 1
+
+    def _update(self, group, open_slices, occupants, time):
+        for i, process in enumerate(occupants):
+            opened = open_slices[i]
+            if process is not None:
+                if opened is not None and opened[0] is process and opened[1] == process.current_burst_index:
+                    continue  # same burst still running
+            elif opened is None:
+                continue
+            if opened is not None:
+                self._end_slice(group, i, opened, time)
+            open_slices[i] = self._open_slice(group, process, time) if process is not None else None
+
+    def capture(self, time, cpus, ios, ready_len=None, wait_len=None):
+        """
+        Record the occupants of one tick
+        Args:
+            time: the tick being recorded
+            cpus, ios: process (or None) on each CPU / I/O device
+            ready_len, wait_len: optional queue depths for the counter tracks
+        """
+        self._update(_CPU_GROUP, self._cpu_open, cpus, time)
+        self._update(_IO_GROUP, self._io_open, ios, time)
+        if ready_len is not None and (ready_len, wait_len) != self._depths:
+            self._depths = (ready_len, wait_len)
+            self._write({"ph": "C", "name": "queue depth", "pid": _QUEUE_GROUP, "ts": time * self.tick_us,
+                         "args": {"ready": ready_len, "wait": wait_len or 0}})
+
+    def close(self, time):
+        """End every open slice at time and finish the JSON array"""
+        if self._f is None:
+            return
+        for group, open_slices in ((_CPU_GROUP, self._cpu_open), (_IO_GROUP, self._io_open)):
+            for i, opened in enumerate(open_slices):
+                if opened is not None:
+                    self._end_slice(group, i, opened, time)
+                    open_slices[i] = None
+        self._f.write("\n]\n")
+        self._f.close()
+        self._f = None
+
+
+def _state(scheduler):
+    """(tick just simulated, cpu occupants, io occupants, ready len, wait len) of any scheduler"""
+    if hasattr(scheduler, "cpu_queue"):
+        return (scheduler.clock - 1, scheduler.cpu_queue, scheduler.io_queue,
+                _ready_count(scheduler), len(scheduler.wait_queue))
+    return (scheduler.clock.now() - 1,
+            [cpu.current for cpu in scheduler.cpus],
+            [dev.current for dev in scheduler.io_devices],
+            _ready_count(scheduler), len(scheduler.wait_queue))
+
+
+class _TracedStep:
+    """Stand-in for step() on a traced scheduler; captures the devices after every step"""
+
+    def __init__(self, scheduler, writer):
+        self.scheduler = scheduler
+        self.writer = writer
+
+    def __call__(self):
+        type(self.scheduler).step(self.scheduler)
+        self.writer.capture(*_state(self.scheduler))
+
+
+def trace(scheduler, filename, tick_us=1000):
+    """
+    Record the schedule of a scheduler to a Chrome trace file as it runs.
+    Works with any scheduler and with anything that drives step()
+    (run loops, the pygame visualizer). Call end_trace() when done; a
+    traced scheduler holds an open file, so end the trace before checkpointing.
+    Returns: the ChromeTraceWriter
+    """
+    _, cpus, ios, _, _ = _state(scheduler)
+    io_pools = getattr(scheduler, "io_pools", None)
+    io_names = io_pools.device_pool if io_pools is not None else None
+    writer = ChromeTraceWriter(filename, len(cpus), len(ios), tick_us=tick_us, io_names=io_names)
+    scheduler.step = _TracedStep(scheduler, writer)
+    return writer
+
+
+def end_trace(scheduler):
+    """Close the trace started by trace() and restore the plain step()"""
+    traced = scheduler.__dict__.pop("step", None)
+    if isinstance(traced, _TracedStep):
+        time = _state(scheduler)[0] + 1
+        traced.writer.close(time)
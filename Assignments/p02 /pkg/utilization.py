@@ -0,0 +1,153 @@
+# utilization.py
+from array import array
+import csv
+import json
+
+
+class UtilizationSeries:
+    """
+    Busy time of every CPU and I/O device, plus ready/wait queue depth,
+    accumulated into fixed-width time windows
+
+    The current window is accumulated in plain counters; when it fills up it
+    is appended to compact typed arrays (one entry per window), so a long run
+    costs a few bytes per device per window instead of an event per tick.
+
+    Attributes:
+        window: window width in ticks
+        cpu_busy, io_busy: per device array of busy ticks per window
+        ready_sum, wait_sum: array of summed queue depths per window
+        ready_max, wait_max: array of the deepest queue seen per window
+    Methods:
+        sample(clock, cpus, ios, ready_len, wait_len): record one tick
+        windows(): list of per-window dicts (utilization fractions, average/max depths)
+        saturated(threshold): windows where every CPU was at least threshold busy
+        export_json(filename) / export_csv(filename): write the series
+    """
+
+    def __init__(self, num_cpus, num_ios, window=100, start=0):
+        self.window = window
+        self.start = start
+        self.cpu_busy = [array("I") for _ in range(num_cpus)]
+        self.io_busy = [array("I") for _ in range(num_ios)]
+        self.ready_sum = array("Q")
+        self.ready_max = array("I")
+        self.wait_sum = array("Q")
+        self.wait_max = array("I")
+
+        # Current (unfinished) window
+        self._cpu_acc = [0] * num_cpus
+        self._io_acc = [0] * num_ios
+        self._ready_acc = 0
+        self._ready_peak = 0
+        self._wait_acc = 0
+        self._wait_peak = 0
+        self._ticks = 0
+        self.time = start  # next tick expected by sample()
+
+    def _flush(self):
+        """Close the current window"""
+        for series, acc in zip(self.cpu_busy, self._cpu_acc):
+            series.append(acc)
+        for series, acc in zip(self.io_busy, self._io_acc):
+            series.append(acc)
+        self.ready_sum.append(self._ready_acc)
+        self.ready_max.append(self._ready_peak)
+        self.wait_sum.append(self._wait_acc)
+        self.wait_max.append(self._wait_peak)
+        self._cpu_acc = [0] * len(self._cpu_acc)
+        self._io_acc = [0] * len(self._io_acc)
+        self._ready_acc = self._ready_peak = 0
+        self._wait_acc = self._wait_peak = 0
+        self._ticks = 0
+
+    def _idle(self, ticks):
+        """Account ticks where nothing was running or queued"""
+        while ticks:
+            take = min(ticks, self.window - self._ticks)
+            self._ticks += take
+            ticks -= take
+            if self._ticks == self.window:
+                self._flush()
+
+    def sample(self, clock, cpus, ios, ready_len, wait_len):
+        """
+        Record the state of one tick
+        Args:
+            clock: the tick being recorded (skipped ticks count as idle)
+            cpus, ios: process (or None) on each CPU / I/O device
+            ready_len, wait_len: ready and wait queue lengths
+        """
+        if clock > self.time:
+            self._idle(clock - self.time)
+        for i, p in enumerate(cpus):
+            if p is not None:
+                self._cpu_acc[i] += 1
+        for i, p in enumerate(ios):
+            if p is not None:
+                self._io_acc[i] += 1
+        self._ready_acc += ready_len
+        if ready_len > self._ready_peak:
+            self._ready_peak = ready_len
+        self._wait_acc += wait_len
+        if wait_len > self._wait_peak:
+            self._wait_peak = wait_len
+        self._ticks += 1
+        self.time = clock + 1
+        if self._ticks == self.window:
+            self._flush()
+
+    def windows(self):
+        """Per-window utilization fractions and queue depths (includes the open window)"""
+        result = []
+        for w in range(len(self.ready_sum)):
+            result.append(self._window_dict(
+                self.start + w * self.window, self.window,
+                [s[w] for s in self.cpu_busy], [s[w] for s in self.io_busy],
+                self.ready_sum[w], self.ready_max[w], self.wait_sum[w], self.wait_max[w],
+            ))
+        if self._ticks:
+            result.append(self._window_dict(
+                self.start + len(self.ready_sum) * self.window, self._ticks,
+                self._cpu_acc, self._io_acc,
+                self._ready_acc, self._ready_peak, self._wait_acc, self._wait_peak,
+            ))
+        return result
+
+    @staticmethod
+    def _window_dict(start, ticks, cpu, io, ready_sum, ready_max, wait_sum, wait_max):
+        return {
+            "start": start,
+            "ticks": ticks,
+            "cpu_util": [b / ticks for b in cpu],
+            "io_util": [b / ticks for b in io],
+            "ready_avg": ready_sum / ticks,
+            "ready_max": ready_max,
+            "wait_avg": wait_sum / ticks,
+            "wait_max": wait_max,
+        }
+
+    def saturated(self, threshold=0.95):
+        """Windows in which every CPU was busy at least threshold of the time"""
+        return [w for w in self.windows() if w["cpu_util"] and min(w["cpu_util"]) >= threshold]
+
+    def export_json(self, filename):
+        """Export the series to a JSON file"""
+        with open(filename, "w") as f:
+            json.dump({"window": self.window, "windows": self.windows()}, f, indent=2)
+
+    def export_csv(self, filename):
+        """Export the series to a CSV file, one row per window"""
+        rows = self.windows()
+        fieldnames = (["start", "ticks"]
+                      + [f"cpu{i}" for i in range(len(self.cpu_busy))]
+                      + [f"io{i}" for i in range(len(self.io_busy))]
+                      + ["ready_avg", "ready_max", "wait_avg", "wait_max"])
+        with open(filename, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in rows:
+                flat = {k: row[k] for k in ("start", "ticks", "ready_avg", "ready_max", "wait_avg", "wait_max")}
+                flat.update({f"cpu{i}": u for i, u in enumerate(row["cpu_util"])})
+                flat.update({f"io{i}": u for i, u in enumerate(row["io_util"])})
+                writer.writerow(flat)
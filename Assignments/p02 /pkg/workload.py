@@ -0,0 +1,346 @@
+# workload.py
+from abc import ABC, abstractmethod
+import hashlib
+import json
+import math
+import random
+
+from .process import Process
+
+ARRIVAL_PROCESSES = ("poisson", "diurnal", "bursty")
+
+# Arrival strategies of main.load_processes_from_json (see load_workload)
+ARRIVAL_STRATEGIES = ("staggered", "random", "burst", "original")
+
+
+class WorkloadSource(ABC):
+    """
+    Supplies processes to a scheduler as simulation time advances
+
+    Subclasses must implement peek() and pop() (a source missing either
+    cannot be created); feed() is what a driver calls each step. A source may be finite (ListSource) or open-ended (JobClassSource).
+    Methods:
+        peek(): arrival time of the next process, or None when exhausted
+        pop(): remove and return the next process
+        take_until(time): every process arriving at or before time
+        feed(scheduler): add the processes that are due to a scheduler
+    """
+
+    @abstractmethod
+    def peek(self):
+        """Arrival time of the next process, or None when exhausted"""
+
+    @abstractmethod
+    def pop(self):
+        """Remove and return the next process"""
+
+    def take_until(self, time):
+        """Every process arriving at or before time, in arrival order"""
+        due = []
+        while self.peek() is not None and self.peek() <= time:
+            due.append(self.pop())
+        return due
+
+    def feed(self, scheduler):
+        """
+        Add the processes due at the scheduler's current clock. When the
+        scheduler has nothing else to do the next future arrival is added
+        too (with everything arriving on the same tick), so it can
+        fast-forward to it instead of stopping.
+        Returns: number of processes added
+        """
+        added = 0
+        for process in self.take_until(scheduler.clock):
+            scheduler.add_process(process)
+            added += 1
+        if not scheduler.has_jobs() and self.peek() is not None:
+            for process in self.take_until(self.peek()):
+                scheduler.add_process(process)
+                added += 1
+        return added
+
+
+class ListSource(WorkloadSource):
+    """Finite source over a list of Process objects (e.g. loaded from a job json file)"""
+
+    def __init__(self, processes):
+        self.processes = sorted(processes, key=lambda p: p.arrival_time)
+        self.index = 0
+
+    def peek(self):
+        if self.index < len(self.processes):
+            return self.processes[self.index].arrival_time
+        return None
+
+    def pop(self):
+        process = self.processes[self.index]
+        self.processes[self.index] = None  # the scheduler owns it from here on
+        self.index += 1
+        return process
+
+
+class JobClassSource(WorkloadSource):
+    """
+    Open-ended source drawing processes from the job_classes.json distributions
+
+    Bursts are generated the same way as generate_jobs.generate_process, from
+    a private seeded generator so a source is reproducible. Classes are mixed
+    in proportion to their arrival_rate.
+
+    The overall arrival rate is either the sum of the class arrival_rates
+    (per tick), or, when offered_load is given, the rate that keeps
+    offered_load * num_cpus CPUs busy on average:
+        rate = offered_load * num_cpus / mean CPU demand per process
+
+    Arrival processes:
+        poisson: exponential inter-arrival times at a constant rate
+        diurnal: rate follows rate * (1 + amplitude * sin(2*pi*t / period)),
+                 sampled by thinning a Poisson process at the peak rate
+        bursty: on/off source; arrivals only during exponentially long "on"
+                periods (mean burst_on ticks), none during "off" periods
+                (mean burst_off ticks), at a rate that keeps the same mean
+    Attributes:
+        classes: job class dicts
+        rate: mean arrivals per tick
+        generated: number of processes produced so far
+        limit: stop after this many processes (None = never stop)
+    """
+
+    def __init__(self, classes, arrival="poisson", rate=None, offered_load=None, num_cpus=1,
+                 period=1000, amplitude=0.5, burst_on=50, burst_off=150, max_bursts=20,
+                 limit=None, seed=0):
+        if arrival not in ARRIVAL_PROCESSES:
+            raise ValueError(f"Unknown arrival process '{arrival}'. Must be one of: {', '.join(ARRIVAL_PROCESSES)}")
+        if not classes:
+            raise ValueError("Need at least one job class")
+        if not 0 <= amplitude <= 1:
+            raise ValueError("Diurnal amplitude must be between 0 and 1")
+        self.classes = classes
+        self.weights = [c["arrival_rate"] for c in classes]
+        self.arrival = arrival
+        self.period = period
+        self.amplitude = amplitude
+        self.burst_on = burst_on
+        self.burst_off = burst_off
+        self.max_bursts = max_bursts
+        self.limit = limit
+        self.rng = random.Random(seed)
+        self.generated = 0
+
+        if offered_load is not None:
+            rate = offered_load * num_cpus / self.mean_cpu_demand()
+        elif rate is None:
+            rate = sum(self.weights)
+        if rate <= 0:
+            raise ValueError("Arrival rate must be positive")
+        self.rate = rate
+
+        self._time = 0.0                    # continuous time of the last arrival
+        self._on_until = None               # end of the current "on" period (bursty)
+        self._next = None                   # next process, generated one ahead
+        self._advance()
+
+    @classmethod
+    def from_json(cls, filename, **kwargs):
+        """Load the job classes from a job_classes.json file"""
+        with open(filename) as f:
+            return cls(json.load(f), **kwargs)
+
+    def mean_cpu_demand(self):
+        """Mean CPU time per process over the class mix (the cpu budget mean)"""
+        total = sum(self.weights)
+        return sum(w * c.get("cpu_budget_mean", 50) for w, c in zip(self.weights, self.classes)) / total
+
+    def offered_load(self, num_cpus=1):
+        """Fraction of num_cpus the arrivals keep busy on average"""
+        return self.rate * self.mean_cpu_demand() / num_cpus
+
+    # ------------------------------------------------------
+    # Arrival processes
+    # ------------------------------------------------------
+    def _next_time(self):
+        """Continuous arrival time following self._time"""
+        rng = self.rng
+        if self.arrival == "poisson":
+            return self._time + rng.expovariate(self.rate)
+
+        if self.arrival == "diurnal":
+            peak = self.rate * (1 + self.amplitude)
+            t = self._time
+            while True:
+                t += rng.expovariate(peak)
+                current = self.rate * (1 + self.amplitude * math.sin(2 * math.pi * t / self.period))
+                if rng.random() * peak <= current:
+                    return t
+
+        # bursty: the "on" rate is scaled so the long-run mean stays self.rate
+        on_rate = self.rate * (self.burst_on + self.burst_off) / self.burst_on
+        t = self._time
+        if self._on_until is None:
+            self._on_until = t + rng.expovariate(1 / self.burst_on)
+        while True:
+            t += rng.expovariate(on_rate)
+            if t <= self._on_until:
+                return t
+            # The on period ended first: skip an off period, start a new on period
+            t = self._on_until + rng.expovariate(1 / self.burst_off)
+            self._on_until = t + rng.expovariate(1 / self.burst_on)
+
+    # ------------------------------------------------------
+    # Process generation (mirrors generate_jobs.generate_process)
+    # ------------------------------------------------------
+    def _make_process(self, arrival_time):
+        rng = self.rng
+        user_class = rng.choices(self.classes, weights=self.weights, k=1)[0]
+        io = user_class["io_profile"]
+        prio_low, prio_high = user_class["priority_range"]
+        priority = rng.randint(prio_low, prio_high)
+        cpu_budget = max(5, int(rng.gauss(user_class.get("cpu_budget_mean", 50),
+                                          user_class.get("cpu_budget_stddev", 10))))
+        bursts = []
+        cpu_used = 0
+        burst_count = 0
+        while cpu_used < cpu_budget and burst_count < self.max_bursts:
+            cpu_burst = max(1, int(rng.gauss(user_class["cpu_burst_mean"], user_class["cpu_burst_stddev"])))
+            cpu_burst = min(cpu_burst, cpu_budget - cpu_used)
+            bursts.append({"cpu": cpu_burst})
+            cpu_used += cpu_burst
+            burst_count += 1
+            if cpu_used < cpu_budget and burst_count < self.max_bursts:
+                if rng.random() < io["io_ratio"]:
+                    bursts.append({"io": {
+                        "type": rng.choice(io["io_types"]),
+                        "duration": max(1, int(rng.gauss(io["io_duration_mean"], io["io_duration_stddev"]))),
+                    }})
+                burst_count += 1
+        self.generated += 1
+        return Process(
+            pid=str(self.generated),
+            bursts=bursts,
+            priority=priority,
+            arrival_time=arrival_time,
+            quantum=user_class.get("quantum", 4),
+        )
+
+    def _advance(self):
+        if self.limit is not None and self.generated >= self.limit:
+            self._next = None
+            return
+        self._time = self._next_time()
+        self._next = self._make_process(math.ceil(self._time))
+
+    def peek(self):
+        return self._next.arrival_time if self._next is not None else None
+
+    def pop(self):
+        process = self._next
+        self._advance()
+        return process
+
+
+def run_source(scheduler, source, until=None):
+    """
+    Drive a scheduler from a WorkloadSource
+    Args:
+        scheduler: a scheduler with an integer clock and a not-arrived queue
+        source: WorkloadSource (bound it with its own limit, or use until)
+        until: stop once the clock reaches this time (None = run until the source is exhausted)
+    Returns: number of processes fed to the scheduler
+    """
+    fed = 0
+    while until is None or scheduler.clock < until:
+        fed += source.feed(scheduler)
+        if not scheduler.has_jobs():
+            break
+        scheduler.step()
+    return fed
+
+
+# Workload specs: plain, picklable lists of process dicts (what sweeps ship to
+# pool workers and hash for memoization)
+
+def workload_from_processes(processes):
+    """
+    Turn a list of Process objects into a plain, picklable workload spec.
+    The spec is what gets shipped to worker processes and hashed for memoization.
+    """
+    workload = []
+    for p in processes:
+        bursts = []
+        for b in p.bursts:
+            if "cpu" in b:
+                bursts.append({"cpu": b["cpu"]})
+            elif "io" in b:
+                bursts.append({"io": {"type": b["io"]["type"], "duration": b["io"]["duration"]}})
+        workload.append({
+            "pid": p.pid,
+            "priority": p.priority,
+            "arrival_time": p.arrival_time,
+            "bursts": bursts,
+        })
+    return workload
+
+
+def load_workload(filename, limit=None, arrival_strategy="staggered", seed=0):
+    """
+    Load a job json file as a workload spec.
+    Arrival times are drawn from a seeded generator so the workload (and its
+    memoization key) is the same every time for a given seed.
+    Raises ValueError for an arrival strategy not in ARRIVAL_STRATEGIES.
+    """
+    if arrival_strategy not in ARRIVAL_STRATEGIES:
+        raise ValueError(f"Unknown arrival strategy '{arrival_strategy}'. "
+                         f"Must be one of: {', '.join(ARRIVAL_STRATEGIES)}")
+    with open(filename) as f:
+        data = json.load(f)
+    rng = random.Random(seed)
+    current_time = 0
+    workload = []
+    # Same strategies as main.load_processes_from_json, drawn from rng
+    for idx, p in enumerate(data[:limit]):
+        if arrival_strategy == "original":
+            arrival_time = p.get("arrival_time", 0)
+        elif arrival_strategy == "random":
+            arrival_time = rng.randint(0, 50)
+        elif arrival_strategy == "burst":
+            if idx % 5 == 0:
+                current_time += rng.randint(10, 20)
+            arrival_time = current_time + rng.randint(0, 2)
+        else:
+            arrival_time = current_time
+            current_time += rng.randint(2, 5)
+        workload.append({
+            "pid": p["pid"],
+            "priority": p["priority"],
+            "arrival_time": arrival_time,
+            "bursts": p["bursts"],
+        })
+    workload.sort(key=lambda spec: spec["arrival_time"])
+    return workload
+
+
+def workload_key(workload):
+    """Stable hash of a workload spec used as the memoization key"""
+    blob = json.dumps(workload, sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()
+
+
+def build_processes(workload):
+    """Create fresh Process objects for one run from a spec or a SharedWorkload"""
+    if hasattr(workload, "build_processes"):
+        return workload.build_processes()
+    processes = []
+    for spec in workload:
+        bursts = []
+        for b in spec["bursts"]:
+            if "cpu" in b:
+                bursts.append({"cpu": b["cpu"]})
+            else:
+                bursts.append({"io": dict(b["io"])})
+        processes.append(Process(
+            pid=spec["pid"],
+            bursts=bursts,
+            priority=spec["priority"],
+            arrival_time=spec["arrival_time"],
+        ))
+    return processes
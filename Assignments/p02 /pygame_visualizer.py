@@ -3,6 +3,8 @@ import pygame
 import sys
 from collections import defaultdict
 
+from pkg.snapshot import SnapshotCache
+
 # Color scheme
 COLORS = {
     'background': (20, 20, 30),
@@ -21,9 +23,17 @@ COLORS = {
 }
 
 class PygameVisualizer:
-    def __init__(self, scheduler, width=1400, height=900, fps=2):
+    def __init__(self, scheduler, width=1400, height=900, fps=2, frames=None, name=None):
+        """
+        Draws from a live scheduler it steps itself, or, with frames (a
+        pkg.framering.FrameRing) and scheduler=None, from the frames another
+        process publishes; then it only ever draws the newest frame.
+        """
         pygame.init()
         self.scheduler = scheduler
+        self.frames = frames
+        self.snapshots = frames if frames is not None else SnapshotCache(scheduler)
+        self.name = name or scheduler.__class__.__name__
         self.width = width
         self.height = height
         self.fps = fps
@@ -101,16 +111,15 @@ class PygameVisualizer:
         box_height = 50
         margin = 10
         
-        for i, process in enumerate(self.scheduler.cpu_queue):
+        snapshot = self.snapshots.get()
+        for i, (pid, remaining) in enumerate(zip(snapshot['cpu'], snapshot['cpu_remaining'])):
             px = x + 80 + i * (box_width + margin)
             py = cpu_y
             
-            if process is not None:
-                self.draw_process_box(process.pid, px, py, box_width, box_height, 'running')
+            if pid is not None:
+                self.draw_process_box(pid, px, py, box_width, box_height, 'running')
                 # Show remaining burst time
-                burst = process.current_burst()
-                if burst and 'cpu' in burst:
-                    remaining = burst['cpu'] - process.time_in_burst
+                if remaining is not None:
                     self.draw_text(f"T:{remaining}", px + 5, py + box_height + 2, 
                                  color=COLORS['text'], font=self.font_small)
             else:
@@ -121,16 +130,14 @@ class PygameVisualizer:
         io_label_y = y + 110
         self.draw_text("I/O Devices:", x + 10, io_label_y, font=self.font_small)
         
-        for i, process in enumerate(self.scheduler.io_queue):
+        for i, (pid, remaining) in enumerate(zip(snapshot['io'], snapshot['io_remaining'])):
             px = x + 80 + i * (box_width + margin)
             py = io_y
             
-            if process is not None:
-                self.draw_process_box(process.pid, px, py, box_width, box_height, 'io_waiting')
+            if pid is not None:
+                self.draw_process_box(pid, px, py, box_width, box_height, 'io_waiting')
                 # Show remaining burst time
-                burst = process.current_burst()
-                if burst and 'io' in burst:
-                    remaining = burst['io']['duration'] - process.time_in_burst
+                if remaining is not None:
                     self.draw_text(f"T:{remaining}", px + 5, py + box_height + 2,
                                  color=COLORS['text'], font=self.font_small)
             else:
@@ -190,19 +197,19 @@ class PygameVisualizer:
         """Draw simulation statistics"""
         self.draw_panel(x, y, width, height, "Statistics")
         
-        snapshot = self.scheduler.snapshot()
+        snapshot = self.snapshots.get()
         
         stats_y = y + 30
         line_height = 25
         
         stats = [
             f"Clock: {snapshot['clock']}",
-            f"Not Arrived: {len(snapshot.get('not_arrived', []))}",
-            f"Ready Queue: {len(snapshot['ready'])}",
-            f"Wait Queue: {len(snapshot['wait'])}",
+            f"Not Arrived: {snapshot['counts']['not_arrived']}",
+            f"Ready Queue: {snapshot['counts']['ready']}",
+            f"Wait Queue: {snapshot['counts']['wait']}",
             f"Running: {sum(1 for p in snapshot['cpu'] if p is not None)}",
             f"I/O Active: {sum(1 for p in snapshot['io'] if p is not None)}",
-            f"Finished: {len(snapshot['finished'])}",
+            f"Finished: {snapshot['finished_count']}",
         ]
         
         for i, stat in enumerate(stats):
@@ -249,7 +256,11 @@ class PygameVisualizer:
         self.screen.fill(COLORS['background'])
         
         # Get current snapshot
-        snapshot = self.scheduler.snapshot()
+        snapshot = self.snapshots.get()
+        if snapshot is None:
+            # No frame from the simulator process yet
+            pygame.display.flip()
+            return
         
         # Layout dimensions
         queue_width = 350
@@ -294,7 +305,7 @@ class PygameVisualizer:
         self.draw_timeline(margin, timeline_y, self.width - 2 * margin, timeline_height)
         
         # Draw title
-        title = f"Process Scheduler Simulation - {self.scheduler.__class__.__name__}"
+        title = f"Process Scheduler Simulation - {self.name}"
         if self.paused:
             title += " [PAUSED]"
         self.draw_text(title, self.width // 2 - 200, 5, font=self.font_large)
@@ -318,22 +329,33 @@ class PygameVisualizer:
                 elif event.key == pygame.K_DOWN:
                     self.fps = max(1, self.fps - 1)
     
+    def has_jobs(self):
+        if self.frames is None:
+            return self.scheduler.has_jobs()
+        # The simulator process is done once it says so and its last frame was drawn
+        frame = self.frames.get()
+        return not (self.frames.done and frame is not None and frame['version'] == self.frames.published)
+    
     def run_simulation(self):
         """Run the visualization simulation"""
-        while self.running and self.scheduler.has_jobs():
+        while self.running and self.has_jobs():
             self.handle_events()
             
             if not self.paused or self.step_mode:
                 # Store snapshot for timeline
-                snapshot = self.scheduler.snapshot()
-                self.timeline_history.append(snapshot)
+                snapshot = self.snapshots.get()
+                if snapshot is not None and (not self.timeline_history
+                                             or self.timeline_history[-1] is not snapshot):
+                    self.timeline_history.append(snapshot)
                 
                 # Keep timeline history limited
                 if len(self.timeline_history) > self.max_timeline_length:
                     self.timeline_history.pop(0)
                 
-                # Step the scheduler
-                self.scheduler.step()
+                # Step the scheduler (a simulator process steps on its own;
+                # pausing then only freezes the display)
+                if self.frames is None:
+                    self.scheduler.step()
                 self.step_mode = False
             
             self.draw_frame()
@@ -341,7 +363,7 @@ class PygameVisualizer:
         
         # Show final state
         if self.running:
-            final_snapshot = self.scheduler.snapshot()
+            final_snapshot = self.snapshots.get()
             self.timeline_history.append(final_snapshot)
             
             # Wait for user to close
@@ -380,6 +402,22 @@ def run_pygame_visualization(scheduler, fps=2):
     visualizer.run_simulation()
 
 
+def run_ring_visualization(frames, name, fps=2):
+    """
+    Run pygame visualization of a simulation running in another process
+    
+    Args:
+        frames: pkg.framering.FrameRing the simulator publishes into
+        name: scheduler name for the title
+        fps: Frames per second (drawing speed only; the simulator is not slowed down)
+    Returns:
+        True if the window was closed before the simulation finished
+    """
+    visualizer = PygameVisualizer(None, fps=fps, frames=frames, name=name)
+    visualizer.run_simulation()
+    return not frames.done
+
+
 # Example usage
 if __name__ == "__main__":
     from pkg.scheduler import Scheduler, Job
@@ -0,0 +1,249 @@
+# quantum_search.py
+"""
+Automated time-quantum search for the quantum based schedulers.
+
+RRScheduler(quantum=...) and AdaptiveScheduler(base_quantum=...) both take a
+hand picked quantum. This module runs the simulation for a range of quanta,
+first on a coarse grid and then with a golden-section refinement around the
+best grid point, and returns the quantum that minimizes the chosen metric.
+
+Simulations are independent, so they are spread over a process pool.
+Every evaluated (workload, scheduler, quantum, metric) combination is
+memoized, so re-tuning the same job mix is free.
+
+Usage:
+    python quantum_search.py file_num=3 scheduler=rr metric=mean_response cpus=2 ios=2 workers=4
+
+per_cpu=1 (rr only) searches with one run queue per CPU (balance=N ticks between rebalances).
+"""
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from pkg.metrics import METRICS, compute_metrics
+from pkg.registry import SCHEDULERS, per_cpu_options
+from pkg.shared_workload import SharedWorkload
+from pkg.workload import build_processes, load_workload, workload_key
+
+# scheduler name -> name of the quantum keyword argument (classes come from the registry)
+QUANTUM_SCHEDULERS = {
+    "rr": "quantum",
+    "adaptive": "base_quantum",
+}
+
+GOLDEN_RATIO = (1 + math.sqrt(5)) / 2
+
+# (workload key, scheduler, cpus, ios, quantum, options) -> metrics dict
+# (options is a sorted tuple of the extra constructor arguments)
+_cache = {}
+
+
+# ----------------------------------------------------------
+# Simulation
+# ----------------------------------------------------------
+def simulate(workload, scheduler="rr", quantum=4, num_cpus=1, num_ios=1, options=None):
+    """Run one full simulation and return its metrics dict"""
+    SchedulerClass, quantum_arg = SCHEDULERS[scheduler], QUANTUM_SCHEDULERS[scheduler]
+    sched = SchedulerClass(num_cpus=num_cpus, num_ios=num_ios, verbose=False,
+                           **(options or {}), **{quantum_arg: quantum})
+    for p in build_processes(workload):
+        sched.add_process(p)
+    sched.run()
+    return compute_metrics(sched.finished)
+
+
+def _simulate_job(args):
+    """Top level wrapper so the pool can pickle it"""
+    return simulate(*args)
+
+
+class QuantumSearch:
+    """
+    Search for the best quantum of one scheduler on one workload
+    Attributes:
+        workload: workload spec (see pkg.workload.load_workload)
+        scheduler: "rr" or "adaptive"
+        metric: metric to minimize (one of METRICS)
+        workers: size of the process pool (1 = run in this process)
+        options: extra scheduler constructor arguments (e.g. per_cpu_options("rr"))
+        evaluations: quantum -> metrics dict for every quantum simulated
+    Methods:
+        evaluate(quanta): simulate all quanta not already known, in parallel
+        search(low, high, grid_points, tolerance): grid + golden-section search
+    """
+
+    def __init__(self, workload, scheduler="rr", metric="mean_response",
+                 num_cpus=1, num_ios=1, workers=1, options=None):
+        if scheduler not in QUANTUM_SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{scheduler}'. Must be one of: {', '.join(QUANTUM_SCHEDULERS)}")
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Must be one of: {', '.join(METRICS)}")
+        self.workload = workload
+        self.key = workload_key(workload)
+        self.scheduler = scheduler
+        self.metric = metric
+        self.num_cpus = num_cpus
+        self.num_ios = num_ios
+        self.workers = workers
+        self.options = dict(options or {})
+        self.evaluations = {}
+        self._pool = None
+        self._shared = None  # SharedWorkload the pool workers read while searching
+
+    def _cache_key(self, quantum):
+        return (self.key, self.scheduler, self.num_cpus, self.num_ios, quantum,
+                tuple(sorted(self.options.items())))
+
+    def evaluate(self, quanta):
+        """Simulate every quantum in quanta that is not memoized yet"""
+        todo = []
+        for q in quanta:
+            ck = self._cache_key(q)
+            if ck in _cache:
+                self.evaluations[q] = _cache[ck]
+            elif q not in todo:
+                todo.append(q)
+
+        workload = self._shared if self._shared is not None else self.workload
+        jobs = [(workload, self.scheduler, q, self.num_cpus, self.num_ios, self.options) for q in todo]
+        if self._pool is not None and len(jobs) > 1:
+            results = list(self._pool.map(_simulate_job, jobs))
+        else:
+            results = [_simulate_job(job) for job in jobs]
+
+        for q, metrics in zip(todo, results):
+            _cache[self._cache_key(q)] = metrics
+            self.evaluations[q] = metrics
+        return {q: self.evaluations[q][self.metric] for q in quanta}
+
+    def _score(self, quantum):
+        return self.evaluate([quantum])[quantum]
+
+    def search(self, low=1, high=32, grid_points=8, tolerance=1):
+        """
+        Find the quantum in [low, high] that minimizes the metric
+        Args:
+            low, high: inclusive integer quantum range
+            grid_points: number of coarse grid points
+            tolerance: stop refining once the bracket is this narrow
+        Returns: (best quantum, best metric value)
+        """
+        if self.workers > 1:
+            # Jobs carry the shared table's name instead of a pickled copy of the workload
+            self._shared = SharedWorkload.create(self.workload)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            # Coarse grid over the whole range
+            step = max(1, (high - low) // max(1, grid_points - 1))
+            grid = sorted(set(list(range(low, high + 1, step)) + [high]))
+            scores = self.evaluate(grid)
+            best = min(grid, key=lambda q: (scores[q], q))
+
+            # Bracket the best grid point with its neighbours
+            idx = grid.index(best)
+            a = grid[max(0, idx - 1)]
+            b = grid[min(len(grid) - 1, idx + 1)]
+
+            # Golden-section refinement on the integers
+            c = b - round((b - a) / GOLDEN_RATIO)
+            d = a + round((b - a) / GOLDEN_RATIO)
+            self.evaluate([c, d])
+            while b - a > max(2, tolerance):
+                if self._score(c) <= self._score(d):
+                    b = d
+                else:
+                    a = c
+                c = b - round((b - a) / GOLDEN_RATIO)
+                d = a + round((b - a) / GOLDEN_RATIO)
+                self.evaluate([c, d])
+
+            # Finish the small bracket exhaustively
+            scores = self.evaluate(range(a, b + 1))
+            for q in self.evaluations:
+                scores.setdefault(q, self.evaluations[q][self.metric])
+            best = min(scores, key=lambda q: (scores[q], q))
+            return best, scores[best]
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            if self._shared is not None:
+                self._shared.close()
+                self._shared = None
+
+
+def find_best_quantum(workload, scheduler="rr", metric="mean_response", num_cpus=1,
+                      num_ios=1, low=1, high=32, grid_points=8, workers=1, options=None):
+    """Convenience wrapper around QuantumSearch.search()"""
+    searcher = QuantumSearch(workload, scheduler=scheduler, metric=metric,
+                             num_cpus=num_cpus, num_ios=num_ios, workers=workers, options=options)
+    return searcher.search(low=low, high=high, grid_points=grid_points)
+
+
+def save_cache(filename):
+    """Write the memoized evaluations to a JSON file"""
+    rows = [{"workload": k[0], "scheduler": k[1], "cpus": k[2], "ios": k[3], "quantum": k[4],
+             "options": dict(k[5]), "metrics": v}
+            for k, v in _cache.items()]
+    with open(filename, "w") as f:
+        json.dump(rows, f, indent=2)
+
+
+def load_cache(filename):
+    """Load memoized evaluations written by save_cache()"""
+    with open(filename) as f:
+        rows = json.load(f)
+    for row in rows:
+        key = (row["workload"], row["scheduler"], row["cpus"], row["ios"], row["quantum"],
+               tuple(sorted(row.get("options", {}).items())))
+        _cache[key] = row["metrics"]
+
+
+if __name__ == "__main__":
+    args = {}
+    for arg in sys.argv[1:]:
+        if "=" in arg:
+            k, v = arg.split("=", 1)
+            args[k] = v
+
+    file_num = args.get("file_num", "1").zfill(4)
+    limit = int(args["limit"]) if "limit" in args else None
+    scheduler = args.get("scheduler", "rr").lower()
+    metric = args.get("metric", "mean_response")
+    cpus = int(args.get("cpus", 1))
+    ios = int(args.get("ios", 1))
+    workers = int(args.get("workers", 1))
+    low = int(args.get("low", 1))
+    high = int(args.get("high", 32))
+    seed = int(args.get("seed", 0))
+    cache_file = args.get("cache")
+    options = None
+    if args.get("per_cpu", "0") != "0":
+        try:
+            options = per_cpu_options(scheduler, int(args["balance"]) if "balance" in args else None)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    workload = load_workload(f"./job_jsons/processfile_{file_num}.json", limit=limit,
+                             arrival_strategy=args.get("arrival", "staggered"), seed=seed)
+    if cache_file:
+        try:
+            load_cache(cache_file)
+        except FileNotFoundError:
+            pass
+
+    searcher = QuantumSearch(workload, scheduler=scheduler, metric=metric,
+                             num_cpus=cpus, num_ios=ios, workers=workers, options=options)
+    best, value = searcher.search(low=low, high=high)
+
+    print(f"{'Quantum':<8} {metric:<16}")
+    print("-" * 26)
+    for q in sorted(searcher.evaluations):
+        print(f"{q:<8} {searcher.evaluations[q][metric]:<16.2f}")
+    print("-" * 26)
+    print(f"Best quantum for {scheduler}: {best} ({metric} = {value:.2f})")
+
+    if cache_file:
+        save_cache(cache_file)
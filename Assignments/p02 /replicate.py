@@ -0,0 +1,264 @@
+# replicate.py
+"""
+Monte Carlo replication of one scheduler configuration.
+
+The staggered, random and burst arrival strategies draw arrival times at
+random, so a single run is one noisy sample. This module re-runs the same
+configuration with independent seeds, reports the mean of every metric with
+a Student-t confidence interval, and stops launching replicas as soon as
+every interval is within the requested relative precision (or max_replicas
+is reached).
+
+Replicas run in batches on a process pool. Seeds are base_seed, base_seed+1,
+... and results are folded in seed order, so a run is reproducible for a
+given base seed no matter how many workers are used.
+
+Usage:
+    python replicate.py file_num=3 scheduler=rr arrival=random cpus=2 ios=2 precision=0.05 workers=4
+
+per_cpu=1 (fcfs, rr) replicates with one run queue per CPU (balance=N ticks between rebalances).
+"""
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from pkg.registry import SCHEDULERS, per_cpu_options  # name -> class, imported on first use
+from pkg.metrics import METRICS, compute_metrics
+from pkg.sketch import LatencyStats
+from pkg.workload import build_processes, load_workload
+
+# Two-sided Student-t critical values for df = 1..30; larger df use the normal value
+_T_TABLE = {
+    0.90: [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+           1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+           1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697],
+    0.95: [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+           2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+           2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042],
+    0.99: [63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+           3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+           2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750],
+}
+_Z = {0.90: 1.645, 0.95: 1.960, 0.99: 2.576}
+
+
+def t_critical(df, confidence=0.95):
+    """Two-sided Student-t critical value for df degrees of freedom"""
+    if confidence not in _T_TABLE:
+        raise ValueError(f"Unsupported confidence {confidence}. Must be one of: {', '.join(map(str, _T_TABLE))}")
+    if df < 1:
+        return math.inf
+    table = _T_TABLE[confidence]
+    return table[df - 1] if df <= len(table) else _Z[confidence]
+
+
+class RunningStat:
+    """
+    Running mean and variance of one metric (Welford's algorithm)
+    Methods:
+        add(x): add one replica's value
+        interval(confidence): (mean, half width) of the confidence interval
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+
+    def variance(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else math.inf
+
+    def interval(self, confidence=0.95):
+        """Mean and half width of the confidence interval for the mean"""
+        if self.n < 2:
+            return self.mean, math.inf
+        return self.mean, t_critical(self.n - 1, confidence) * math.sqrt(self.variance() / self.n)
+
+    def relative_precision(self, confidence=0.95):
+        """Half width relative to the mean (0 when every replica agreed)"""
+        mean, half = self.interval(confidence)
+        if half == 0:
+            return 0.0
+        return half / abs(mean) if mean else math.inf
+
+
+# ----------------------------------------------------------
+# One replica
+# ----------------------------------------------------------
+def run_replica(filename, scheduler, seed, limit=None, arrival_strategy="staggered",
+                num_cpus=1, num_ios=1, options=None):
+    """
+    Run one seeded simulation
+    Returns: (metrics dict, LatencyStats of the finished processes)
+    """
+    workload = load_workload(filename, limit=limit, arrival_strategy=arrival_strategy, seed=seed)
+    sched = SCHEDULERS[scheduler](num_cpus=num_cpus, num_ios=num_ios, verbose=False, **(options or {}))
+    for p in build_processes(workload):
+        sched.add_process(p)
+    sched.run()
+    return compute_metrics(sched.finished), sched.latency
+
+
+def _replica_job(args):
+    """Top level wrapper so the pool can pickle it"""
+    return run_replica(*args)
+
+
+class ReplicationRunner:
+    """
+    Replicate one configuration until its confidence intervals are tight enough
+    Attributes:
+        filename: job json file
+        scheduler: key of SCHEDULERS
+        metrics: metrics the stopping rule looks at (all of them are reported)
+        precision: target half width / mean for every metric in `metrics`
+        confidence: 0.90, 0.95 or 0.99
+        min_replicas, max_replicas: bounds on the number of replicas
+        workers: size of the process pool (1 = run in this process)
+        stats: metric -> RunningStat
+        latency: LatencyStats merged over every replica
+        replicas: number of replicas folded in so far
+    Methods:
+        run(): replicate until converged, returns summary()
+        converged(): True once every stopping metric meets the precision
+        summary(): metric -> mean, half width, ci bounds, relative precision
+    """
+
+    def __init__(self, filename, scheduler="rr", limit=None, arrival_strategy="staggered",
+                 num_cpus=1, num_ios=1, options=None, metrics=METRICS, precision=0.05,
+                 confidence=0.95, min_replicas=5, max_replicas=200, workers=1, base_seed=0):
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{scheduler}'. Must be one of: {', '.join(SCHEDULERS)}")
+        for metric in metrics:
+            if metric not in METRICS:
+                raise ValueError(f"Unknown metric '{metric}'. Must be one of: {', '.join(METRICS)}")
+        t_critical(1, confidence)  # validates the confidence level
+        if min_replicas < 2:
+            raise ValueError("Need at least 2 replicas for a confidence interval")
+        self.filename = filename
+        self.scheduler = scheduler
+        self.limit = limit
+        self.arrival_strategy = arrival_strategy
+        self.num_cpus = num_cpus
+        self.num_ios = num_ios
+        self.options = options or {}
+        self.metrics = tuple(metrics)
+        self.precision = precision
+        self.confidence = confidence
+        self.min_replicas = min_replicas
+        self.max_replicas = max(min_replicas, max_replicas)
+        self.workers = workers
+        self.base_seed = base_seed
+        self.stats = {metric: RunningStat() for metric in METRICS}
+        self.latency = LatencyStats()
+        self.replicas = 0
+
+    def _job(self, seed):
+        return (self.filename, self.scheduler, seed, self.limit, self.arrival_strategy,
+                self.num_cpus, self.num_ios, self.options)
+
+    def _add(self, metrics, latency):
+        for metric in METRICS:
+            self.stats[metric].add(metrics[metric])
+        self.latency.merge(latency)
+        self.replicas += 1
+
+    def converged(self):
+        if self.replicas < self.min_replicas:
+            return False
+        return all(self.stats[m].relative_precision(self.confidence) <= self.precision for m in self.metrics)
+
+    def run(self):
+        """Launch batches of replicas until converged() or max_replicas"""
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            while self.replicas < self.max_replicas and not self.converged():
+                # The first batch covers min_replicas; later ones keep every worker busy
+                size = max(self.min_replicas - self.replicas, self.workers)
+                size = min(size, self.max_replicas - self.replicas)
+                seeds = range(self.base_seed + self.replicas, self.base_seed + self.replicas + size)
+                jobs = [self._job(seed) for seed in seeds]
+                if pool is not None and len(jobs) > 1:
+                    results = list(pool.map(_replica_job, jobs))
+                else:
+                    results = [_replica_job(job) for job in jobs]
+                for metrics, latency in results:
+                    self._add(metrics, latency)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return self.summary()
+
+    def summary(self):
+        """Mean, confidence interval and relative precision of every metric"""
+        result = {}
+        for metric in METRICS:
+            mean, half = self.stats[metric].interval(self.confidence)
+            result[metric] = {
+                "mean": mean,
+                "half_width": half,
+                "low": mean - half,
+                "high": mean + half,
+                "relative": self.stats[metric].relative_precision(self.confidence),
+            }
+        return result
+
+
+def replicate(filename, scheduler="rr", precision=0.05, workers=1, **kwargs):
+    """Convenience wrapper around ReplicationRunner.run()"""
+    return ReplicationRunner(filename, scheduler=scheduler, precision=precision,
+                             workers=workers, **kwargs).run()
+
+
+if __name__ == "__main__":
+    args = {}
+    for arg in sys.argv[1:]:
+        if "=" in arg:
+            k, v = arg.split("=", 1)
+            args[k] = v
+
+    file_num = args.get("file_num", "1").zfill(4)
+    limit = int(args["limit"]) if "limit" in args else None
+    scheduler = args.get("scheduler", "rr").lower()
+    metrics = args["metrics"].split(",") if "metrics" in args else METRICS
+    options = None
+    if args.get("per_cpu", "0") != "0":
+        try:
+            options = per_cpu_options(scheduler, int(args["balance"]) if "balance" in args else None)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    runner = ReplicationRunner(
+        f"./job_jsons/processfile_{file_num}.json",
+        scheduler=scheduler,
+        limit=limit,
+        arrival_strategy=args.get("arrival", "staggered"),
+        num_cpus=int(args.get("cpus", 1)),
+        num_ios=int(args.get("ios", 1)),
+        options=options,
+        metrics=metrics,
+        precision=float(args.get("precision", 0.05)),
+        confidence=float(args.get("confidence", 0.95)),
+        min_replicas=int(args.get("min", 5)),
+        max_replicas=int(args.get("max", 200)),
+        workers=int(args.get("workers", 1)),
+        base_seed=int(args.get("seed", 0)),
+    )
+    summary = runner.run()
+
+    status = "converged" if runner.converged() else "stopped at max replicas"
+    print(f"{scheduler}: {runner.replicas} replicas ({status}), {int(runner.confidence * 100)}% CI")
+    print(f"{'Metric':<18} {'Mean':>10} {'± Half':>10} {'Low':>10} {'High':>10} {'Rel':>8}")
+    print("-" * 70)
+    for metric, s in summary.items():
+        print(f"{metric:<18} {s['mean']:>10.2f} {s['half_width']:>10.2f} {s['low']:>10.2f} "
+              f"{s['high']:>10.2f} {s['relative']:>8.2%}")
+    print()
+    runner.latency.print_summary()
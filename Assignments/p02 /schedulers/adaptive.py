@@ -3,6 +3,11 @@
 # schedulers/adaptive.py
 
 from pkg import Scheduler
+from pkg.sketch import LatencyStats
+from pkg.archive import FinishedArchive
+from pkg.utilization import UtilizationSeries
+from pkg.simlog import DEBUG
+from pkg.events import STATE, DISPATCH, PREEMPT, FINISH
 from collections import deque
 import json
 import csv
@@ -16,11 +21,13 @@ class AdaptiveScheduler(Scheduler):
     - Adjusts quantum based on load
     """
     
-    def __init__(self, num_cpus=1, num_ios=1, base_quantum=4, verbose=False):
+    def __init__(self, num_cpus=1, num_ios=1, base_quantum=4, verbose=False, device_spec=None,
+                 load_window=10, burst_alpha=0.5, util_window=100):
         self.num_cpus = num_cpus
         self.num_ios = num_ios
         self.base_quantum = base_quantum
         self.verbose = verbose
+        self.burst_alpha = burst_alpha  # Weight of the latest burst in the burst estimates
         
         # Queues
         self.not_arrived = []
@@ -28,14 +35,18 @@ class AdaptiveScheduler(Scheduler):
         self.wait_queue = deque()
         self.cpu_queue = [None] * num_cpus
         self.io_queue = [None] * num_ios
-        self.finished = []
+        self._init_io_pools(device_spec)
+        self.finished = FinishedArchive()
+        self.latency = LatencyStats()    # Streaming wait/turnaround/response percentiles
+        self.utilization = UtilizationSeries(num_cpus, self.num_ios, window=util_window)
         
         # Track quantum for each CPU
         self.quantum_remaining = {}
         
         # Adaptive parameters
         self.current_quantum = base_quantum
-        self.load_history = []
+        self.load_history = deque(maxlen=load_window)  # Rolling window of recent loads
+        self.load_sum = 0                              # Running sum of load_history
         
         self.clock = 0
     
@@ -49,20 +60,23 @@ class AdaptiveScheduler(Scheduler):
         while self.not_arrived and self.not_arrived[0].arrival_time <= self.clock:
             process = self.not_arrived.pop(0)
             process.state = "ready"
+            if self.bus is not None:
+                self.bus.emit(STATE, self.clock, process)
             self.ready_queue.append(process)
             if self.verbose:
-                print(f"[Clock {self.clock}] Process {process.pid} arrived")
+                self._say(f"[Clock {self.clock}] Process {process.pid} arrived")
     
     def _adapt_quantum(self):
         """Adjust quantum based on system load"""
         load = len(self.ready_queue) + len([p for p in self.cpu_queue if p is not None])
-        self.load_history.append(load)
         
-        # Keep last 10 measurements
-        if len(self.load_history) > 10:
-            self.load_history.pop(0)
+        # Keep the last load_window measurements; the deque drops the oldest
+        if len(self.load_history) == self.load_history.maxlen:
+            self.load_sum -= self.load_history[0]
+        self.load_history.append(load)
+        self.load_sum += load
         
-        avg_load = sum(self.load_history) / len(self.load_history)
+        avg_load = self.load_sum / len(self.load_history)
         
         # Adjust quantum: lower quantum for high load, higher for low load
         if avg_load > 5:
@@ -72,13 +86,39 @@ class AdaptiveScheduler(Scheduler):
         else:
             self.current_quantum = self.base_quantum
     
+    def _record_burst(self, process, burst):
+        """
+        Fold a completed burst into the process's running totals and
+        exponentially weighted burst estimates (O(1) per burst)
+        """
+        if not hasattr(process, 'cpu_total'):
+            process.cpu_total = 0
+            process.io_total = 0
+            process.cpu_estimate = None
+            process.io_estimate = None
+        alpha = self.burst_alpha
+        if 'cpu' in burst:
+            length = burst['cpu']
+            process.cpu_total += length
+            if process.cpu_estimate is None:
+                process.cpu_estimate = length
+            else:
+                process.cpu_estimate = alpha * length + (1 - alpha) * process.cpu_estimate
+        elif 'io' in burst:
+            length = burst['io']['duration']
+            process.io_total += length
+            if process.io_estimate is None:
+                process.io_estimate = length
+            else:
+                process.io_estimate = alpha * length + (1 - alpha) * process.io_estimate
+    
     def _classify_process(self, process):
         """Classify process as CPU-bound or I/O-bound"""
-        if not hasattr(process, 'burst_history'):
+        if not hasattr(process, 'cpu_total'):
             return 'unknown'
         
-        cpu_time = sum(t for t, type in process.burst_history if type == 'cpu')
-        io_time = sum(t for t, type in process.burst_history if type == 'io')
+        cpu_time = process.cpu_total
+        io_time = process.io_total
         
         if cpu_time > io_time * 2:
             return 'cpu_bound'
@@ -92,7 +132,8 @@ class AdaptiveScheduler(Scheduler):
         # Then use burst time for CPU-bound processes
         def priority_key(p):
             classification = self._classify_process(p)
-            burst_time = p.get_current_burst_time() if hasattr(p, 'get_current_burst_time') else 0
+            # Predicted next CPU burst, so batch work is ordered shortest first
+            burst_time = getattr(p, 'cpu_estimate', None) or 0
             
             if classification == 'io_bound':
                 return (0, burst_time)  # Highest priority
@@ -103,14 +144,26 @@ class AdaptiveScheduler(Scheduler):
         
         self.ready_queue.sort(key=priority_key)
     
+    def _idle_skipped(self, next_arrival):
+        """Idle ticks would have measured a load of 0"""
+        for _ in range(min(next_arrival - self.clock, self.load_history.maxlen)):
+            if len(self.load_history) == self.load_history.maxlen:
+                self.load_sum -= self.load_history[0]
+            self.load_history.append(0)
+
     def step(self):
         """Execute one time step of the simulation"""
+        self._skip_idle()
         self._check_arrivals()
         self._adapt_quantum()
         self._process_cpus()
         self._process_io_devices()
         self._dispatch_to_cpus()
         self._dispatch_to_io_devices()
+        self.utilization.sample(self.clock, self.cpu_queue, self.io_queue,
+                                len(self.ready_queue), len(self.wait_queue))
+        if self.bus is not None:
+            self.bus.flush()
         self.clock += 1
         for p in self.ready_queue:
             p.wait_time += 1  # Increment wait time for everyone waiting
@@ -124,27 +177,30 @@ class AdaptiveScheduler(Scheduler):
                 if cpu_index in self.quantum_remaining:
                     self.quantum_remaining[cpu_index] -= 1
                 
-                # Track burst history
-                if not hasattr(current_process, 'burst_history'):
-                    current_process.burst_history = []
-                
+                burst = current_process.current_burst()
                 burst_completed = current_process.advance_burst()
                 quantum_expired = cpu_index in self.quantum_remaining and self.quantum_remaining[cpu_index] <= 0
                 
                 if burst_completed:
+                    self._record_burst(current_process, burst)
                     self.cpu_queue[cpu_index] = None
                     if cpu_index in self.quantum_remaining:
                         del self.quantum_remaining[cpu_index]
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         current_process.state = "waiting"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.wait_queue.append(current_process)
                 
                 elif quantum_expired:
@@ -152,29 +208,38 @@ class AdaptiveScheduler(Scheduler):
                     self.cpu_queue[cpu_index] = None
                     del self.quantum_remaining[cpu_index]
                     current_process.state = "ready"
+                    if self.bus is not None:
+                        self.bus.emit(PREEMPT, self.clock, current_process, f"CPU{cpu_index}")
                     self.ready_queue.append(current_process)
                     if self.verbose:
-                        print(f"[Clock {self.clock}] Process {current_process.pid} preempted")
+                        self._say(f"[Clock {self.clock}] Process {current_process.pid} preempted")
     
     def _process_io_devices(self):
         """Process currently running jobs on all I/O devices"""
         for io_index in range(self.num_ios):
             current_process = self.io_queue[io_index]
             if current_process is not None:
+                burst = current_process.current_burst()
                 burst_completed = current_process.advance_burst()
                 
                 if burst_completed:
+                    self._record_burst(current_process, burst)
                     self.io_queue[io_index] = None
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         current_process.state = "ready"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.ready_queue.append(current_process)
     
     def _dispatch_to_cpus(self):
@@ -187,27 +252,34 @@ class AdaptiveScheduler(Scheduler):
                 for cpu_index in range(self.num_cpus):
                     if self.cpu_queue[cpu_index] is None:
                         process.state = "running"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
                         # Track first time process gets CPU (for wait time calculation)
                         if not hasattr(process, 'first_dispatch_time'):
                             process.first_dispatch_time = self.clock
-                            print(f"DEBUG DISPATCH: Process {process.pid} first dispatch at clock={self.clock}, arrival={process.arrival_time}, wait={self.clock - process.arrival_time}")
+                            if self.verbose:
+                                self._say(f"DEBUG DISPATCH: Process {process.pid} first dispatch at clock={self.clock}, arrival={process.arrival_time}, wait={self.clock - process.arrival_time}", DEBUG)
                         self.cpu_queue[cpu_index] = process
                         self.quantum_remaining[cpu_index] = self.current_quantum
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} (quantum: {self.current_quantum})")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} (quantum: {self.current_quantum})", DEBUG)
                         break
     
     def _dispatch_to_io_devices(self):
         """Dispatch waiting processes to available I/O devices"""
+        if self._dispatch_io_pools():
+            return
         while len([p for p in self.io_queue if p is not None]) < self.num_ios and self.wait_queue:
             process = self.wait_queue.popleft()
             if process.state == "waiting":
                 for io_index in range(self.num_ios):
                     if self.io_queue[io_index] is None:
                         process.state = "io_waiting"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
                         self.io_queue[io_index] = process
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}", DEBUG)
                         break
     
     def has_jobs(self):
@@ -227,7 +299,8 @@ class AdaptiveScheduler(Scheduler):
             "wait": [process.pid for process in self.wait_queue],
             "cpu": [process.pid if process is not None else None for process in self.cpu_queue],
             "io": [process.pid if process is not None else None for process in self.io_queue],
-            "finished": [process.pid for process in self.finished],
+            "finished": self.finished.head(),
+            "finished_count": len(self.finished),
             "current_quantum": self.current_quantum
         }
     
@@ -282,6 +355,8 @@ class AdaptiveScheduler(Scheduler):
         print("-" * 70)
         print(f"Average Turnaround Time: {total_turnaround/len(self.finished):.2f}")
         print(f"Average Waiting Time:    {total_waiting/len(self.finished):.2f}")
+        self.latency.print_summary()
+        self._print_io_pool_stats()
         print(f"Total Simulation Time:   {self.clock}")
     
     def export_json(self, filename):
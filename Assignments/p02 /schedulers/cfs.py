@@ -0,0 +1,361 @@
+# Completely Fair Scheduler (CFS) Style Scheduling Algorithm Implementation
+# schedulers/cfs.py
+
+from pkg import Scheduler
+from pkg.sketch import LatencyStats
+from pkg.archive import FinishedArchive
+from pkg.utilization import UtilizationSeries
+from pkg.simlog import DEBUG
+from pkg.events import STATE, DISPATCH, PREEMPT, FINISH
+from collections import deque
+from sortedcontainers import SortedList
+import json
+import csv
+
+# Linux nice -> load weight table (nice -20 .. 19), nice 0 = 1024.
+# Each nice step is ~1.25x the CPU share of the next one.
+NICE_0_WEIGHT = 1024
+PRIO_TO_WEIGHT = [
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+]
+
+
+def priority_to_weight(priority):
+    """Map Process.priority (0 = highest) onto a nice value and its load weight"""
+    nice = max(-20, min(19, priority))
+    return PRIO_TO_WEIGHT[nice + 20]
+
+
+class CFSScheduler(Scheduler):
+    """
+    Completely Fair Scheduler (CFS) style Scheduling.
+    - Ready processes are kept in a SortedList (sortedcontainers) ordered by virtual runtime
+    - Running a process for one tick adds NICE_0_WEIGHT / weight to its vruntime,
+      so higher priority (larger weight) processes age more slowly
+    - Each dispatch gets a slice of target_latency proportional to the process's
+      share of the runnable weight, but never less than min_granularity
+    - New and waking processes are placed near min_vruntime so they cannot
+      starve everyone else with a tiny vruntime
+    - Insert, pick-min and remove are all O(log n)
+    """
+
+    def __init__(self, num_cpus=1, num_ios=1, target_latency=20, min_granularity=2, verbose=False, device_spec=None, util_window=100):
+        self.num_cpus = num_cpus
+        self.num_ios = num_ios
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+        self.verbose = verbose
+
+        # Queues
+        self.not_arrived = deque()   # Sorted by arrival time
+        self.ready_tree = SortedList()  # (vruntime, seq, process), leftmost runs next
+        self.wait_queue = deque()
+        self.cpu_queue = [None] * num_cpus
+        self.io_queue = [None] * num_ios
+        self._init_io_pools(device_spec)
+        self.finished = FinishedArchive(extra=(("cfs_weight", "q"), ("vruntime", "d")))
+        self.latency = LatencyStats()    # Streaming wait/turnaround/response percentiles
+        self.utilization = UtilizationSeries(num_cpus, self.num_ios, window=util_window)
+
+        # Track slice remaining for each process on CPU
+        self.slice_remaining = {}
+        self.min_vruntime = 0.0
+        self.runnable_weight = 0     # Sum of weights of ready + running processes
+        self.context_switches = 0
+
+        self._seq = 0  # FIFO tie-break for equal vruntimes
+        self._arrivals_sorted = True
+        self.clock = 0
+
+    @property
+    def ready_queue(self):
+        """Ready processes in vruntime order (for visualizers and stats)"""
+        return [entry[2] for entry in self.ready_tree]
+
+    @property
+    def ready_count(self):
+        return len(self.ready_tree)
+
+    def ready_head(self, limit):
+        """First `limit` ready processes in vruntime order, without copying the tree"""
+        return [entry[2] for entry in self.ready_tree.islice(0, limit)]
+
+    def add_process(self, process):
+        """Add a process to the not-arrived queue"""
+        if self.not_arrived and process.arrival_time < self.not_arrived[-1].arrival_time:
+            self._arrivals_sorted = False
+        self.not_arrived.append(process)
+
+    def _enqueue(self, process, preempted_from=None):
+        """Insert a process into the vruntime tree (preempted_from: CPU index it was taken off)"""
+        process.state = "ready"
+        if self.bus is not None:
+            if preempted_from is None:
+                self.bus.emit(STATE, self.clock, process)
+            else:
+                self.bus.emit(PREEMPT, self.clock, process, f"CPU{preempted_from}")
+        process.ready_since = self.clock
+        self._seq += 1
+        self.ready_tree.add((process.vruntime, self._seq, process))
+
+    def _pick_next(self):
+        """Remove and return the process with the smallest vruntime"""
+        _, _, process = self.ready_tree.pop(0)
+        process.wait_time += self.clock - process.ready_since
+        return process
+
+    def _update_min_vruntime(self):
+        """min_vruntime only moves forward; it tracks the smallest runnable vruntime"""
+        candidates = [p.vruntime for p in self.cpu_queue if p is not None]
+        if self.ready_tree:
+            candidates.append(self.ready_tree[0][0])
+        if candidates:
+            self.min_vruntime = max(self.min_vruntime, min(candidates))
+
+    def _time_slice(self, process):
+        """Share of target_latency for this process, floored at min_granularity"""
+        if not self.runnable_weight:
+            return self.target_latency
+        share = self.target_latency * process.cfs_weight / self.runnable_weight
+        return max(self.min_granularity, int(round(share)))
+
+    def _check_arrivals(self):
+        """Check for processes that have arrived and insert them into the tree"""
+        self._sort_arrivals()
+        while self.not_arrived and self.not_arrived[0].arrival_time <= self.clock:
+            process = self.not_arrived.popleft()
+            process.cfs_weight = priority_to_weight(process.priority)
+            process.vruntime = self.min_vruntime
+            self.runnable_weight += process.cfs_weight
+            self._enqueue(process)
+            if self.verbose:
+                self._say(f"[Clock {self.clock}] Process {process.pid} arrived (weight {process.cfs_weight})")
+
+    def _sort_arrivals(self):
+        """Sort the not-arrived queue if processes were added out of order"""
+        if not self._arrivals_sorted:
+            self.not_arrived = deque(sorted(self.not_arrived, key=lambda p: p.arrival_time))
+            self._arrivals_sorted = True
+
+    def step(self):
+        """Execute one time step of the simulation"""
+        self._skip_idle()
+        self._check_arrivals()
+        self._process_cpus()
+        self._process_io_devices()
+        self._update_min_vruntime()
+        self._dispatch_to_cpus()
+        self._dispatch_to_io_devices()
+        self.utilization.sample(self.clock, self.cpu_queue, self.io_queue,
+                                len(self.ready_tree), len(self.wait_queue))
+        if self.bus is not None:
+            self.bus.flush()
+        self.clock += 1
+
+    def _process_cpus(self):
+        """Process currently running jobs on all CPUs and charge vruntime"""
+        for cpu_index in range(self.num_cpus):
+            current_process = self.cpu_queue[cpu_index]
+            if current_process is not None:
+                self.slice_remaining[cpu_index] -= 1
+                current_process.vruntime += NICE_0_WEIGHT / current_process.cfs_weight
+
+                burst_completed = current_process.advance_burst()
+                slice_expired = self.slice_remaining[cpu_index] <= 0
+
+                if burst_completed:
+                    self.cpu_queue[cpu_index] = None
+                    del self.slice_remaining[cpu_index]
+                    self.runnable_weight -= current_process.cfs_weight
+
+                    if current_process.is_complete():
+                        current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
+                        current_process.end_time = self.clock
+                        current_process.turnaround_time = self.clock - current_process.arrival_time
+                        self.finished.append(current_process)
+                        self.latency.record(current_process)
+                        if self.verbose:
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                    else:
+                        # Next burst is I/O, process sleeps
+                        current_process.state = "waiting"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
+                        self.wait_queue.append(current_process)
+
+                elif slice_expired:
+                    # Slice used up - put it back in the tree
+                    self.cpu_queue[cpu_index] = None
+                    del self.slice_remaining[cpu_index]
+                    self.context_switches += 1
+                    self._enqueue(current_process, preempted_from=cpu_index)
+                    if self.verbose:
+                        self._say(f"[Clock {self.clock}] Process {current_process.pid} preempted (vruntime {current_process.vruntime:.2f})")
+
+    def _process_io_devices(self):
+        """Process currently running jobs on all I/O devices"""
+        for io_index in range(self.num_ios):
+            current_process = self.io_queue[io_index]
+            if current_process is not None:
+                burst_completed = current_process.advance_burst()
+
+                if burst_completed:
+                    self.io_queue[io_index] = None
+
+                    if current_process.is_complete():
+                        current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
+                        current_process.end_time = self.clock
+                        current_process.turnaround_time = self.clock - current_process.arrival_time
+                        self.finished.append(current_process)
+                        self.latency.record(current_process)
+                        if self.verbose:
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                    else:
+                        # Wake up: keep at most half a latency period of sleeper credit
+                        sleeper_floor = self.min_vruntime - self.target_latency / 2
+                        current_process.vruntime = max(current_process.vruntime, sleeper_floor)
+                        self.runnable_weight += current_process.cfs_weight
+                        self._enqueue(current_process)
+
+    def _dispatch_to_cpus(self):
+        """Dispatch the leftmost (smallest vruntime) processes to available CPUs"""
+        for cpu_index in range(self.num_cpus):
+            if not self.ready_tree:
+                break
+            if self.cpu_queue[cpu_index] is None:
+                process = self._pick_next()
+                process.state = "running"
+                if self.bus is not None:
+                    self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
+                if not hasattr(process, 'first_run_time'):
+                    process.first_run_time = self.clock
+                self.cpu_queue[cpu_index] = process
+                self.slice_remaining[cpu_index] = self._time_slice(process)
+                if self.verbose:
+                    self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} "
+                              f"(slice {self.slice_remaining[cpu_index]}, vruntime {process.vruntime:.2f})", DEBUG)
+
+    def _dispatch_to_io_devices(self):
+        """Dispatch waiting processes to available I/O devices"""
+        if self._dispatch_io_pools():
+            return
+        while len([p for p in self.io_queue if p is not None]) < self.num_ios and self.wait_queue:
+            process = self.wait_queue.popleft()
+            if process.state == "waiting":
+                for io_index in range(self.num_ios):
+                    if self.io_queue[io_index] is None:
+                        process.state = "io_waiting"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
+                        self.io_queue[io_index] = process
+                        if self.verbose:
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}", DEBUG)
+                        break
+
+    def has_jobs(self):
+        """Check if there are any jobs still being processed"""
+        return (len(self.not_arrived) > 0 or
+                len(self.ready_tree) > 0 or
+                len(self.wait_queue) > 0 or
+                any(p is not None for p in self.cpu_queue) or
+                any(p is not None for p in self.io_queue))
+
+    def snapshot(self):
+        """Return current state of all queues for visualization"""
+        return {
+            "clock": self.clock,
+            "not_arrived": [process.pid for process in self.not_arrived],
+            "ready": [process.pid for process in self.ready_queue],
+            "wait": [process.pid for process in self.wait_queue],
+            "cpu": [process.pid if process is not None else None for process in self.cpu_queue],
+            "io": [process.pid if process is not None else None for process in self.io_queue],
+            "finished": self.finished.head(),
+            "finished_count": len(self.finished),
+            "min_vruntime": self.min_vruntime
+        }
+
+    def print_stats(self):
+        """Print completion statistics"""
+        if not self.finished:
+            print("No processes have completed.")
+            return
+
+        print("\nCFS Scheduler Statistics:")
+        print(f"Target Latency: {self.target_latency}, Min Granularity: {self.min_granularity}")
+        print("-" * 76)
+
+        total_turnaround = sum(p.turnaround_time for p in self.finished)
+        total_waiting = sum(p.wait_time for p in self.finished)
+
+        print(f"{'Process':<8} {'Priority':<9} {'Weight':<7} {'Arrival':<8} {'Completion':<10} "
+              f"{'Turnaround':<10} {'Waiting':<10} {'Runtime':<8}")
+        print("-" * 76)
+
+        for process in self.finished:
+            print(f"{process.pid:<8} {process.priority:<9} {process.cfs_weight:<7} {process.arrival_time:<8} "
+                  f"{process.end_time:<10} {process.turnaround_time:<10} {process.wait_time:<10} {process.runtime:<8}")
+
+        print("-" * 76)
+        print(f"Average Turnaround Time: {total_turnaround/len(self.finished):.2f}")
+        print(f"Average Waiting Time:   {total_waiting/len(self.finished):.2f}")
+        print(f"Total Context Switches: {self.context_switches}")
+        self.latency.print_summary()
+        self._print_io_pool_stats()
+        print(f"Total Simulation Time: {self.clock}")
+
+    def export_json(self, filename):
+        """Export simulation timeline to JSON file"""
+        timeline_data = {
+            "algorithm": "CFS",
+            "target_latency": self.target_latency,
+            "min_granularity": self.min_granularity,
+            "total_time": self.clock,
+            "processes": []
+        }
+
+        for process in self.finished:
+            process_data = {
+                "pid": process.pid,
+                "priority": process.priority,
+                "weight": process.cfs_weight,
+                "arrival_time": process.arrival_time,
+                "completion_time": process.end_time,
+                "turnaround_time": process.turnaround_time,
+                "waiting_time": process.wait_time,
+                "vruntime": process.vruntime
+            }
+            timeline_data["processes"].append(process_data)
+
+        with open(filename, 'w') as f:
+            json.dump(timeline_data, f, indent=2)
+
+    def export_csv(self, filename):
+        """Export simulation results to CSV file"""
+        with open(filename, 'w', newline='') as csvfile:
+            fieldnames = ['pid', 'priority', 'weight', 'arrival_time', 'completion_time',
+                          'turnaround_time', 'waiting_time', 'vruntime']
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+            writer.writeheader()
+            for process in self.finished:
+                writer.writerow({
+                    'pid': process.pid,
+                    'priority': process.priority,
+                    'weight': process.cfs_weight,
+                    'arrival_time': process.arrival_time,
+                    'completion_time': process.end_time,
+                    'turnaround_time': process.turnaround_time,
+                    'waiting_time': process.wait_time,
+                    'vruntime': process.vruntime
+                })
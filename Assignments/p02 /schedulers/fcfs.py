@@ -2,6 +2,12 @@
 # schedulers/fcfs.py
 
 from pkg import Scheduler
+from pkg.runqueues import RunQueues
+from pkg.sketch import LatencyStats
+from pkg.archive import FinishedArchive
+from pkg.utilization import UtilizationSeries
+from pkg.simlog import DEBUG
+from pkg.events import STATE, DISPATCH, FINISH
 from collections import deque
 import json
 import csv
@@ -13,19 +19,24 @@ class FCFSScheduler(Scheduler):
     - Non-preemptive: once a job starts executing, it runs to completion of its burst
     """
     
-    def __init__(self, num_cpus=1, num_ios=1, verbose=False):
+    def __init__(self, num_cpus=1, num_ios=1, verbose=False, per_cpu_queues=False, balance_interval=10, device_spec=None, util_window=100):
         # Initialize scheduler parameters
         self.num_cpus = num_cpus
         self.num_ios = num_ios
         self.verbose = verbose
+        self.per_cpu_queues = per_cpu_queues    # One run queue per CPU with work stealing
+        self.balance_interval = balance_interval
         
         # Queues
         self.not_arrived = []          # Processes that haven't arrived yet
-        self.ready_queue = deque()     # Ready processes (maintained in arrival order)
+        self.ready_queue = RunQueues(num_cpus) if per_cpu_queues else deque()  # Ready processes (maintained in arrival order)
         self.wait_queue = deque()      # Processes waiting for I/O 
         self.cpu_queue = [None] * num_cpus  # Currently running processes on each CPU
         self.io_queue = [None] * num_ios    # Currently running processes on each I/O device
-        self.finished = []              # Completed processes
+        self._init_io_pools(device_spec)
+        self.finished = FinishedArchive()  # Completed processes, archived as compact records
+        self.latency = LatencyStats()    # Streaming wait/turnaround/response percentiles
+        self.utilization = UtilizationSeries(num_cpus, self.num_ios, window=util_window)
         
         self.clock = 0  # FIXED: Uncommented and initialized
     
@@ -42,12 +53,17 @@ class FCFSScheduler(Scheduler):
         while self.not_arrived and self.not_arrived[0].arrival_time <= self.clock:
             process = self.not_arrived.pop(0)
             process.state = "ready"
+            if self.bus is not None:
+                self.bus.emit(STATE, self.clock, process)
             self.ready_queue.append(process)
             if self.verbose:
-                print(f"[Clock {self.clock}] Process {process.pid} arrived")
+                self._say(f"[Clock {self.clock}] Process {process.pid} arrived")
     
     def step(self):
         """Execute one time step of the simulation"""
+        # Fast-forward over ticks where there is nothing to simulate
+        self._skip_idle()
+        
         # FIXED: Check for new arrivals FIRST before processing
         self._check_arrivals()
         
@@ -58,12 +74,23 @@ class FCFSScheduler(Scheduler):
         self._process_io_devices()
         
         # Dispatch ready processes to available CPUs (FCFS order)
-        self._dispatch_to_cpus()
+        if self.per_cpu_queues:
+            if self.balance_interval and self.clock % self.balance_interval == 0:
+                self.ready_queue.balance()
+            self._dispatch_per_cpu()
+        else:
+            self._dispatch_to_cpus()
         
         # Dispatch waiting processes to available I/O devices
         self._dispatch_to_io_devices()
         
+        # Record device busy time and queue depths for this tick
+        self.utilization.sample(self.clock, self.cpu_queue, self.io_queue,
+                                len(self.ready_queue), len(self.wait_queue))
+        
         # Increment clock at the end
+        if self.bus is not None:
+            self.bus.flush()
         self.clock += 1
         for p in self.ready_queue:
             p.wait_time += 1  # Increment wait time for everyone waiting
@@ -85,14 +112,19 @@ class FCFSScheduler(Scheduler):
                     if current_process.is_complete():
                         # Process is completely finished
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         # Next burst is I/O, move to wait queue
                         current_process.state = "waiting"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.wait_queue.append(current_process)
     
     def _process_io_devices(self):
@@ -113,14 +145,19 @@ class FCFSScheduler(Scheduler):
                     if current_process.is_complete():
                         # Process is completely finished
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         # Next burst is CPU, move back to ready queue
                         current_process.state = "ready"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.ready_queue.append(current_process)
     
     def _dispatch_to_cpus(self):
@@ -136,16 +173,34 @@ class FCFSScheduler(Scheduler):
                     if self.cpu_queue[cpu_index] is None:
                         # Assign process to CPU
                         process.state = "running"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
                         # FIXED: Track when process first starts running (for wait time calculation)
                         if not hasattr(process, 'first_run_time'):
                             process.first_run_time = self.clock
                         self.cpu_queue[cpu_index] = process
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index}")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index}", DEBUG)
                         break
     
+    def _dispatch_per_cpu(self):
+        """Each free CPU takes the head of its own run queue (stealing if it is empty)"""
+        for cpu_index in range(self.num_cpus):
+            if self.cpu_queue[cpu_index] is None and self.ready_queue:
+                process = self.ready_queue.pop(cpu_index)
+                process.state = "running"
+                if self.bus is not None:
+                    self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
+                if not hasattr(process, 'first_run_time'):
+                    process.first_run_time = self.clock
+                self.cpu_queue[cpu_index] = process
+                if self.verbose:
+                    self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index}", DEBUG)
+    
     def _dispatch_to_io_devices(self):
         """Dispatch waiting processes to available I/O devices"""
+        if self._dispatch_io_pools():
+            return
         while len([p for p in self.io_queue if p is not None]) < self.num_ios and self.wait_queue:
             process = self.wait_queue.popleft()
             if process.state == "waiting":
@@ -153,9 +208,11 @@ class FCFSScheduler(Scheduler):
                 for io_index in range(self.num_ios):
                     if self.io_queue[io_index] is None:
                         process.state = "io_waiting"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
                         self.io_queue[io_index] = process
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}", DEBUG)
                         break
     
     def has_jobs(self):
@@ -170,15 +227,19 @@ class FCFSScheduler(Scheduler):
     def snapshot(self):
         """Return current state of all queues for visualization"""
         # Return a dictionary with the current state of the scheduler
-        return {
+        snap = {
             "clock": self.clock,
             "not_arrived": [process.pid for process in self.not_arrived],
             "ready": [process.pid for process in self.ready_queue],
             "wait": [process.pid for process in self.wait_queue],
             "cpu": [process.pid if process is not None else None for process in self.cpu_queue],
             "io": [process.pid if process is not None else None for process in self.io_queue],
-            "finished": [process.pid for process in self.finished]
+            "finished": self.finished.head(),
+            "finished_count": len(self.finished)
         }
+        if self.per_cpu_queues:
+            snap["run_queues"] = self.ready_queue.stats()
+        return snap
     
     def print_stats(self):
         """Print completion statistics"""
@@ -209,6 +270,13 @@ class FCFSScheduler(Scheduler):
         print(f"Average Turnaround Time: {total_turnaround/len(self.finished):.2f}")
         print(f"Average Waiting Time:   {total_waiting/len(self.finished):.2f}")
         print(f"Total Context Switches: 0 (FCFS is non-preemptive)")
+        if self.per_cpu_queues:
+            rq = self.ready_queue.stats()
+            print(f"Run Queue Depths: {rq['depths']} (max {rq['max_depths']})")
+            print(f"Steals per CPU: {rq['steals']}, Migrations per CPU: {rq['migrations']}, "
+                  f"Balance Moves: {rq['balance_moves']}")
+        self.latency.print_summary()
+        self._print_io_pool_stats()
         print(f"Total Simulation Time: {self.clock}")
     
     def export_json(self, filename):
@@ -0,0 +1,351 @@
+# Multi-Level Feedback Queue (MLFQ) Scheduling Algorithm Implementation
+# schedulers/mlfq.py
+
+from pkg import Scheduler
+from pkg.sketch import LatencyStats
+from pkg.archive import FinishedArchive, SNAPSHOT_FINISHED
+from pkg.utilization import UtilizationSeries
+from pkg.simlog import DEBUG
+from pkg.events import STATE, DISPATCH, PREEMPT, FINISH
+from collections import deque
+from itertools import chain, islice
+import json
+import csv
+
+class MLFQScheduler(Scheduler):
+    """
+    Multi-Level Feedback Queue (MLFQ) Scheduling.
+    - N FIFO ready queues, level 0 is the highest priority
+    - Each level has its own quantum (default: base_quantum doubled per level)
+    - A process that uses up its whole quantum is demoted one level
+    - A process that blocks for I/O before its quantum expires keeps its level
+    - Every boost_interval ticks all ready processes are boosted back to level 0
+    - A bitmap of non-empty levels makes picking the next process O(1)
+    """
+
+    def __init__(self, num_cpus=1, num_ios=1, levels=3, base_quantum=4, quanta=None,
+                 boost_interval=100, verbose=False, device_spec=None, util_window=100):
+        self.num_cpus = num_cpus
+        self.num_ios = num_ios
+        self.levels = levels
+        self.quanta = list(quanta) if quanta else [base_quantum * (2 ** i) for i in range(levels)]
+        if len(self.quanta) != levels:
+            raise ValueError(f"Expected {levels} quanta, got {len(self.quanta)}")
+        self.boost_interval = boost_interval
+        self.verbose = verbose
+
+        # Queues
+        self.not_arrived = deque()                          # Sorted by arrival time
+        self.ready_levels = [deque() for _ in range(levels)]  # One FIFO per level
+        self.ready_bitmap = 0                               # Bit i set <=> level i non-empty
+        self.ready_count = 0
+        self.wait_queue = deque()
+        self.cpu_queue = [None] * num_cpus
+        self.io_queue = [None] * num_ios
+        self._init_io_pools(device_spec)
+        self.finished = FinishedArchive()
+        self.latency = LatencyStats()    # Streaming wait/turnaround/response percentiles
+        self.utilization = UtilizationSeries(num_cpus, self.num_ios, window=util_window)
+
+        # Track quantum remaining for each process on CPU
+        self.quantum_remaining = {}
+        self.boosts = 0
+        self.demotions = 0
+
+        self._arrivals_sorted = True
+        self.clock = 0
+
+    @property
+    def ready_queue(self):
+        """All ready processes, highest level first (a full copy; snapshots use ready_head)"""
+        return [p for level in self.ready_levels for p in level]
+
+    def ready_head(self, limit):
+        """First `limit` ready processes in dispatch order, without copying the levels"""
+        return list(islice(chain.from_iterable(self.ready_levels), limit))
+
+    def add_process(self, process):
+        """Add a process to the not-arrived queue"""
+        # Sorting is deferred to the first arrival check so adding N
+        # processes is O(N log N) instead of a sort per insert
+        if self.not_arrived and process.arrival_time < self.not_arrived[-1].arrival_time:
+            self._arrivals_sorted = False
+        self.not_arrived.append(process)
+
+    def _enqueue_ready(self, process, level, preempted_from=None):
+        """Put a process at the tail of a level and mark the level non-empty (preempted_from: CPU index it was taken off)"""
+        process.state = "ready"
+        if self.bus is not None:
+            if preempted_from is None:
+                self.bus.emit(STATE, self.clock, process)
+            else:
+                self.bus.emit(PREEMPT, self.clock, process, f"CPU{preempted_from}")
+        process.mlfq_level = level
+        process.ready_since = self.clock
+        self.ready_levels[level].append(process)
+        self.ready_bitmap |= 1 << level
+        self.ready_count += 1
+
+    def _dequeue_ready(self):
+        """Pop the head of the highest non-empty level, O(1) via the bitmap"""
+        # Lowest set bit = highest priority non-empty level
+        level = (self.ready_bitmap & -self.ready_bitmap).bit_length() - 1
+        queue = self.ready_levels[level]
+        process = queue.popleft()
+        if not queue:
+            self.ready_bitmap &= ~(1 << level)
+        self.ready_count -= 1
+        # Wait time is charged on dequeue instead of every tick for every process
+        process.wait_time += self.clock - process.ready_since
+        return process
+
+    def _check_arrivals(self):
+        """Check for processes that have arrived and move them to level 0"""
+        self._sort_arrivals()
+        while self.not_arrived and self.not_arrived[0].arrival_time <= self.clock:
+            process = self.not_arrived.popleft()
+            self._enqueue_ready(process, 0)
+            if self.verbose:
+                self._say(f"[Clock {self.clock}] Process {process.pid} arrived")
+
+    def _priority_boost(self):
+        """Move every ready process back to level 0 (prevents starvation)"""
+        for level in range(1, self.levels):
+            queue = self.ready_levels[level]
+            while queue:
+                process = queue.popleft()
+                process.mlfq_level = 0
+                self.ready_levels[0].append(process)
+        if self.ready_count:
+            self.ready_bitmap = 1
+        # Running processes start their next turn at the top as well
+        for process in self.cpu_queue:
+            if process is not None:
+                process.mlfq_level = 0
+        self.boosts += 1
+        if self.verbose:
+            self._say(f"[Clock {self.clock}] Priority boost")
+
+    def _sort_arrivals(self):
+        """Sort the not-arrived queue if processes were added out of order"""
+        if not self._arrivals_sorted:
+            self.not_arrived = deque(sorted(self.not_arrived, key=lambda p: p.arrival_time))
+            self._arrivals_sorted = True
+
+    def _idle_skipped(self, next_arrival):
+        """Boosts that would have fired on the skipped ticks (no-ops apart from the count)"""
+        if self.boost_interval:
+            first = max(self.clock, 1)
+            self.boosts += (next_arrival - 1) // self.boost_interval - (first - 1) // self.boost_interval
+
+    def step(self):
+        """Execute one time step of the simulation"""
+        self._skip_idle()
+        self._check_arrivals()
+        if self.boost_interval and self.clock > 0 and self.clock % self.boost_interval == 0:
+            self._priority_boost()
+        self._process_cpus()
+        self._process_io_devices()
+        self._dispatch_to_cpus()
+        self._dispatch_to_io_devices()
+        self.utilization.sample(self.clock, self.cpu_queue, self.io_queue,
+                                self.ready_count, len(self.wait_queue))
+        if self.bus is not None:
+            self.bus.flush()
+        self.clock += 1
+
+    def _process_cpus(self):
+        """Process currently running jobs on all CPUs with per-level quantum"""
+        for cpu_index in range(self.num_cpus):
+            current_process = self.cpu_queue[cpu_index]
+            if current_process is not None:
+                # Decrement quantum
+                self.quantum_remaining[cpu_index] -= 1
+
+                # Advance the current burst
+                burst_completed = current_process.advance_burst()
+
+                # Check if quantum expired or burst completed
+                quantum_expired = self.quantum_remaining[cpu_index] <= 0
+
+                if burst_completed:
+                    # Burst completed, process keeps its level
+                    self.cpu_queue[cpu_index] = None
+                    del self.quantum_remaining[cpu_index]
+
+                    if current_process.is_complete():
+                        current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
+                        current_process.end_time = self.clock
+                        current_process.turnaround_time = self.clock - current_process.arrival_time
+                        self.finished.append(current_process)
+                        self.latency.record(current_process)
+                        if self.verbose:
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                    else:
+                        # Next burst is I/O
+                        current_process.state = "waiting"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
+                        self.wait_queue.append(current_process)
+
+                elif quantum_expired:
+                    # Used the whole quantum - preempt and demote one level
+                    self.cpu_queue[cpu_index] = None
+                    del self.quantum_remaining[cpu_index]
+                    level = min(current_process.mlfq_level + 1, self.levels - 1)
+                    if level != current_process.mlfq_level:
+                        self.demotions += 1
+                    self._enqueue_ready(current_process, level, preempted_from=cpu_index)
+                    if self.verbose:
+                        self._say(f"[Clock {self.clock}] Process {current_process.pid} preempted (demoted to level {level})")
+
+    def _process_io_devices(self):
+        """Process currently running jobs on all I/O devices"""
+        for io_index in range(self.num_ios):
+            current_process = self.io_queue[io_index]
+            if current_process is not None:
+                burst_completed = current_process.advance_burst()
+
+                if burst_completed:
+                    self.io_queue[io_index] = None
+
+                    if current_process.is_complete():
+                        current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
+                        current_process.end_time = self.clock
+                        current_process.turnaround_time = self.clock - current_process.arrival_time
+                        self.finished.append(current_process)
+                        self.latency.record(current_process)
+                        if self.verbose:
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                    else:
+                        # Next burst is CPU, back to the level it had
+                        self._enqueue_ready(current_process, current_process.mlfq_level)
+
+    def _dispatch_to_cpus(self):
+        """Dispatch the highest level ready processes to available CPUs"""
+        for cpu_index in range(self.num_cpus):
+            if not self.ready_bitmap:
+                break
+            if self.cpu_queue[cpu_index] is None:
+                process = self._dequeue_ready()
+                process.state = "running"
+                if self.bus is not None:
+                    self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
+                if not hasattr(process, 'first_run_time'):
+                    process.first_run_time = self.clock
+                self.cpu_queue[cpu_index] = process
+                self.quantum_remaining[cpu_index] = self.quanta[process.mlfq_level]
+                if self.verbose:
+                    self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} (level {process.mlfq_level})", DEBUG)
+
+    def _dispatch_to_io_devices(self):
+        """Dispatch waiting processes to available I/O devices"""
+        if self._dispatch_io_pools():
+            return
+        while len([p for p in self.io_queue if p is not None]) < self.num_ios and self.wait_queue:
+            process = self.wait_queue.popleft()
+            if process.state == "waiting":
+                for io_index in range(self.num_ios):
+                    if self.io_queue[io_index] is None:
+                        process.state = "io_waiting"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
+                        self.io_queue[io_index] = process
+                        if self.verbose:
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}", DEBUG)
+                        break
+
+    def has_jobs(self):
+        """Check if there are any jobs still being processed"""
+        return (len(self.not_arrived) > 0 or
+                self.ready_count > 0 or
+                len(self.wait_queue) > 0 or
+                any(p is not None for p in self.cpu_queue) or
+                any(p is not None for p in self.io_queue))
+
+    def snapshot(self):
+        """Return current state of all queues for visualization"""
+        return {
+            "clock": self.clock,
+            "not_arrived": [process.pid for process in self.not_arrived],
+            "ready": [process.pid for process in self.ready_head(SNAPSHOT_FINISHED)],
+            "ready_count": self.ready_count,
+            "wait": [process.pid for process in self.wait_queue],
+            "cpu": [process.pid if process is not None else None for process in self.cpu_queue],
+            "io": [process.pid if process is not None else None for process in self.io_queue],
+            "finished": self.finished.head(),
+            "finished_count": len(self.finished),
+            "levels": [len(level) for level in self.ready_levels],
+            "quantum": self.quanta[0]
+        }
+
+    def print_stats(self):
+        """Print completion statistics"""
+        if not self.finished:
+            print("No processes have completed.")
+            return
+
+        print("\nMLFQ Scheduler Statistics:")
+        print(f"Levels: {self.levels}, Quanta: {self.quanta}, Boost Interval: {self.boost_interval}")
+        print("-" * 60)
+
+        total_turnaround = sum(p.turnaround_time for p in self.finished)
+        total_waiting = sum(p.wait_time for p in self.finished)
+
+        print(f"{'Process':<8} {'Arrival':<8} {'Completion':<10} {'Turnaround':<10} {'Waiting':<10}")
+        print("-" * 60)
+
+        for process in self.finished:
+            print(f"{process.pid:<8} {process.arrival_time:<8} {process.end_time:<10} "
+                  f"{process.turnaround_time:<10} {process.wait_time:<10}")
+
+        print("-" * 60)
+        print(f"Average Turnaround Time: {total_turnaround/len(self.finished):.2f}")
+        print(f"Average Waiting Time:   {total_waiting/len(self.finished):.2f}")
+        print(f"Demotions: {self.demotions}, Priority Boosts: {self.boosts}")
+        self.latency.print_summary()
+        self._print_io_pool_stats()
+        print(f"Total Simulation Time: {self.clock}")
+
+    def export_json(self, filename):
+        """Export simulation timeline to JSON file"""
+        timeline_data = {
+            "algorithm": "MLFQ",
+            "quanta": self.quanta,
+            "boost_interval": self.boost_interval,
+            "total_time": self.clock,
+            "processes": []
+        }
+
+        for process in self.finished:
+            process_data = {
+                "pid": process.pid,
+                "arrival_time": process.arrival_time,
+                "completion_time": process.end_time,
+                "turnaround_time": process.turnaround_time,
+                "waiting_time": process.wait_time
+            }
+            timeline_data["processes"].append(process_data)
+
+        with open(filename, 'w') as f:
+            json.dump(timeline_data, f, indent=2)
+
+    def export_csv(self, filename):
+        """Export simulation results to CSV file"""
+        with open(filename, 'w', newline='') as csvfile:
+            fieldnames = ['pid', 'arrival_time', 'completion_time', 'turnaround_time', 'waiting_time']
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+            writer.writeheader()
+            for process in self.finished:
+                writer.writerow({
+                    'pid': process.pid,
+                    'arrival_time': process.arrival_time,
+                    'completion_time': process.end_time,
+                    'turnaround_time': process.turnaround_time,
+                    'waiting_time': process.wait_time
+                })
@@ -2,6 +2,11 @@
 # schedulers/priority.py
 
 from pkg import Scheduler
+from pkg.sketch import LatencyStats
+from pkg.archive import FinishedArchive
+from pkg.utilization import UtilizationSeries
+from pkg.simlog import DEBUG
+from pkg.events import STATE, DISPATCH, PREEMPT, FINISH
 from collections import deque
 import json
 import csv
@@ -14,7 +19,7 @@ class PriorityScheduler(Scheduler):
     - Ties are broken by arrival time (FCFS for same priority)
     """
     
-    def __init__(self, num_cpus=1, num_ios=1, preemptive=False, verbose=False):
+    def __init__(self, num_cpus=1, num_ios=1, preemptive=False, verbose=False, device_spec=None, util_window=100):
         self.num_cpus = num_cpus
         self.num_ios = num_ios
         self.preemptive = preemptive
@@ -26,7 +31,10 @@ class PriorityScheduler(Scheduler):
         self.wait_queue = deque()
         self.cpu_queue = [None] * num_cpus
         self.io_queue = [None] * num_ios
-        self.finished = []
+        self._init_io_pools(device_spec)
+        self.finished = FinishedArchive()
+        self.latency = LatencyStats()    # Streaming wait/turnaround/response percentiles
+        self.utilization = UtilizationSeries(num_cpus, self.num_ios, window=util_window)
         
         self.clock = 0
     
@@ -40,10 +48,12 @@ class PriorityScheduler(Scheduler):
         while self.not_arrived and self.not_arrived[0].arrival_time <= self.clock:
             process = self.not_arrived.pop(0)
             process.state = "ready"
+            if self.bus is not None:
+                self.bus.emit(STATE, self.clock, process)
             self.ready_queue.append(process)
             self._sort_ready_queue()
             if self.verbose:
-                print(f"[Clock {self.clock}] Process {process.pid} arrived (priority: {process.priority})")
+                self._say(f"[Clock {self.clock}] Process {process.pid} arrived (priority: {process.priority})")
     
     def _sort_ready_queue(self):
         """Sort ready queue by priority (lower number = higher priority), then by arrival time"""
@@ -63,14 +73,17 @@ class PriorityScheduler(Scheduler):
                 if self.ready_queue[0].priority < current_process.priority:
                     # Preempt current process
                     current_process.state = "ready"
+                    if self.bus is not None:
+                        self.bus.emit(PREEMPT, self.clock, current_process, f"CPU{cpu_index}")
                     self.ready_queue.append(current_process)
                     self.cpu_queue[cpu_index] = None
                     self._sort_ready_queue()
                     if self.verbose:
-                        print(f"[Clock {self.clock}] Process {current_process.pid} preempted by higher priority job")
+                        self._say(f"[Clock {self.clock}] Process {current_process.pid} preempted by higher priority job")
     
     def step(self):
         """Execute one time step of the simulation"""
+        self._skip_idle()
         self._check_arrivals()
         if self.preemptive:
             self._check_preemption()
@@ -78,6 +91,10 @@ class PriorityScheduler(Scheduler):
         self._process_io_devices()
         self._dispatch_to_cpus()
         self._dispatch_to_io_devices()
+        self.utilization.sample(self.clock, self.cpu_queue, self.io_queue,
+                                len(self.ready_queue), len(self.wait_queue))
+        if self.bus is not None:
+            self.bus.flush()
         self.clock += 1
         for p in self.ready_queue:
             p.wait_time += 1  # Increment wait time for everyone waiting
@@ -94,13 +111,18 @@ class PriorityScheduler(Scheduler):
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         current_process.state = "waiting"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.wait_queue.append(current_process)
     
     def _process_io_devices(self):
@@ -115,13 +137,18 @@ class PriorityScheduler(Scheduler):
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         current_process.state = "ready"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.ready_queue.append(current_process)
                         self._sort_ready_queue()
     
@@ -135,24 +162,30 @@ class PriorityScheduler(Scheduler):
                 for cpu_index in range(self.num_cpus):
                     if self.cpu_queue[cpu_index] is None:
                         process.state = "running"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
                         if not hasattr(process, 'first_run_time'):
                             process.first_run_time = self.clock
                         self.cpu_queue[cpu_index] = process
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} (priority: {process.priority})")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} (priority: {process.priority})", DEBUG)
                         break
     
     def _dispatch_to_io_devices(self):
         """Dispatch waiting processes to available I/O devices"""
+        if self._dispatch_io_pools():
+            return
         while len([p for p in self.io_queue if p is not None]) < self.num_ios and self.wait_queue:
             process = self.wait_queue.popleft()
             if process.state == "waiting":
                 for io_index in range(self.num_ios):
                     if self.io_queue[io_index] is None:
                         process.state = "io_waiting"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
                         self.io_queue[io_index] = process
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}", DEBUG)
                         break
     
     def has_jobs(self):
@@ -172,7 +205,8 @@ class PriorityScheduler(Scheduler):
             "wait": [process.pid for process in self.wait_queue],
             "cpu": [process.pid if process is not None else None for process in self.cpu_queue],
             "io": [process.pid if process is not None else None for process in self.io_queue],
-            "finished": [process.pid for process in self.finished],
+            "finished": self.finished.head(),
+            "finished_count": len(self.finished),
             "preemptive": self.preemptive
         }
     
@@ -199,6 +233,8 @@ class PriorityScheduler(Scheduler):
         print("-" * 70)
         print(f"Average Turnaround Time: {total_turnaround/len(self.finished):.2f}")
         print(f"Average Waiting Time:   {total_waiting/len(self.finished):.2f}")
+        self.latency.print_summary()
+        self._print_io_pool_stats()
         print(f"Total Simulation Time: {self.clock}")
     
     def export_json(self, filename):
@@ -2,6 +2,13 @@
 # schedulers/round_robin.py
 
 from pkg import Scheduler
+from pkg.runqueues import RunQueues
+from pkg.sketch import LatencyStats
+from pkg.archive import FinishedArchive
+from pkg.utilization import UtilizationSeries
+from pkg.simlog import DEBUG
+from pkg.events import STATE, DISPATCH, PREEMPT, FINISH
+from pkg.timing_wheel import TimingWheel, ARRIVAL, QUANTUM_EXPIRY
 from collections import deque
 import json
 import csv
@@ -13,89 +20,139 @@ class RRScheduler(Scheduler):
     - Preemptive: if a process doesn't finish in its quantum, it's preempted
     """
     
-    def __init__(self, num_cpus=1, num_ios=1, quantum=4, verbose=False):
+    def __init__(self, num_cpus=1, num_ios=1, quantum=4, verbose=False, per_cpu_queues=False, balance_interval=10, device_spec=None, util_window=100):
         self.num_cpus = num_cpus
         self.num_ios = num_ios
         self.quantum = quantum
         self.verbose = verbose
+        self.per_cpu_queues = per_cpu_queues    # One run queue per CPU with work stealing
+        self.balance_interval = balance_interval
         
         # Queues
         self.not_arrived = []          # Processes that haven't arrived yet
-        self.ready_queue = deque()     
+        self.ready_queue = RunQueues(num_cpus) if per_cpu_queues else deque()
         self.wait_queue = deque()      
         self.cpu_queue = [None] * num_cpus
         self.io_queue = [None] * num_ios
-        self.finished = []
+        self._init_io_pools(device_spec)
+        self.finished = FinishedArchive()
+        self.latency = LatencyStats()    # Streaming wait/turnaround/response percentiles
+        self.utilization = UtilizationSeries(num_cpus, self.num_ios, window=util_window)
         
-        # Track quantum remaining for each process on CPU
-        self.quantum_remaining = {}
+        # Arrival timers (payload = process) and quantum expiry timers, one per
+        # busy CPU (payload = CPU index), fired by the wheel. It starts at -1 so
+        # processes arriving at time 0 fire on the first step.
+        self.timers = TimingWheel(now=-1)
+        self.quantum_timers = [None] * num_cpus
+        self.expired_cpus = set()  # CPUs whose quantum ran out this tick
         
         self.clock = 0
     
     def add_process(self, process):
-        """Add a process to the not-arrived queue"""
+        """Add a process to the not-arrived queue and arm its arrival timer"""
         self.not_arrived.append(process)
         self.not_arrived.sort(key=lambda p: p.arrival_time)
+        self.timers.schedule(process.arrival_time, ARRIVAL, process)
     
     def _check_arrivals(self):
-        """Check for processes that have arrived and move them to ready queue"""
-        while self.not_arrived and self.not_arrived[0].arrival_time <= self.clock:
-            process = self.not_arrived.pop(0)
+        """Fire the timers due at this tick: arrivals join the ready queue, expired quanta are kept for _process_cpus"""
+        arrived = 0
+        self.expired_cpus.clear()
+        for _, batch in self.timers.advance_to(self.clock):
+            for timer in batch:
+                if timer.kind == ARRIVAL:
+                    arrived += 1
+                else:
+                    self.expired_cpus.add(timer.payload)
+        if not arrived:
+            return
+        # The processes that fired are the head of not_arrived, which keeps them in arrival order
+        due = self.not_arrived[:arrived]
+        del self.not_arrived[:arrived]
+        for process in due:
             process.state = "ready"
+            if self.bus is not None:
+                self.bus.emit(STATE, self.clock, process)
             self.ready_queue.append(process)
             if self.verbose:
-                print(f"[Clock {self.clock}] Process {process.pid} arrived")
+                self._say(f"[Clock {self.clock}] Process {process.pid} arrived")
     
     def step(self):
         """Execute one time step of the simulation"""
+        self._skip_idle()
         self._check_arrivals()
         self._process_cpus()
         self._process_io_devices()
-        self._dispatch_to_cpus()
+        if self.per_cpu_queues:
+            if self.balance_interval and self.clock % self.balance_interval == 0:
+                self.ready_queue.balance()
+            self._dispatch_per_cpu()
+        else:
+            self._dispatch_to_cpus()
         self._dispatch_to_io_devices()
+        self.utilization.sample(self.clock, self.cpu_queue, self.io_queue,
+                                len(self.ready_queue), len(self.wait_queue))
+        if self.bus is not None:
+            self.bus.flush()
         self.clock += 1
         for p in self.ready_queue:
             p.wait_time += 1  # Increment wait time for everyone waiting
     
+    def _start_quantum(self, cpu_index):
+        """Arm the quantum expiry timer of a CPU that was just given a process"""
+        self.quantum_timers[cpu_index] = self.timers.schedule(self.clock + self.quantum, QUANTUM_EXPIRY, cpu_index)
+    
+    def _stop_quantum(self, cpu_index):
+        """Disarm a CPU's quantum timer (a fired timer is already spent)"""
+        self.timers.cancel(self.quantum_timers[cpu_index])
+        self.quantum_timers[cpu_index] = None
+    
     def _process_cpus(self):
         """Process currently running jobs on all CPUs with quantum"""
+        # CPUs whose quantum runs out this tick were collected from the wheel by
+        # _check_arrivals (no per-CPU countdown)
+        expired = self.expired_cpus
         for cpu_index in range(self.num_cpus):
             current_process = self.cpu_queue[cpu_index]
             if current_process is not None:
-                # Decrement quantum
-                self.quantum_remaining[cpu_index] -= 1
-                
                 # Advance the current burst
                 burst_completed = current_process.advance_burst()
                 
                 # Check if quantum expired or burst completed
-                quantum_expired = self.quantum_remaining[cpu_index] <= 0
+                quantum_expired = cpu_index in expired
                 
                 if burst_completed:
                     # Burst completed
                     self.cpu_queue[cpu_index] = None
-                    del self.quantum_remaining[cpu_index]
+                    self._stop_quantum(cpu_index)
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         # Next burst is I/O
                         current_process.state = "waiting"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.wait_queue.append(current_process)
                 
                 elif quantum_expired:
                     # Quantum expired but burst not complete - preempt
                     self.cpu_queue[cpu_index] = None
-                    del self.quantum_remaining[cpu_index]
+                    self.quantum_timers[cpu_index] = None
                     current_process.state = "ready"
+                    if self.bus is not None:
+                        self.bus.emit(PREEMPT, self.clock, current_process, f"CPU{cpu_index}")
                     self.ready_queue.append(current_process)  # Back to end of ready queue
                     if self.verbose:
-                        print(f"[Clock {self.clock}] Process {current_process.pid} preempted (quantum expired)")
+                        self._say(f"[Clock {self.clock}] Process {current_process.pid} preempted (quantum expired)")
     
     def _process_io_devices(self):
         """Process currently running jobs on all I/O devices"""
@@ -109,14 +166,19 @@ class RRScheduler(Scheduler):
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         # Next burst is CPU
                         current_process.state = "ready"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.ready_queue.append(current_process)
     
     def _dispatch_to_cpus(self):
@@ -127,25 +189,46 @@ class RRScheduler(Scheduler):
                 for cpu_index in range(self.num_cpus):
                     if self.cpu_queue[cpu_index] is None:
                         process.state = "running"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
                         if not hasattr(process, 'first_run_time'):
                             process.first_run_time = self.clock
                         self.cpu_queue[cpu_index] = process
-                        self.quantum_remaining[cpu_index] = self.quantum
+                        self._start_quantum(cpu_index)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index}")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index}", DEBUG)
                         break
     
+    def _dispatch_per_cpu(self):
+        """Each free CPU takes the head of its own run queue (stealing if it is empty)"""
+        for cpu_index in range(self.num_cpus):
+            if self.cpu_queue[cpu_index] is None and self.ready_queue:
+                process = self.ready_queue.pop(cpu_index)
+                process.state = "running"
+                if self.bus is not None:
+                    self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
+                if not hasattr(process, 'first_run_time'):
+                    process.first_run_time = self.clock
+                self.cpu_queue[cpu_index] = process
+                self._start_quantum(cpu_index)
+                if self.verbose:
+                    self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index}", DEBUG)
+    
     def _dispatch_to_io_devices(self):
         """Dispatch waiting processes to available I/O devices"""
+        if self._dispatch_io_pools():
+            return
         while len([p for p in self.io_queue if p is not None]) < self.num_ios and self.wait_queue:
             process = self.wait_queue.popleft()
             if process.state == "waiting":
                 for io_index in range(self.num_ios):
                     if self.io_queue[io_index] is None:
                         process.state = "io_waiting"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
                         self.io_queue[io_index] = process
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}", DEBUG)
                         break
     
     def has_jobs(self):
@@ -158,16 +241,20 @@ class RRScheduler(Scheduler):
     
     def snapshot(self):
         """Return current state of all queues for visualization"""
-        return {
+        snap = {
             "clock": self.clock,
             "not_arrived": [process.pid for process in self.not_arrived],
             "ready": [process.pid for process in self.ready_queue],
             "wait": [process.pid for process in self.wait_queue],
             "cpu": [process.pid if process is not None else None for process in self.cpu_queue],
             "io": [process.pid if process is not None else None for process in self.io_queue],
-            "finished": [process.pid for process in self.finished],
+            "finished": self.finished.head(),
+            "finished_count": len(self.finished),
             "quantum": self.quantum
         }
+        if self.per_cpu_queues:
+            snap["run_queues"] = self.ready_queue.stats()
+        return snap
     
     def print_stats(self):
         """Print completion statistics"""
@@ -192,6 +279,13 @@ class RRScheduler(Scheduler):
         print("-" * 60)
         print(f"Average Turnaround Time: {total_turnaround/len(self.finished):.2f}")
         print(f"Average Waiting Time:   {total_waiting/len(self.finished):.2f}")
+        if self.per_cpu_queues:
+            rq = self.ready_queue.stats()
+            print(f"Run Queue Depths: {rq['depths']} (max {rq['max_depths']})")
+            print(f"Steals per CPU: {rq['steals']}, Migrations per CPU: {rq['migrations']}, "
+                  f"Balance Moves: {rq['balance_moves']}")
+        self.latency.print_summary()
+        self._print_io_pool_stats()
         print(f"Total Simulation Time: {self.clock}")
     
     def export_json(self, filename):
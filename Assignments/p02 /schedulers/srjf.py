@@ -2,6 +2,11 @@
 # schedulers/srtf.py
 
 from pkg import Scheduler
+from pkg.sketch import LatencyStats
+from pkg.archive import FinishedArchive
+from pkg.utilization import UtilizationSeries
+from pkg.simlog import DEBUG
+from pkg.events import STATE, DISPATCH, PREEMPT, FINISH
 from collections import deque
 import json
 import csv
@@ -14,7 +19,7 @@ class SRTFScheduler(Scheduler):
     - Can preempt currently running process if a new arrival has shorter remaining time
     """
     
-    def __init__(self, num_cpus=1, num_ios=1, verbose=False):
+    def __init__(self, num_cpus=1, num_ios=1, verbose=False, device_spec=None, util_window=100):
         self.num_cpus = num_cpus
         self.num_ios = num_ios
         self.verbose = verbose
@@ -25,7 +30,10 @@ class SRTFScheduler(Scheduler):
         self.wait_queue = deque()
         self.cpu_queue = [None] * num_cpus
         self.io_queue = [None] * num_ios
-        self.finished = []
+        self._init_io_pools(device_spec)
+        self.finished = FinishedArchive()
+        self.latency = LatencyStats()    # Streaming wait/turnaround/response percentiles
+        self.utilization = UtilizationSeries(num_cpus, self.num_ios, window=util_window)
         
         self.clock = 0
     
@@ -39,9 +47,11 @@ class SRTFScheduler(Scheduler):
         while self.not_arrived and self.not_arrived[0].arrival_time <= self.clock:
             process = self.not_arrived.pop(0)
             process.state = "ready"
+            if self.bus is not None:
+                self.bus.emit(STATE, self.clock, process)
             self.ready_queue.append(process)
             if self.verbose:
-                print(f"[Clock {self.clock}] Process {process.pid} arrived")
+                self._say(f"[Clock {self.clock}] Process {process.pid} arrived")
     
     def _get_remaining_burst_time(self, process):
         """Get the remaining time for the current burst"""
@@ -80,19 +90,26 @@ class SRTFScheduler(Scheduler):
                 if shortest_ready_remaining < current_remaining:
                     # Preempt current process
                     current_process.state = "ready"
+                    if self.bus is not None:
+                        self.bus.emit(PREEMPT, self.clock, current_process, f"CPU{cpu_index}")
                     self.ready_queue.append(current_process)
                     self.cpu_queue[cpu_index] = None
                     if self.verbose:
-                        print(f"[Clock {self.clock}] Process {current_process.pid} preempted by shorter job")
+                        self._say(f"[Clock {self.clock}] Process {current_process.pid} preempted by shorter job")
     
     def step(self):
         """Execute one time step of the simulation"""
+        self._skip_idle()
         self._check_arrivals()
         self._check_preemption()  # SRTF specific: check for preemption
         self._process_cpus()
         self._process_io_devices()
         self._dispatch_to_cpus()
         self._dispatch_to_io_devices()
+        self.utilization.sample(self.clock, self.cpu_queue, self.io_queue,
+                                len(self.ready_queue), len(self.wait_queue))
+        if self.bus is not None:
+            self.bus.flush()
         self.clock += 1
         for p in self.ready_queue:
             p.wait_time += 1  # Increment wait time for everyone waiting
@@ -109,13 +126,18 @@ class SRTFScheduler(Scheduler):
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         current_process.state = "waiting"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.wait_queue.append(current_process)
     
     def _process_io_devices(self):
@@ -130,13 +152,18 @@ class SRTFScheduler(Scheduler):
                     
                     if current_process.is_complete():
                         current_process.state = "finished"
+                        if self.bus is not None:
+                            self.bus.emit(FINISH, self.clock, current_process)
                         current_process.end_time = self.clock
                         current_process.turnaround_time = self.clock - current_process.arrival_time
                         self.finished.append(current_process)
+                        self.latency.record(current_process)
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {current_process.pid} finished")
+                            self._say(f"[Clock {self.clock}] Process {current_process.pid} finished")
                     else:
                         current_process.state = "ready"
+                        if self.bus is not None:
+                            self.bus.emit(STATE, self.clock, current_process)
                         self.ready_queue.append(current_process)
     
     def _dispatch_to_cpus(self):
@@ -149,25 +176,31 @@ class SRTFScheduler(Scheduler):
                 for cpu_index in range(self.num_cpus):
                     if self.cpu_queue[cpu_index] is None:
                         process.state = "running"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"CPU{cpu_index}")
                         if not hasattr(process, 'first_run_time'):
                             process.first_run_time = self.clock
                         self.cpu_queue[cpu_index] = process
                         if self.verbose:
                             remaining = self._get_remaining_burst_time(process)
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} (remaining: {remaining})")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to CPU {cpu_index} (remaining: {remaining})", DEBUG)
                         break
     
     def _dispatch_to_io_devices(self):
         """Dispatch waiting processes to available I/O devices"""
+        if self._dispatch_io_pools():
+            return
         while len([p for p in self.io_queue if p is not None]) < self.num_ios and self.wait_queue:
             process = self.wait_queue.popleft()
             if process.state == "waiting":
                 for io_index in range(self.num_ios):
                     if self.io_queue[io_index] is None:
                         process.state = "io_waiting"
+                        if self.bus is not None:
+                            self.bus.emit(DISPATCH, self.clock, process, f"IO{io_index}")
                         self.io_queue[io_index] = process
                         if self.verbose:
-                            print(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}")
+                            self._say(f"[Clock {self.clock}] Process {process.pid} dispatched to I/O {io_index}", DEBUG)
                         break
     
     def has_jobs(self):
@@ -187,7 +220,8 @@ class SRTFScheduler(Scheduler):
             "wait": [process.pid for process in self.wait_queue],
             "cpu": [process.pid if process is not None else None for process in self.cpu_queue],
             "io": [process.pid if process is not None else None for process in self.io_queue],
-            "finished": [process.pid for process in self.finished]
+            "finished": self.finished.head(),
+            "finished_count": len(self.finished)
         }
     
     def print_stats(self):
@@ -212,6 +246,8 @@ class SRTFScheduler(Scheduler):
         print("-" * 60)
         print(f"Average Turnaround Time: {total_turnaround/len(self.finished):.2f}")
         print(f"Average Waiting Time:   {total_waiting/len(self.finished):.2f}")
+        self.latency.print_summary()
+        self._print_io_pool_stats()
         print(f"Total Simulation Time: {self.clock}")
     
     def export_json(self, filename):
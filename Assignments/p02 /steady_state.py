@@ -0,0 +1,93 @@
+# steady_state.py
+"""
+Open-ended steady-state simulation from the job class distributions.
+
+Processes are generated on demand from gen_jobs/job_classes.json (see
+pkg.workload.JobClassSource) at a target offered load, and the scheduler is
+run for a fixed span of simulated time. Finished processes are archived as
+compact records, so memory follows the number of live processes and long
+runs stay cheap. The report shows how far the system keeps up: throughput,
+backlog, CPU utilization and latency percentiles.
+
+Usage:
+    python steady_state.py scheduler=rr load=0.9 arrival=poisson cpus=2 ios=4 until=50000 seed=1
+
+Add metrics_port=9100 to watch the run live at http://127.0.0.1:9100/metrics
+(phase_timing=N also times the step phases of one step in N),
+and trace=run.json to save the schedule for ui.perfetto.dev / chrome://tracing.
+log=events.txt (log_level=debug|info) writes the verbose event log through a
+buffered background writer. per_cpu=1 (fcfs, rr) gives every CPU its own run
+queue with work stealing, rebalanced every balance=N ticks.
+"""
+import sys
+
+from pkg.registry import SCHEDULERS, per_cpu_options
+from pkg.telemetry import MetricsServer, instrument
+from pkg.trace import trace, end_trace
+from pkg.workload import JobClassSource, run_source
+
+if __name__ == "__main__":
+    args = {}
+    for arg in sys.argv[1:]:
+        if "=" in arg:
+            k, v = arg.split("=", 1)
+            args[k] = v
+
+    scheduler_name = args.get("scheduler", "rr").lower()
+    cpus = int(args.get("cpus", 1))
+    ios = int(args.get("ios", 1))
+    until = int(args.get("until", 10000))
+    load = float(args["load"]) if "load" in args else None
+
+    if scheduler_name not in SCHEDULERS:
+        print(f"Error: Unknown scheduler '{scheduler_name}'. Must be one of: {', '.join(SCHEDULERS)}")
+        sys.exit(1)
+    options = {}
+    if args.get("per_cpu", "0") != "0":
+        try:
+            options = per_cpu_options(scheduler_name, int(args["balance"]) if "balance" in args else None)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    source = JobClassSource.from_json(
+        args.get("classes", "./gen_jobs /job_classes.json"),
+        arrival=args.get("arrival", "poisson"),
+        offered_load=load,
+        num_cpus=cpus,
+        period=int(args.get("period", 1000)),
+        seed=int(args.get("seed", 0)),
+    )
+    scheduler = SCHEDULERS[scheduler_name](num_cpus=cpus, num_ios=ios, verbose=False,
+                                           util_window=int(args.get("window", 1000)), **options)
+    metrics = None
+    if "metrics_port" in args:
+        if "phase_timing" in args:
+            instrument(scheduler, every=int(args["phase_timing"]))
+        metrics = MetricsServer(scheduler, port=int(args["metrics_port"])).start()
+        print(f"Serving metrics on http://{metrics.host}:{metrics.port}/metrics")
+    if "trace" in args:
+        trace(scheduler, args["trace"])
+    if "log" in args:
+        scheduler.log_output(None if args["log"] == "-" else args["log"], level=args.get("log_level", "info"))
+    fed = run_source(scheduler, source, until=until)
+    if "log" in args:
+        scheduler.close_log()
+    if "trace" in args:
+        end_trace(scheduler)
+    if metrics is not None:
+        metrics.stop()
+
+    windows = scheduler.utilization.windows()
+    busy = sum(sum(w["cpu_util"]) * w["ticks"] for w in windows)
+    print(f"{type(scheduler).__name__}, {source.arrival} arrivals, offered load {source.offered_load(cpus):.2f} "
+          f"on {cpus} CPU(s)")
+    print(f"Simulated time:   {scheduler.clock}")
+    print(f"Arrived:          {fed}")
+    print(f"Finished:         {len(scheduler.finished)} "
+          f"({100 * len(scheduler.finished) / max(1, scheduler.clock):.2f} per 100 ticks)")
+    print(f"Backlog:          {fed - len(scheduler.finished)}")
+    print(f"CPU utilization:  {busy / max(1, cpus * scheduler.clock):.2%}")
+    print(f"Saturated windows: {len(scheduler.utilization.saturated())} of {len(windows)}")
+    print()
+    scheduler.latency.print_summary()
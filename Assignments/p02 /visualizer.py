@@ -3,6 +3,8 @@ import pygame
 import sys
 from collections import defaultdict
 
+from pkg.snapshot import SnapshotCache
+
 # Add all the pygame visualization code here...
 
 # Color scheme
@@ -26,6 +28,7 @@ class PygameVisualizer:
     def __init__(self, scheduler, width=1400, height=900, fps=2):
         pygame.init()
         self.scheduler = scheduler
+        self.snapshots = SnapshotCache(scheduler)
         self.width = width
         self.height = height
         self.fps = fps
@@ -194,19 +197,19 @@ class PygameVisualizer:
         """Draw simulation statistics"""
         self.draw_panel(x, y, width, height, "Statistics")
         
-        snapshot = self.scheduler.snapshot()
+        snapshot = self.snapshots.get()
         
         stats_y = y + 30
         line_height = 25
         
         stats = [
             f"Clock: {snapshot['clock']}",
-            f"Not Arrived: {len(snapshot.get('not_arrived', []))}",
-            f"Ready Queue: {len(snapshot['ready'])}",
-            f"Wait Queue: {len(snapshot['wait'])}",
+            f"Not Arrived: {snapshot['counts']['not_arrived']}",
+            f"Ready Queue: {snapshot['counts']['ready']}",
+            f"Wait Queue: {snapshot['counts']['wait']}",
             f"Running: {sum(1 for p in snapshot['cpu'] if p is not None)}",
             f"I/O Active: {sum(1 for p in snapshot['io'] if p is not None)}",
-            f"Finished: {len(snapshot['finished'])}",
+            f"Finished: {snapshot['finished_count']}",
         ]
         
         for i, stat in enumerate(stats):
@@ -253,7 +256,7 @@ class PygameVisualizer:
         self.screen.fill(COLORS['background'])
         
         # Get current snapshot
-        snapshot = self.scheduler.snapshot()
+        snapshot = self.snapshots.get()
         
         # Layout dimensions
         queue_width = 350
@@ -329,7 +332,7 @@ class PygameVisualizer:
             
             if not self.paused or self.step_mode:
                 # Store snapshot for timeline
-                snapshot = self.scheduler.snapshot()
+                snapshot = self.snapshots.get()
                 self.timeline_history.append(snapshot)
                 
                 # Keep timeline history limited
@@ -345,7 +348,7 @@ class PygameVisualizer:
         
         # Show final state
         if self.running:
-            final_snapshot = self.scheduler.snapshot()
+            final_snapshot = self.snapshots.get()
             self.timeline_history.append(final_snapshot)
             
             # Wait for user to close